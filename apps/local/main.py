@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import base64
+import io
 import secrets
+import tempfile
 from pathlib import Path
 
-import bcrypt
 from fastapi import Body, Depends, FastAPI, HTTPException, Query, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
 from core.finance.policy import FinanceNotFoundError, FinancePolicyError, FinanceValidationError
@@ -57,8 +59,8 @@ from core.finance.service import (
     get_rule_thresholds,
     get_transaction,
     list_alerts,
-    list_behavior_logs,
     list_transactions,
+    list_transactions_page,
     set_rule_threshold,
     spending_summary,
     summary,
@@ -67,12 +69,25 @@ from core.finance.service import (
 )
 from core.logging.audit import audit_event, safe_excerpt, text_hash
 from core.logging.logger import get_logger
-from core.memory.service import add_memory, delete_memory, list_recent, search_memories
-from core.orchestrator.router import allowed_actions, route_intent
+from core.maintenance import MaintenanceScheduler, run_maintenance
+from core.memory.service import (
+    MAX_BULK_ITEMS,
+    add_memories,
+    add_memory,
+    delete_memory,
+    list_recent_page,
+    search_memories,
+    sync_memory_vectors,
+    tag_facets,
+)
+from core.orchestrator.router import INTENT_CACHE, allowed_actions, route_intent
 from core.orchestrator.schemas import OrchestrateErrorResponse, OrchestrateRequest, OrchestrateResponse
 from core.errors import VictusError, sanitize_exception
+from core.storage.pagination import InvalidCursorError
+from core.security.admission import LOGIN_ADMISSION
 from core.security.auth import login_user, require_user
 from core.security.bootstrap_store import is_bootstrapped, set_bootstrap
+from core.security.hashing import PASSWORD_HASHER, PasswordHasherBusy
 
 
 class LoginRequest(BaseModel):
@@ -104,6 +119,10 @@ class MemoryAddRequest(BaseModel):
     sensitivity: str | None = None
 
 
+class MemoryBulkRequest(BaseModel):
+    items: list[MemoryAddRequest] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
 class FinanceAddRequest(TransactionWrite):
     pass
 
@@ -157,7 +176,7 @@ def create_app() -> FastAPI:
     @app.exception_handler(Exception)
     async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
         err = sanitize_exception(exc)
-        if isinstance(exc, FinanceValidationError):
+        if isinstance(exc, (FinanceValidationError, InvalidCursorError)):
             status_code = status.HTTP_400_BAD_REQUEST
         elif isinstance(exc, FinanceNotFoundError):
             status_code = status.HTTP_404_NOT_FOUND
@@ -176,6 +195,11 @@ def create_app() -> FastAPI:
     init_ui_state_db()
     llm_provider = LLMProvider()
     camera_service = CameraService()
+    maintenance_scheduler = MaintenanceScheduler()
+    app.add_event_handler("startup", maintenance_scheduler.start)
+    # Backfill vectors for legacy memories here so memory writes stay O(1).
+    app.add_event_handler("startup", sync_memory_vectors)
+    app.add_event_handler("shutdown", maintenance_scheduler.stop)
     dist_dir = Path(__file__).resolve().parents[2] / "apps" / "web" / "dist"
 
     # -----------------------------------------------------------------------
@@ -219,8 +243,9 @@ def create_app() -> FastAPI:
     # -----------------------------------------------------------------------
 
     @app.post("/login", response_model=LoginResponse)
-    def login(payload: LoginRequest) -> LoginResponse:
-        token = login_user(payload.username, payload.password)
+    async def login(payload: LoginRequest, request: Request) -> LoginResponse:
+        client = request.client.host if request.client else None
+        token = await login_user(payload.username, payload.password, client)
         return LoginResponse(access_token=token)
 
     @app.get("/bootstrap/status")
@@ -228,7 +253,7 @@ def create_app() -> FastAPI:
         return {"bootstrapped": is_bootstrapped()}
 
     @app.post("/bootstrap/init", response_model=BootstrapInitResponse)
-    def bootstrap_init(payload: BootstrapInitRequest, request: Request) -> BootstrapInitResponse:
+    async def bootstrap_init(payload: BootstrapInitRequest, request: Request) -> BootstrapInitResponse:
         request_id = _request_id(request)
         if is_bootstrapped():
             audit_event("bootstrap_init", ok=False, request_id=request_id, reason="already_bootstrapped")
@@ -252,10 +277,13 @@ def create_app() -> FastAPI:
                 detail={"error": "weak_password", "message": "Password must be at least 12 characters."},
             )
 
-        password_hash = bcrypt.hashpw(payload.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        try:
+            password_hash = await PASSWORD_HASHER.hash(payload.password)
+        except PasswordHasherBusy as exc:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=exc.to_response()) from exc
         secret_bytes = secrets.token_bytes(32)
         jwt_secret = base64.urlsafe_b64encode(secret_bytes).decode("utf-8")
-        set_bootstrap(password_hash, jwt_secret)
+        await run_in_threadpool(set_bootstrap, password_hash, jwt_secret)
         audit_event("bootstrap_init", ok=True, request_id=request_id, username=payload.username)
         return BootstrapInitResponse(ok=True, bootstrapped=True)
 
@@ -279,6 +307,15 @@ def create_app() -> FastAPI:
             },
             "last_error": debug_status.get("last_error"),
             "allowed_actions": allowed_actions(),
+            "intent_cache": INTENT_CACHE.stats().__dict__,
+        }
+
+    @app.get("/debug/auth")
+    def debug_auth(user: str = Depends(require_user)) -> dict[str, object]:
+        _ = user
+        return {
+            "password_hasher": PASSWORD_HASHER.stats().__dict__,
+            "login_admission": LOGIN_ADMISSION.stats().__dict__,
         }
 
     @app.post(
@@ -318,23 +355,38 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
         return {"id": memory_id}
 
+    @app.post("/memory/bulk")
+    def memory_bulk(payload: MemoryBulkRequest, user: str = Depends(require_user)) -> dict[str, object]:
+        items = [{**item.model_dump(), "source": user} for item in payload.items]
+        return add_memories(items)
+
     @app.get("/memory/search")
     def memory_search(
         q: str = Query(..., alias="q"),
         tag: list[str] | None = Query(default=None),
+        tag_mode: str = Query(default="all", pattern="^(all|any)$"),
+        mode: str = Query(default="fts", pattern="^(fts|semantic|hybrid)$"),
         limit: int = Query(default=10, ge=1, le=100),
         user: str = Depends(require_user),
     ) -> dict[str, object]:
-        results = search_memories(query=q, tags=tag, limit=limit)
+        results = search_memories(query=q, tags=tag, limit=limit, tag_mode=tag_mode, mode=mode)
         return {"results": results}
 
+    @app.get("/memory/tags")
+    def memory_tags(
+        limit: int = Query(default=20, ge=1, le=100),
+        user: str = Depends(require_user),
+    ) -> dict[str, object]:
+        return {"results": tag_facets(limit=limit)}
+
     @app.get("/memory/list")
     def memory_list(
         limit: int = Query(default=20, ge=1, le=100),
+        cursor: str | None = Query(default=None),
         user: str = Depends(require_user),
     ) -> dict[str, object]:
-        results = list_recent(limit=limit)
-        return {"results": results}
+        page = list_recent_page(limit=limit, cursor=cursor)
+        return {"results": page["results"], "next_cursor": page["next_cursor"]}
 
     @app.delete("/memory/{memory_id}")
     def memory_delete(memory_id: str, user: str = Depends(require_user)) -> dict[str, bool]:
@@ -431,6 +483,34 @@ def create_app() -> FastAPI:
         _ = user
         return delete_transaction(transaction_id)
 
+    @app.post("/finance/transactions/import")
+    async def finance_import(
+        request: Request,
+        format: str = Query(..., pattern="^(csv|ofx|qif)$"),
+        account_id: str | None = Query(default=None),
+        currency: str = Query(default="USD"),
+        category: str = Query(default="uncategorized"),
+        user: str = Depends(require_user),
+    ) -> dict[str, object]:
+        # The raw export is the request body. It is spooled to disk (in memory
+        # up to 8 MiB) and parsed line by line on a worker thread, so large
+        # files never sit in memory or block the event loop.
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+            async for chunk in request.stream():
+                spool.write(chunk)
+            spool.seek(0)
+            lines = io.TextIOWrapper(spool, encoding="utf-8-sig", errors="replace", newline="")
+            summary = await run_in_threadpool(
+                finance_service.import_transactions,
+                lines,
+                fmt=format,
+                account_id=account_id,
+                currency=currency,
+                default_category=category,
+                source=user,
+            )
+        return summary.model_dump()
+
     @app.get("/finance/transactions")
     def finance_list(
         category: str | None = Query(default=None),
@@ -440,11 +520,20 @@ def create_app() -> FastAPI:
         direction: str | None = Query(default=None),
         merchant: str | None = Query(default=None),
         limit: int = Query(default=50, ge=1, le=500),
+        cursor: str | None = Query(default=None),
         user: str = Depends(require_user),
     ) -> dict[str, object]:
         _ = user
-        results = list_transactions(start_ts=date_from, end_ts=date_to, category=category, account_id=account_id, limit=limit)
-        return {"results": results, "count": len(results)}
+        return list_transactions_page(
+            start_ts=date_from,
+            end_ts=date_to,
+            category=category,
+            account_id=account_id,
+            direction=direction,
+            merchant=merchant,
+            limit=limit,
+            cursor=cursor,
+        )
 
     # Backward-compatible aliases for legacy routes
     @app.post("/finance/add")
@@ -615,11 +704,16 @@ def create_app() -> FastAPI:
     @app.get("/finance/alerts")
     def finance_alerts(
         limit: int = Query(default=100, ge=1, le=500),
+        cursor: str | None = Query(default=None),
         user: str = Depends(require_user),
     ) -> dict[str, object]:
         _ = user
-        response = finance_service.list_alerts(limit=limit)
-        return {"alerts": [r.model_dump() for r in response.results], "count": response.count}
+        response = finance_service.list_alerts(limit=limit, cursor=cursor)
+        return {
+            "alerts": [r.model_dump() for r in response.results],
+            "count": response.count,
+            "next_cursor": response.next_cursor,
+        }
 
     @app.post("/finance/alerts/{alert_id}/resolve")
     def finance_alert_resolve(alert_id: str, user: str = Depends(require_user)) -> dict[str, object]:
@@ -635,6 +729,24 @@ def create_app() -> FastAPI:
         _ = user
         return finance_service.get_insights(date_from, date_to).model_dump()
 
+    @app.get("/finance/anomalies")
+    def finance_anomalies(
+        date_from: str | None = Query(default=None),
+        date_to: str | None = Query(default=None),
+        limit: int = Query(default=200, ge=1, le=1000),
+        include_normal: bool = Query(default=False),
+        user: str = Depends(require_user),
+    ) -> dict[str, object]:
+        _ = user
+        return finance_service.detect_anomalies(
+            date_from, date_to, limit=limit, include_normal=include_normal,
+        ).model_dump()
+
+    @app.get("/finance/recurring")
+    def finance_recurring(user: str = Depends(require_user)) -> dict[str, object]:
+        _ = user
+        return finance_service.detect_recurring_expenses().model_dump()
+
     @app.get("/finance/guidance")
     def finance_guidance(user: str = Depends(require_user)) -> dict[str, object]:
         _ = user
@@ -679,9 +791,11 @@ def create_app() -> FastAPI:
     @app.get("/finance/behavior")
     def finance_behavior(
         limit: int = Query(default=100, ge=1, le=500),
+        cursor: str | None = Query(default=None),
         user: str = Depends(require_user),
     ) -> dict[str, object]:
-        return {"behavior_logs": list_behavior_logs(limit=limit)}
+        page = finance_service.list_behavior_logs(limit=limit, cursor=cursor)
+        return {"behavior_logs": page.results, "next_cursor": page.next_cursor}
 
     # -----------------------------------------------------------------------
     # Files
@@ -749,6 +863,25 @@ def create_app() -> FastAPI:
             image_b64=payload.image_b64,
         )
 
+    # -----------------------------------------------------------------------
+    # Maintenance
+    # -----------------------------------------------------------------------
+
+    @app.post("/maintenance/run")
+    def maintenance_run(user: str = Depends(require_user)) -> dict[str, object]:
+        _ = user
+        return run_maintenance(maintenance_scheduler.config).as_dict()
+
+    @app.get("/maintenance/status")
+    def maintenance_status(user: str = Depends(require_user)) -> dict[str, object]:
+        _ = user
+        last = maintenance_scheduler.last_report
+        return {
+            "enabled": maintenance_scheduler.config.enabled,
+            "window": [maintenance_scheduler.config.window_start_hour, maintenance_scheduler.config.window_end_hour],
+            "last_report": last.as_dict() if last else None,
+        }
+
     # -----------------------------------------------------------------------
     # Static files (web UI)
     # -----------------------------------------------------------------------
@@ -36,6 +36,8 @@ class OrchestratorConfig:
     ollama_base_url: str
     model_priority: tuple[str, ...]
     enable_llm_formatting: bool
+    intent_cache_size: int
+    intent_cache_ttl_seconds: float
 
 
 @dataclass(frozen=True)
@@ -47,6 +49,50 @@ class SecurityConfig:
     enabled_tools: tuple[str, ...]
 
 
+@dataclass(frozen=True)
+class AuthConfig:
+    accept_legacy_tokens: bool
+    token_cache_size: int
+    hash_workers: int
+    hash_max_queue: int
+    login_attempts_per_minute: float
+    login_burst: int
+
+
+@dataclass(frozen=True)
+class ConfidenceConfig:
+    flush_interval_seconds: float
+    flush_max_pending: int
+    compact_after_entries: int
+
+
+@dataclass(frozen=True)
+class StorageConfig:
+    busy_timeout_ms: int
+    cache_size_kib: int
+    mmap_size_bytes: int
+    wal_enabled: bool
+
+
+@dataclass(frozen=True)
+class MaintenanceConfig:
+    enabled: bool
+    interval_seconds: int
+    window_start_hour: int
+    window_end_hour: int
+    memory_half_life_days: float
+    memory_min_score: float
+    memory_protected_importance: int
+    behavior_log_max_age_days: int
+    behavior_log_max_rows: int
+    resolved_alert_max_age_days: int
+    resolved_alert_max_rows: int
+    timeline_max_age_days: int
+    timeline_max_rows: int
+    vacuum_pages: int
+    convert_auto_vacuum: bool
+
+
 def _default_base_dir() -> Path:
     override = os.getenv("VICTUS_DATA_DIR")
     if override:
@@ -158,6 +204,9 @@ def get_orchestrator_config() -> OrchestratorConfig:
         ollama_base_url=(os.getenv("VICTUS_OLLAMA_BASE_URL", "http://127.0.0.1:11434").strip() or "http://127.0.0.1:11434"),
         model_priority=model_priority or ("mistral", "llama3.1:8b"),
         enable_llm_formatting=_parse_bool(os.getenv("VICTUS_ORCHESTRATE_ENABLE_LLM_FORMATTING"), False),
+        # 0 disables the routing cache.
+        intent_cache_size=max(0, _parse_int(os.getenv("VICTUS_INTENT_CACHE_SIZE"), 512)),
+        intent_cache_ttl_seconds=max(0.0, _parse_float(os.getenv("VICTUS_INTENT_CACHE_TTL_SECONDS"), 300.0)),
     )
 
 
@@ -188,3 +237,53 @@ def get_security_config() -> SecurityConfig:
         log_redaction_enabled=log_redaction_enabled,
         enabled_tools=enabled_tools,
     )
+
+
+def get_auth_config() -> AuthConfig:
+    return AuthConfig(
+        # bcrypt-kdf signed tokens from before HMAC signing; turn off once they have expired.
+        accept_legacy_tokens=_parse_bool(os.getenv("VICTUS_AUTH_ACCEPT_LEGACY_TOKENS"), True),
+        token_cache_size=max(0, _parse_int(os.getenv("VICTUS_AUTH_TOKEN_CACHE_SIZE"), 1024)),
+        hash_workers=max(1, _parse_int(os.getenv("VICTUS_AUTH_HASH_WORKERS"), 2)),
+        hash_max_queue=max(0, _parse_int(os.getenv("VICTUS_AUTH_HASH_MAX_QUEUE"), 16)),
+        login_attempts_per_minute=max(0.1, _parse_float(os.getenv("VICTUS_AUTH_LOGIN_ATTEMPTS_PER_MINUTE"), 10.0)),
+        login_burst=max(1, _parse_int(os.getenv("VICTUS_AUTH_LOGIN_BURST"), 5)),
+    )
+
+
+def get_confidence_config() -> ConfidenceConfig:
+    return ConfidenceConfig(
+        flush_interval_seconds=max(0.1, _parse_float(os.getenv("VICTUS_CONFIDENCE_FLUSH_INTERVAL_SECONDS"), 5.0)),
+        flush_max_pending=max(1, _parse_int(os.getenv("VICTUS_CONFIDENCE_FLUSH_MAX_PENDING"), 256)),
+        compact_after_entries=max(1, _parse_int(os.getenv("VICTUS_CONFIDENCE_COMPACT_AFTER_ENTRIES"), 4096)),
+    )
+
+
+def get_storage_config() -> StorageConfig:
+    return StorageConfig(
+        busy_timeout_ms=max(0, _parse_int(os.getenv("VICTUS_SQLITE_BUSY_TIMEOUT_MS"), 5000)),
+        cache_size_kib=max(0, _parse_int(os.getenv("VICTUS_SQLITE_CACHE_SIZE_KIB"), 16_384)),
+        mmap_size_bytes=max(0, _parse_int(os.getenv("VICTUS_SQLITE_MMAP_SIZE_BYTES"), 134_217_728)),
+        wal_enabled=_parse_bool(os.getenv("VICTUS_SQLITE_WAL_ENABLED"), True),
+    )
+
+
+def get_maintenance_config() -> MaintenanceConfig:
+    return MaintenanceConfig(
+        enabled=_parse_bool(os.getenv("VICTUS_MAINTENANCE_ENABLED"), False),
+        interval_seconds=max(60, _parse_int(os.getenv("VICTUS_MAINTENANCE_INTERVAL_SECONDS"), 86_400)),
+        window_start_hour=_parse_int(os.getenv("VICTUS_MAINTENANCE_WINDOW_START_HOUR"), 2) % 24,
+        window_end_hour=_parse_int(os.getenv("VICTUS_MAINTENANCE_WINDOW_END_HOUR"), 5) % 24,
+        memory_half_life_days=max(1.0, _parse_float(os.getenv("VICTUS_MEMORY_DECAY_HALF_LIFE_DAYS"), 180.0)),
+        memory_min_score=max(0.0, _parse_float(os.getenv("VICTUS_MEMORY_RETENTION_MIN_SCORE"), 0.5)),
+        memory_protected_importance=_parse_int(os.getenv("VICTUS_MEMORY_RETENTION_PROTECTED_IMPORTANCE"), 8),
+        behavior_log_max_age_days=max(1, _parse_int(os.getenv("VICTUS_BEHAVIOR_LOG_MAX_AGE_DAYS"), 365)),
+        behavior_log_max_rows=max(0, _parse_int(os.getenv("VICTUS_BEHAVIOR_LOG_MAX_ROWS"), 50_000)),
+        resolved_alert_max_age_days=max(1, _parse_int(os.getenv("VICTUS_RESOLVED_ALERT_MAX_AGE_DAYS"), 90)),
+        resolved_alert_max_rows=max(0, _parse_int(os.getenv("VICTUS_RESOLVED_ALERT_MAX_ROWS"), 5_000)),
+        timeline_max_age_days=max(1, _parse_int(os.getenv("VICTUS_TIMELINE_MAX_AGE_DAYS"), 30)),
+        timeline_max_rows=max(0, _parse_int(os.getenv("VICTUS_TIMELINE_MAX_ROWS"), 1_000)),
+        vacuum_pages=max(0, _parse_int(os.getenv("VICTUS_MAINTENANCE_VACUUM_PAGES"), 4_096)),
+        # One-time full VACUUM of pre-incremental databases; holds an exclusive lock throughout.
+        convert_auto_vacuum=_parse_bool(os.getenv("VICTUS_MAINTENANCE_CONVERT_AUTO_VACUUM"), False),
+    )
@@ -4,6 +4,7 @@ from typing import Any
 
 from core.finance.schemas import (
     AccountCreate,
+    AnomalyDetectionRequest,
     BillCreate,
     BudgetCreate,
     SavingsGoalCreate,
@@ -16,7 +17,7 @@ from core.finance.service import (
     FinanceService,
     add_transaction,
     category_summary,
-    list_transactions,
+    list_transactions_page,
     spending_summary,
 )
 
@@ -71,15 +72,19 @@ def list_transactions_handler(parameters: dict[str, Any], context: dict[str, Any
         limit=parameters.get("limit", 50),
         direction=parameters.get("direction"),
         merchant=parameters.get("merchant"),
+        cursor=parameters.get("cursor"),
     )
-    results = list_transactions(
+    page = list_transactions_page(
         start_ts=filters.date_from.isoformat() if filters.date_from else None,
         end_ts=filters.date_to.isoformat() if filters.date_to else None,
         category=filters.category,
         account_id=filters.account_id,
+        direction=filters.direction,
+        merchant=filters.merchant,
         limit=filters.limit,
+        cursor=filters.cursor,
     )
-    return {"transactions": results, "count": len(results)}
+    return {"transactions": page["results"], "count": page["count"], "next_cursor": page["next_cursor"]}
 
 
 def get_spending_summary_handler(parameters: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
@@ -202,8 +207,12 @@ def get_savings_status_handler(parameters: dict[str, Any], context: dict[str, An
 def list_alerts_handler(parameters: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
     _ = context
     limit = parameters.get("limit", 100)
-    response = _service.list_alerts(limit=limit)
-    return {"alerts": [a.model_dump() for a in response.results], "count": response.count}
+    response = _service.list_alerts(limit=limit, cursor=parameters.get("cursor"))
+    return {
+        "alerts": [a.model_dump() for a in response.results],
+        "count": response.count,
+        "next_cursor": response.next_cursor,
+    }
 
 
 def get_insights_handler(parameters: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
@@ -215,6 +224,39 @@ def get_insights_handler(parameters: dict[str, Any], context: dict[str, Any]) ->
     return {"insights": [i.model_dump() for i in response.results], "date_from": response.date_from, "date_to": response.date_to}
 
 
+def detect_anomalies_handler(parameters: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
+    _ = context
+    request = AnomalyDetectionRequest(
+        date_from=parameters.get("date_from"),
+        date_to=parameters.get("date_to"),
+        limit=parameters.get("limit"),
+        include_normal=bool(parameters.get("include_normal", False)),
+    )
+    response = _service.detect_anomalies(
+        date_from=request.date_from.isoformat() if request.date_from else None,
+        date_to=request.date_to.isoformat() if request.date_to else None,
+        limit=request.limit,
+        include_normal=request.include_normal,
+    )
+    return {
+        "anomalies": [a.model_dump() for a in response.results],
+        "count": response.count,
+        "z_threshold": response.z_threshold,
+        "date_from": response.date_from,
+        "date_to": response.date_to,
+    }
+
+
+def detect_recurring_expenses_handler(parameters: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
+    _ = parameters, context
+    response = _service.detect_recurring_expenses()
+    return {
+        "recurring_expenses": [r.model_dump() for r in response.results],
+        "count": response.count,
+        "refreshed": response.refreshed,
+    }
+
+
 def get_guidance_handler(parameters: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
     _ = parameters, context
     response = _service.get_guidance()
@@ -6,7 +6,7 @@ from core.memory.service import (
     add_memory,
     delete_memory,
     get_memory_by_id,
-    list_recent,
+    list_recent_page,
     search_memories,
 )
 
@@ -35,15 +35,23 @@ def search_handler(parameters: dict[str, Any], context: dict[str, Any]) -> dict[
     limit = parameters.get("limit", 10)
     if not isinstance(limit, int):
         raise ValueError("'limit' must be an integer")
-    results = search_memories(query=query.strip(), tags=parameters.get("tags"), limit=limit)
+    tag_mode = parameters.get("tag_mode", "all")
+    if tag_mode not in ("all", "any"):
+        raise ValueError("'tag_mode' must be 'all' or 'any'")
+    mode = parameters.get("mode", "fts")
+    if mode not in ("fts", "semantic", "hybrid"):
+        raise ValueError("'mode' must be 'fts', 'semantic' or 'hybrid'")
+    results = search_memories(
+        query=query.strip(), tags=parameters.get("tags"), limit=limit, tag_mode=tag_mode, mode=mode
+    )
     return {"results": results, "count": len(results)}
 
 
 def list_recent_handler(parameters: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
     _ = context
     limit = int(parameters.get("limit") or 20)
-    results = list_recent(limit=limit)
-    return {"results": results, "count": len(results)}
+    page = list_recent_page(limit=limit, cursor=parameters.get("cursor"))
+    return {"results": page["results"], "count": page["count"], "next_cursor": page["next_cursor"]}
 
 
 def get_memory_handler(parameters: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Iterable
+
+from core.finance.intelligence import (
+    CategoryTotals,
+    ExpenseRow,
+    MerchantTotals,
+    MonthlyTotals,
+    expense_rows,
+)
+
+try:
+    import numpy as np
+except ImportError:  # the fold-based engines cover every analysis without it
+    np = None
+
+# date.toordinal() of 1970-01-01, the zero of numpy's datetime64[D].
+_EPOCH_ORDINAL = 719_163
+_NO_DAY = -1
+_NO_CODE = -1
+
+
+def columnar_available() -> bool:
+    return np is not None
+
+
+@dataclass(frozen=True)
+class TransactionColumns:
+    """An expense window held as NumPy columns, in input order.
+
+    ``amount_cents`` is int64 (absolute), ``day`` an int32 date ordinal
+    (``-1`` when the date does not parse) and merchants/categories are int32
+    codes into ``merchants``/``categories``, numbered in first-seen order so
+    ties rank exactly as in the fold-based engines. ``-1`` means no merchant.
+    """
+
+    amount_cents: Any
+    day: Any
+    category_codes: Any
+    categories: tuple[str, ...]
+    merchant_codes: Any
+    merchants: tuple[str, ...]
+
+    @classmethod
+    def from_expenses(cls, rows: Iterable[ExpenseRow]) -> TransactionColumns:
+        if np is None:
+            raise RuntimeError("numpy is required for columnar finance analytics")
+        amounts = array("q")
+        days = array("i")
+        category_codes = array("i")
+        merchant_codes = array("i")
+        categories: dict[str, int] = {}
+        merchants: dict[str, int] = {}
+        for row in rows:
+            amounts.append(row.amount_cents)
+            try:
+                days.append(date.fromisoformat(row.transaction_date[:10]).toordinal())
+            except ValueError:
+                days.append(_NO_DAY)
+            category_codes.append(categories.setdefault(row.category, len(categories)))
+            merchant_codes.append(
+                merchants.setdefault(row.merchant, len(merchants)) if row.merchant else _NO_CODE
+            )
+        return cls(
+            amount_cents=np.frombuffer(amounts, dtype=np.int64) if amounts else np.zeros(0, np.int64),
+            day=np.frombuffer(days, dtype=np.int32) if days else np.zeros(0, np.int32),
+            category_codes=np.frombuffer(category_codes, dtype=np.int32) if category_codes else np.zeros(0, np.int32),
+            categories=tuple(categories),
+            merchant_codes=np.frombuffer(merchant_codes, dtype=np.int32) if merchant_codes else np.zeros(0, np.int32),
+            merchants=tuple(merchants),
+        )
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[dict[str, Any]]) -> TransactionColumns:
+        return cls.from_expenses(expense_rows(transactions))
+
+    def __len__(self) -> int:
+        return int(self.amount_cents.shape[0])
+
+    # -- aggregations ---------------------------------------------------------
+    # bincount sums in float64, which is exact for totals below 2**53 cents.
+
+    def category_totals(self) -> CategoryTotals:
+        sums = np.bincount(self.category_codes, weights=self.amount_cents, minlength=len(self.categories))
+        return CategoryTotals(
+            totals={name: int(total) for name, total in zip(self.categories, sums)},
+            total=int(self.amount_cents.sum()),
+        )
+
+    def merchant_totals(self, max_amount_cents: int | None = None) -> MerchantTotals:
+        mask = self.merchant_codes != _NO_CODE
+        if max_amount_cents is not None:
+            mask &= self.amount_cents <= max_amount_cents
+        codes = self.merchant_codes[mask]
+        size = len(self.merchants)
+        sums = np.bincount(codes, weights=self.amount_cents[mask], minlength=size)
+        counts = np.bincount(codes, minlength=size)
+        # Key order = first occurrence among the selected rows, as a fold would see them.
+        first_seen = np.full(size, len(self), dtype=np.int64)
+        np.minimum.at(first_seen, codes, np.flatnonzero(mask))
+        order = [int(code) for code in np.argsort(first_seen, kind="stable") if counts[code]]
+        return MerchantTotals(
+            max_amount_cents=max_amount_cents,
+            totals={self.merchants[code]: int(sums[code]) for code in order},
+            counts={self.merchants[code]: int(counts[code]) for code in order},
+        )
+
+    def monthly_totals(self) -> MonthlyTotals:
+        dated = self.day != _NO_DAY
+        months = (self.day[dated].astype(np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]")
+        labels, inverse = np.unique(months, return_inverse=True)
+        sums = np.bincount(inverse, weights=self.amount_cents[dated], minlength=len(labels))
+        return MonthlyTotals(
+            totals={str(label): int(total) for label, total in zip(np.datetime_as_string(labels, unit="M"), sums)}
+        )
@@ -104,3 +104,20 @@ class Alert:
     created_at: str
     resolved_at: str | None
     status: str
+    occurrences: int = 1
+    last_seen_at: str | None = None
+
+
+@dataclass(frozen=True)
+class RecurringExpense:
+    id: str
+    merchant: str
+    cadence: str | None
+    cadence_days: int
+    expected_amount_cents: int
+    occurrences: int
+    last_seen_date: str
+    next_expected_date: str | None
+    confidence: float
+    is_active: bool
+    updated_at: str | None
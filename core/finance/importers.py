@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import csv
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+# ---------------------------------------------------------------------------
+# Bank export parsers (CSV / OFX / QIF)
+#
+# Every parser consumes an iterable of text lines and yields one
+# ParsedTransaction at a time, so arbitrarily large exports are never held in
+# memory. Parsers only normalise syntax (dates to ISO, amounts to signed
+# decimal strings); business validation happens in FinanceService.
+# ---------------------------------------------------------------------------
+
+IMPORT_FORMATS = ("csv", "ofx", "qif")
+
+
+class ParsedTransaction(NamedTuple):
+    line: int
+    transaction_date: str | None
+    amount: str | None
+    merchant: str | None = None
+    notes: str | None = None
+    category: str | None = None
+
+
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%Y/%m/%d", "%d.%m.%Y", "%Y%m%d")
+_AMOUNT_STRIP_RE = re.compile(r"[^\d.\-]")
+
+
+# Exports repeat a few thousand distinct dates at most.
+@lru_cache(maxsize=8192)
+def parse_date(value: str | None) -> str | None:
+    """ISO date for the common bank export spellings, or ``None``."""
+    if not value:
+        return None
+    candidate = value.strip().replace("'", "/")
+    if len(candidate) >= 10 and candidate[4] == "-":
+        try:
+            return date.fromisoformat(candidate[:10]).isoformat()
+        except ValueError:
+            return None
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(candidate, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_amount(value: str | None) -> str | None:
+    """Signed decimal string from ``"$1,234.50"``, ``"(12.00)"`` or ``"-3"``."""
+    if value is None:
+        return None
+    text = value.strip()
+    if not text:
+        return None
+    negative = text.startswith("(") and text.endswith(")")
+    cleaned = _AMOUNT_STRIP_RE.sub("", text)
+    if not cleaned or cleaned in {"-", "."}:
+        return None
+    if negative and not cleaned.startswith("-"):
+        cleaned = f"-{cleaned}"
+    return cleaned
+
+
+# -- CSV ---------------------------------------------------------------------
+
+_CSV_COLUMNS = {
+    "date": ("date", "transaction date", "posted date", "posting date", "booking date"),
+    "amount": ("amount", "transaction amount", "value"),
+    "debit": ("debit", "withdrawal", "withdrawals", "money out"),
+    "credit": ("credit", "deposit", "deposits", "money in"),
+    "merchant": ("merchant", "payee", "description", "name"),
+    "notes": ("memo", "notes", "note", "details"),
+    "category": ("category",),
+}
+
+
+def _resolve_columns(header: list[str]) -> dict[str, int]:
+    normalized = [column.strip().lower() for column in header]
+    resolved: dict[str, int] = {}
+    for field, aliases in _CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in normalized:
+                resolved[field] = normalized.index(alias)
+                break
+    return resolved
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[ParsedTransaction]:
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = _resolve_columns(header)
+    if "date" not in columns or not ({"amount", "debit", "credit"} & columns.keys()):
+        raise ValueError("CSV header must include a date column and an amount (or debit/credit) column")
+
+    # Every row gets an empty cell appended; absent columns read that one.
+    width = len(header)
+    date_at, amount_at, debit_at, credit_at, merchant_at, notes_at, category_at = (
+        columns.get(field, -1) for field in ("date", "amount", "debit", "credit", "merchant", "notes", "category")
+    )
+    for row in reader:
+        if not any(row):
+            continue
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+        row.append("")
+        amount = parse_amount(row[amount_at])
+        if amount is None:
+            debit = parse_amount(row[debit_at])
+            credit = parse_amount(row[credit_at])
+            if debit is not None:
+                amount = f"-{debit.lstrip('-')}"
+            elif credit is not None:
+                amount = credit
+        yield ParsedTransaction(
+            reader.line_num,
+            parse_date(row[date_at].strip() or None),
+            amount,
+            row[merchant_at].strip() or None,
+            row[notes_at].strip() or None,
+            row[category_at].strip() or None,
+        )
+
+
+# -- OFX ---------------------------------------------------------------------
+
+# Matches both SGML (``<TRNAMT>-12.50``) and XML (``<TRNAMT>-12.50</TRNAMT>``).
+_OFX_TAG_RE = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+
+def parse_ofx(lines: Iterable[str]) -> Iterator[ParsedTransaction]:
+    current: dict[str, str] | None = None
+    start_line = 0
+    for line_number, line in enumerate(lines, start=1):
+        for closing, tag, value in _OFX_TAG_RE.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing:
+                    if current is not None:
+                        yield _ofx_transaction(start_line, current)
+                    current = None
+                else:
+                    current = {}
+                    start_line = line_number
+            elif current is not None and not closing and value.strip():
+                current[tag] = value.strip()
+    if current:
+        yield _ofx_transaction(start_line, current)
+
+
+def _ofx_transaction(line: int, fields: dict[str, str]) -> ParsedTransaction:
+    posted = fields.get("DTPOSTED") or fields.get("DTUSER") or ""
+    return ParsedTransaction(
+        line=line,
+        transaction_date=parse_date(posted[:8]),
+        amount=parse_amount(fields.get("TRNAMT")),
+        merchant=fields.get("NAME") or fields.get("PAYEE"),
+        notes=fields.get("MEMO"),
+    )
+
+
+# -- QIF ---------------------------------------------------------------------
+
+
+def parse_qif(lines: Iterable[str]) -> Iterator[ParsedTransaction]:
+    fields: dict[str, str] = {}
+    start_line = 0
+    for line_number, raw in enumerate(lines, start=1):
+        line = raw.rstrip("\r\n")
+        if not line or line.startswith("!"):
+            continue
+        if line.startswith("^"):
+            if fields:
+                yield _qif_transaction(start_line, fields)
+            fields = {}
+            continue
+        if not fields:
+            start_line = line_number
+        code, value = line[0], line[1:].strip()
+        # Split lines (S/E/$) belong to the parent record; keep the first only.
+        fields.setdefault(code, value)
+    if fields:
+        yield _qif_transaction(start_line, fields)
+
+
+def _qif_transaction(line: int, fields: dict[str, str]) -> ParsedTransaction:
+    return ParsedTransaction(
+        line=line,
+        transaction_date=parse_date(fields.get("D")),
+        amount=parse_amount(fields.get("T") or fields.get("U")),
+        merchant=fields.get("P"),
+        notes=fields.get("M"),
+        category=(fields.get("L") or "").split(":")[0] or None,
+    )
+
+
+PARSERS: dict[str, Callable[[Iterable[str]], Iterator[ParsedTransaction]]] = {
+    "csv": parse_csv,
+    "ofx": parse_ofx,
+    "qif": parse_qif,
+}
+
+
+def parse_export(lines: Iterable[str], fmt: str) -> Iterator[ParsedTransaction]:
+    parser = PARSERS.get(fmt.lower())
+    if parser is None:
+        raise ValueError(f"Unsupported import format '{fmt}'")
+    return parser(lines)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from calendar import monthrange
 from collections import defaultdict
-from dataclasses import dataclass
-from datetime import datetime, timezone
-from statistics import mean
-from typing import Any
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from math import sqrt
+from operator import itemgetter
+from statistics import mean, median
+from typing import Any, Iterable, Iterator, NamedTuple, Sequence
 
 
 # ===========================================================================
@@ -21,9 +24,12 @@ class FinanceRuleConfig:
     budget_monthly_shortfall_percent: float = 1.0
     recurring_min_occurrences: int = 3
     recurring_tolerance_percent: float = 0.2
+    recurring_min_regularity: float = 0.75
     savings_missed_months_threshold: int = 1
     portfolio_concentration_caution: float = 0.35
     volatility_alert_threshold: float = 0.75
+    anomaly_z_threshold: float = 3.0
+    anomaly_min_samples: int = 5
 
 
 DEFAULT_RULES = FinanceRuleConfig()
@@ -242,33 +248,123 @@ class FinanceAlertEngine:
         return alerts
 
     def _unusual_spending_alerts(self, snapshot: dict[str, Any]) -> list[dict[str, Any]]:
+        """One alert per expense scored as an anomaly against its spending baseline.
+
+        ``snapshot["anomalies"]`` holds ``AnomalyRecord`` dicts, as produced by
+        ``FinanceService.detect_anomalies``; only ``is_anomaly`` rows alert.
+        """
         alerts: list[dict[str, Any]] = []
-        transactions = snapshot.get("transactions", [])
-        if len(transactions) < 10:
-            return alerts
-        expenses = [(tx.get("merchant", ""), abs(int(tx.get("amount_cents", 0)))) for tx in transactions if _is_expense(tx)]
-        if not expenses:
-            return alerts
-        amounts = [a for _, a in expenses]
-        avg = mean(amounts)
-        std_estimate = (max(amounts) - min(amounts)) / 4 if len(amounts) > 1 else avg
-        threshold = avg + 2 * std_estimate
-        for merchant, amount in expenses[:5]:
-            if amount > threshold and amount > 5000:
-                alerts.append(_alert(
-                    alert_type="unusual_spending",
-                    severity="advisory",
-                    title="Unusual transaction amount",
-                    message=f"Transaction of {amount / 100:.2f} at '{merchant or 'unknown'}' is significantly above average.",
-                    source_rule="anomaly_detection_amount",
-                    entity_type="transaction",
-                    entity_id="",
-                    next_step="Verify this was an intentional purchase.",
-                ))
-                break
+        for anomaly in snapshot.get("anomalies", []):
+            if not anomaly.get("is_anomaly"):
+                continue
+            amount = abs(int(anomaly.get("amount_cents", 0)))
+            merchant = anomaly.get("merchant") or "unknown"
+            alerts.append(_alert(
+                alert_type="unusual_spending",
+                severity="advisory",
+                title="Unusual transaction amount",
+                message=(
+                    f"Transaction of {amount / 100:.2f} at '{merchant}' is {anomaly['z_score']:.1f} "
+                    "standard deviations above its usual amount."
+                ),
+                source_rule="anomaly_detection_amount",
+                entity_type="transaction",
+                entity_id=anomaly.get("transaction_id", ""),
+                next_step="Verify this was an intentional purchase.",
+            ))
         return alerts
 
 
+# ===========================================================================
+# Expense stream — insights and guidance are folds over one pass of it
+# ===========================================================================
+
+# Charges at or below this count towards "spending leaks".
+SMALL_CHARGE_MAX_CENTS = 1500
+
+
+class ExpenseRow(NamedTuple):
+    """One expense, normalised once before it is fed to every fold."""
+
+    transaction_date: str
+    amount_cents: int  # absolute
+    category: str
+    merchant: str  # stripped and lower-cased, "" when unknown
+
+
+def expense_rows(transactions: Iterable[dict[str, Any]]) -> Iterator[ExpenseRow]:
+    """Expense rows from transaction dicts (snapshots, ``Transaction.__dict__``)."""
+    for tx in transactions:
+        if _is_expense(tx):
+            yield ExpenseRow(
+                tx.get("transaction_date") or "",
+                abs(int(tx.get("amount_cents", 0))),
+                tx.get("category_id") or tx.get("category", "uncategorized"),
+                (tx.get("merchant") or "").strip().lower(),
+            )
+
+
+def ledger_expense_rows(rows: Iterable[tuple[str, int, str | None, str | None]]) -> Iterator[ExpenseRow]:
+    """Expense rows from ``FinanceRepository.iter_expenses`` tuples."""
+    for transaction_date, amount_cents, category_id, merchant in rows:
+        yield ExpenseRow(
+            transaction_date or "",
+            abs(int(amount_cents)),
+            category_id or "uncategorized",
+            (merchant or "").strip().lower(),
+        )
+
+
+@dataclass
+class CategoryTotals:
+    totals: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    total: int = 0
+
+    def add(self, row: ExpenseRow) -> None:
+        self.totals[row.category] += row.amount_cents
+        self.total += row.amount_cents
+
+    def top(self, count: int) -> list[tuple[str, int]]:
+        return sorted(self.totals.items(), key=lambda x: -x[1])[:count]
+
+
+@dataclass
+class MerchantTotals:
+    """Spend and count per merchant; ``max_amount_cents`` restricts it to small charges."""
+
+    max_amount_cents: int | None = None
+    totals: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    counts: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def add(self, row: ExpenseRow) -> None:
+        if not row.merchant:
+            return
+        if self.max_amount_cents is not None and row.amount_cents > self.max_amount_cents:
+            return
+        self.totals[row.merchant] += row.amount_cents
+        self.counts[row.merchant] += 1
+
+    def frequent(self, min_count: int) -> list[str]:
+        return [m for m in self.totals if self.counts[m] >= min_count]
+
+
+@dataclass
+class MonthlyTotals:
+    totals: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def add(self, row: ExpenseRow) -> None:
+        if len(row.transaction_date) >= 7:
+            self.totals[row.transaction_date[:7]] += row.amount_cents
+
+
+def _fold(rows: Iterable[ExpenseRow], *folds: Any) -> None:
+    """Feed every row to every fold in a single pass; memory is bounded by the fold keys."""
+    adds = [fold.add for fold in folds]
+    for row in rows:
+        for add in adds:
+            add(row)
+
+
 # ===========================================================================
 # F. INSIGHT ENGINE — data-backed, deterministic or marked heuristic
 # ===========================================================================
@@ -282,49 +378,63 @@ class FinanceInsightEngine:
     - Concise and explainable
     """
 
-    def analyze(self, transactions: list[dict[str, Any]], date_from: str = "", date_to: str = "") -> list[dict[str, Any]]:
+    def analyze(self, transactions: Iterable[dict[str, Any]], date_from: str = "", date_to: str = "") -> list[dict[str, Any]]:
+        return self.analyze_expenses(expense_rows(transactions))
+
+    def analyze_expenses(self, rows: Iterable[ExpenseRow]) -> list[dict[str, Any]]:
+        """Insights over a stream of expense rows of any length, read once."""
+        categories = CategoryTotals()
+        merchants = MerchantTotals()
+        small_merchants = MerchantTotals(max_amount_cents=SMALL_CHARGE_MAX_CENTS)
+        monthly = MonthlyTotals()
+        _fold(rows, categories, merchants, small_merchants, monthly)
+        return self._insights(categories, merchants, small_merchants, monthly)
+
+    def analyze_columns(self, columns: Any) -> list[dict[str, Any]]:
+        """Insights over a ``core.finance.columnar.TransactionColumns`` window.
+
+        Same output as :meth:`analyze`; the totals are computed with NumPy.
+        """
+        return self._insights(
+            columns.category_totals(),
+            columns.merchant_totals(),
+            columns.merchant_totals(max_amount_cents=SMALL_CHARGE_MAX_CENTS),
+            columns.monthly_totals(),
+        )
+
+    def _insights(
+        self,
+        categories: CategoryTotals,
+        merchants: MerchantTotals,
+        small_merchants: MerchantTotals,
+        monthly: MonthlyTotals,
+    ) -> list[dict[str, Any]]:
         insights: list[dict[str, Any]] = []
-        if not transactions:
-            return insights
-        insights.extend(self._spending_by_category(transactions))
-        insights.extend(self._merchant_breakdown(transactions))
-        insights.extend(self._recurring_detection(transactions))
-        insights.extend(self._month_over_month(transactions))
-        insights.extend(self._top_spending_categories(transactions))
-        insights.extend(self._spending_leaks(transactions))
+        insights.extend(self._spending_by_category(categories))
+        insights.extend(self._merchant_breakdown(merchants))
+        insights.extend(self._recurring_detection(merchants))
+        insights.extend(self._month_over_month(monthly))
+        insights.extend(self._top_spending_categories(categories))
+        insights.extend(self._spending_leaks(small_merchants))
         return insights
 
-    def _spending_by_category(self, transactions: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        category_totals: dict[str, int] = defaultdict(int)
-        total = 0
-        for tx in transactions:
-            if _is_expense(tx):
-                amount = abs(int(tx.get("amount_cents", 0)))
-                cat = tx.get("category_id") or tx.get("category", "uncategorized")
-                category_totals[cat] += amount
-                total += amount
-        if not category_totals or total == 0:
+    def _spending_by_category(self, categories: CategoryTotals) -> list[dict[str, Any]]:
+        if not categories.totals or categories.total == 0:
             return []
-        top = sorted(category_totals.items(), key=lambda x: -x[1])[:3]
+        top = categories.top(3)
         top_desc = ", ".join(f"{cat} ({amt / 100:.2f})" for cat, amt in top)
         return [{
             "pattern": "category_breakdown",
-            "score": round(top[0][1] / total, 2),
+            "score": round(top[0][1] / categories.total, 2),
             "reason": f"Top spending categories: {top_desc}.",
             "suggestion": "Review top categories for reduction opportunities.",
             "data_source": "transaction_aggregation",
         }]
 
-    def _merchant_breakdown(self, transactions: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        merchant_totals: dict[str, int] = defaultdict(int)
-        for tx in transactions:
-            if _is_expense(tx):
-                merchant = (tx.get("merchant") or "").strip().lower()
-                if merchant:
-                    merchant_totals[merchant] += abs(int(tx.get("amount_cents", 0)))
-        if not merchant_totals:
+    def _merchant_breakdown(self, merchants: MerchantTotals) -> list[dict[str, Any]]:
+        if not merchants.totals:
             return []
-        top = sorted(merchant_totals.items(), key=lambda x: -x[1])[:5]
+        top = sorted(merchants.totals.items(), key=lambda x: -x[1])[:5]
         top_desc = ", ".join(f"{m} ({a / 100:.2f})" for m, a in top)
         return [{
             "pattern": "merchant_breakdown",
@@ -334,18 +444,15 @@ class FinanceInsightEngine:
             "data_source": "transaction_aggregation",
         }]
 
-    def _recurring_detection(self, transactions: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        by_merchant: dict[str, list[int]] = defaultdict(list)
-        for tx in transactions:
-            if _is_expense(tx):
-                merchant = (tx.get("merchant") or "").strip().lower()
-                if merchant:
-                    by_merchant[merchant].append(abs(int(tx.get("amount_cents", 0))))
-        recurring = []
-        for merchant, amounts in by_merchant.items():
-            if len(amounts) >= 3:
-                avg = int(mean(amounts))
-                recurring.append({"merchant": merchant, "occurrences": len(amounts), "avg_cents": avg})
+    def _recurring_detection(self, merchants: MerchantTotals) -> list[dict[str, Any]]:
+        recurring = [
+            {
+                "merchant": merchant,
+                "occurrences": merchants.counts[merchant],
+                "avg_cents": merchants.totals[merchant] // merchants.counts[merchant],
+            }
+            for merchant in merchants.frequent(3)
+        ]
         if not recurring:
             return []
         recurring.sort(key=lambda x: -x["occurrences"])
@@ -358,17 +465,10 @@ class FinanceInsightEngine:
             "data_source": "merchant_frequency_analysis",
         }]
 
-    def _month_over_month(self, transactions: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        monthly: dict[str, int] = defaultdict(int)
-        for tx in transactions:
-            if _is_expense(tx):
-                tx_date = tx.get("transaction_date", "")
-                if len(tx_date) >= 7:
-                    month_key = tx_date[:7]
-                    monthly[month_key] += abs(int(tx.get("amount_cents", 0)))
-        if len(monthly) < 2:
+    def _month_over_month(self, monthly: MonthlyTotals) -> list[dict[str, Any]]:
+        if len(monthly.totals) < 2:
             return []
-        sorted_months = sorted(monthly.items())
+        sorted_months = sorted(monthly.totals.items())
         latest = sorted_months[-1]
         previous = sorted_months[-2]
         if previous[1] == 0:
@@ -383,15 +483,10 @@ class FinanceInsightEngine:
             "data_source": "monthly_aggregation",
         }]
 
-    def _top_spending_categories(self, transactions: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        category_totals: dict[str, int] = defaultdict(int)
-        for tx in transactions:
-            if _is_expense(tx):
-                cat = tx.get("category_id") or tx.get("category", "uncategorized")
-                category_totals[cat] += abs(int(tx.get("amount_cents", 0)))
-        if not category_totals:
+    def _top_spending_categories(self, categories: CategoryTotals) -> list[dict[str, Any]]:
+        if not categories.totals:
             return []
-        top = sorted(category_totals.items(), key=lambda x: -x[1])[:3]
+        top = categories.top(3)
         return [{
             "pattern": "top_spending_categories",
             "score": float(len(top)),
@@ -400,17 +495,8 @@ class FinanceInsightEngine:
             "data_source": "category_ranking",
         }]
 
-    def _spending_leaks(self, transactions: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        small_txns: dict[str, int] = defaultdict(int)
-        small_counts: dict[str, int] = defaultdict(int)
-        for tx in transactions:
-            if _is_expense(tx):
-                amount = abs(int(tx.get("amount_cents", 0)))
-                merchant = (tx.get("merchant") or "").strip().lower()
-                if amount <= 1500 and merchant:
-                    small_txns[merchant] += amount
-                    small_counts[merchant] += 1
-        leaks = [(m, small_txns[m], small_counts[m]) for m in small_txns if small_counts[m] >= 3]
+    def _spending_leaks(self, small_merchants: MerchantTotals) -> list[dict[str, Any]]:
+        leaks = [(m, small_merchants.totals[m], small_merchants.counts[m]) for m in small_merchants.frequent(3)]
         if not leaks:
             return []
         leaks.sort(key=lambda x: -x[1])
@@ -440,33 +526,40 @@ class FinanceGuidanceEngine:
 
     def generate(
         self,
-        transactions: list[dict[str, Any]],
+        transactions: Iterable[dict[str, Any]],
         budgets: list[dict[str, Any]] | None = None,
         bills: list[dict[str, Any]] | None = None,
         savings_goals: list[dict[str, Any]] | None = None,
     ) -> list[dict[str, Any]]:
+        return self.generate_from_expenses(expense_rows(transactions), budgets, bills, savings_goals)
+
+    def generate_from_expenses(
+        self,
+        rows: Iterable[ExpenseRow],
+        budgets: list[dict[str, Any]] | None = None,
+        bills: list[dict[str, Any]] | None = None,
+        savings_goals: list[dict[str, Any]] | None = None,
+    ) -> list[dict[str, Any]]:
+        categories = CategoryTotals()
+        merchants = MerchantTotals()
+        _fold(rows, categories, merchants)
+
         guidance: list[dict[str, Any]] = []
-        guidance.extend(self._overspending_guidance(transactions, budgets or []))
+        guidance.extend(self._overspending_guidance(categories, budgets or []))
         guidance.extend(self._savings_guidance(savings_goals or []))
         guidance.extend(self._timing_guidance(bills or []))
-        guidance.extend(self._subscription_guidance(transactions))
-        guidance.extend(self._budget_adjustment_guidance(transactions, budgets or []))
+        guidance.extend(self._subscription_guidance(merchants))
+        guidance.extend(self._budget_adjustment_guidance(categories, budgets or []))
         return guidance
 
-    def _overspending_guidance(self, transactions: list[dict[str, Any]], budgets: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def _overspending_guidance(self, categories: CategoryTotals, budgets: list[dict[str, Any]]) -> list[dict[str, Any]]:
         guidance: list[dict[str, Any]] = []
-        category_spend: dict[str, int] = defaultdict(int)
-        for tx in transactions:
-            if _is_expense(tx):
-                cat = tx.get("category_id") or tx.get("category", "uncategorized")
-                category_spend[cat] += abs(int(tx.get("amount_cents", 0)))
-
         for budget in budgets:
             limit = int(budget.get("amount_limit_cents", 0))
             cat_id = budget.get("category_id")
             if limit <= 0 or not cat_id:
                 continue
-            spent = category_spend.get(cat_id, 0)
+            spent = categories.totals.get(cat_id, 0)
             if spent > limit:
                 overage = spent - limit
                 guidance.append({
@@ -516,16 +609,8 @@ class FinanceGuidanceEngine:
             })
         return guidance
 
-    def _subscription_guidance(self, transactions: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        by_merchant: dict[str, int] = defaultdict(int)
-        by_merchant_count: dict[str, int] = defaultdict(int)
-        for tx in transactions:
-            if _is_expense(tx):
-                merchant = (tx.get("merchant") or "").strip().lower()
-                if merchant:
-                    by_merchant[merchant] += abs(int(tx.get("amount_cents", 0)))
-                    by_merchant_count[merchant] += 1
-        recurring = [(m, by_merchant[m]) for m in by_merchant if by_merchant_count[m] >= 3]
+    def _subscription_guidance(self, merchants: MerchantTotals) -> list[dict[str, Any]]:
+        recurring = [(m, merchants.totals[m]) for m in merchants.frequent(3)]
         if not recurring:
             return []
         recurring.sort(key=lambda x: -x[1])
@@ -538,19 +623,14 @@ class FinanceGuidanceEngine:
             "traceable_basis": f"Merchants with 3+ transactions: {', '.join(m for m, _ in recurring[:5])}.",
         }]
 
-    def _budget_adjustment_guidance(self, transactions: list[dict[str, Any]], budgets: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def _budget_adjustment_guidance(self, categories: CategoryTotals, budgets: list[dict[str, Any]]) -> list[dict[str, Any]]:
         guidance: list[dict[str, Any]] = []
-        category_spend: dict[str, int] = defaultdict(int)
-        for tx in transactions:
-            if _is_expense(tx):
-                cat = tx.get("category_id") or tx.get("category", "uncategorized")
-                category_spend[cat] += abs(int(tx.get("amount_cents", 0)))
         for budget in budgets:
             limit = int(budget.get("amount_limit_cents", 0))
             cat_id = budget.get("category_id")
             if limit <= 0 or not cat_id:
                 continue
-            spent = category_spend.get(cat_id, 0)
+            spent = categories.totals.get(cat_id, 0)
             usage = spent / limit if limit > 0 else 0
             if usage < 0.3:
                 guidance.append({
@@ -563,6 +643,84 @@ class FinanceGuidanceEngine:
         return guidance
 
 
+# ===========================================================================
+# H. RECURRING DETECTION — cadence from inter-arrival gaps
+# ===========================================================================
+
+@dataclass(frozen=True)
+class Cadence:
+    name: str
+    nominal_days: int
+    min_gap_days: int
+    max_gap_days: int
+
+
+# Bands are wide enough for 28-31 day months and charges shifted off weekends.
+CADENCES = (
+    Cadence("weekly", 7, 6, 8),
+    Cadence("biweekly", 14, 12, 16),
+    Cadence("monthly", 30, 26, 35),
+    Cadence("annual", 365, 350, 380),
+)
+
+
+def detect_cadence(
+    charges: Sequence[tuple[str, int]],
+    config: FinanceRuleConfig | None = None,
+) -> dict[str, Any] | None:
+    """Classify one merchant's ``(date, amount_cents)`` charges, oldest first.
+
+    The median gap between charges picks the cadence; at least
+    ``recurring_min_regularity`` of the gaps must fall inside its band and of
+    the amounts within ``recurring_tolerance_percent`` of the median amount.
+    Returns ``None`` when the charges do not look recurring.
+    """
+    rules = config or DEFAULT_RULES
+    if len(charges) < max(rules.recurring_min_occurrences, 2):
+        return None
+    try:
+        days = [date.fromisoformat(day[:10]) for day, _ in charges]
+    except ValueError:
+        return None
+    gaps = [(later - earlier).days for earlier, later in zip(days, days[1:])]
+    typical_gap = median(gaps)
+    cadence = next((c for c in CADENCES if c.min_gap_days <= typical_gap <= c.max_gap_days), None)
+    if cadence is None:
+        return None
+    regular = sum(1 for gap in gaps if cadence.min_gap_days <= gap <= cadence.max_gap_days) / len(gaps)
+
+    amounts = [abs(int(amount)) for _, amount in charges]
+    typical_amount = median(amounts)
+    tolerance = typical_amount * rules.recurring_tolerance_percent
+    stable = sum(1 for amount in amounts if abs(amount - typical_amount) <= tolerance) / len(amounts)
+    if regular < rules.recurring_min_regularity or stable < rules.recurring_min_regularity:
+        return None
+
+    return {
+        "cadence": cadence.name,
+        "cadence_days": int(round(typical_gap)),
+        "occurrences": len(charges),
+        # Latest charges win so a price change is picked up quickly.
+        "expected_amount_cents": int(median(amounts[-3:])),
+        "last_seen_date": days[-1].isoformat(),
+        "next_expected_date": _next_charge(days[-1], cadence).isoformat(),
+        "confidence": round(regular * stable, 2),
+    }
+
+
+def _next_charge(last: date, cadence: Cadence) -> date:
+    if cadence.name == "monthly":
+        year, month = divmod(last.month, 12)
+        return _clamped_date(last.year + year, month + 1, last.day)
+    if cadence.name == "annual":
+        return _clamped_date(last.year + 1, last.month, last.day)
+    return last + timedelta(days=cadence.nominal_days)
+
+
+def _clamped_date(year: int, month: int, day: int) -> date:
+    return date(year, month, min(day, monthrange(year, month)[1]))
+
+
 # ===========================================================================
 # Legacy FinanceCognition (backward compatibility)
 # ===========================================================================
@@ -624,24 +782,20 @@ class FinanceCognition:
         return insights
 
     def detect_recurring_expenses(self, transactions: list[dict[str, Any]], min_occurrences: int = 3) -> list[dict[str, Any]]:
-        by_merchant: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        by_merchant: dict[str, list[tuple[str, int]]] = defaultdict(list)
         for tx in transactions:
             merchant = (tx.get("merchant") or "").strip().lower()
             if _is_expense(tx) and merchant:
-                by_merchant[merchant].append(tx)
+                day = str(tx.get("transaction_date") or tx.get("ts") or tx.get("created_at") or "")
+                by_merchant[merchant].append((day, int(tx.get("amount_cents", 0))))
 
+        config = FinanceRuleConfig(recurring_min_occurrences=min_occurrences)
         recurring: list[dict[str, Any]] = []
-        for merchant, txs in by_merchant.items():
-            if len(txs) < min_occurrences:
-                continue
-            amounts = [abs(int(tx.get("amount_cents", 0))) for tx in txs]
-            avg_amount = int(mean(amounts))
-            recurring.append({
-                "merchant": merchant,
-                "occurrences": len(txs),
-                "expected_amount_cents": avg_amount,
-                "cadence_days": 30,
-            })
+        for merchant, charges in by_merchant.items():
+            charges.sort(key=itemgetter(0))
+            detected = detect_cadence(charges, config)
+            if detected is not None:
+                recurring.append({"merchant": merchant, **detected})
         return sorted(recurring, key=lambda item: item["occurrences"], reverse=True)
 
 
@@ -681,6 +835,31 @@ def _is_expense(tx: dict[str, Any]) -> bool:
     return int(tx.get("amount_cents", 0)) < 0
 
 
+def baseline_z_score(
+    amount_cents: int,
+    count: int | None,
+    running_mean: float | None,
+    m2: float | None,
+    min_samples: int,
+) -> tuple[float, float, float, int] | None:
+    """``(z, mean, std, samples)`` of an amount against a stored baseline.
+
+    The baseline already contains the amount itself, so it is taken back out
+    (reverse Welford step) before scoring. Returns ``None`` below
+    ``min_samples`` prior amounts. The standard deviation is floored at 5% of
+    the mean so a perfectly regular charge does not score infinite on a
+    one-cent change.
+    """
+    if count is None or running_mean is None or m2 is None or count - 1 < max(min_samples, 2):
+        return None
+    x = float(abs(amount_cents))
+    prior = count - 1
+    prior_mean = (running_mean * count - x) / prior
+    prior_m2 = max(0.0, m2 - (x - running_mean) * (x - running_mean) * count / prior)
+    std = max(sqrt(prior_m2 / (prior - 1)), abs(prior_mean) * 0.05, 1.0)
+    return (x - prior_mean) / std, prior_mean, std, prior
+
+
 def _alert(
     alert_type: str,
     severity: str,
@@ -14,6 +14,7 @@ ALLOWED_FINANCE_ACTIONS = {
     "delete_transaction",
     "get_transaction",
     "list_transactions",
+    "import_transactions",
     "get_spending_summary",
     "get_category_summary",
     "get_account_summary",
@@ -1,24 +1,336 @@
 from __future__ import annotations
 
 import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Sequence
 from uuid import uuid4
 
-from core.storage.db import get_connection, init_db
+from core.storage.db import get_connection, init_db, resolve_db_path
+from core.storage.migrations import ALERT_FINGERPRINT_SEPARATOR, SPENDING_BASELINE_ALPHA
 
-from .entities import Account, Alert, Bill, Budget, Category, SavingsGoal, Transaction
+from .entities import Account, Alert, Bill, Budget, Category, RecurringExpense, SavingsGoal, Transaction
 from .policy import FinanceConflictError
 
 
+# Chan et al. parallel merge of an import's (n, mean, M2) into the stored
+# baseline; the EWMA is advanced by the import's decay (?8) and increment (?9).
+_BASELINE_MERGE_SQL = """
+    INSERT INTO finance_spending_baselines (scope, key, n, mean, m2, ewma, last_date)
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7)
+    ON CONFLICT (scope, key) DO UPDATE SET
+        n = n + excluded.n,
+        mean = mean + (excluded.mean - mean) * excluded.n / (n + excluded.n),
+        m2 = m2 + excluded.m2 + (excluded.mean - mean) * (excluded.mean - mean) * n * excluded.n / (n + excluded.n),
+        ewma = ewma * ?8 + ?9,
+        last_date = MAX(COALESCE(last_date, ''), COALESCE(excluded.last_date, ''))
+"""
+
+# SQLite's LOWER() only folds ASCII; baseline keys must match the triggers.
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+# Columns an import supplies per row; the rest are the same for every row
+# of one import and are bound once per batch (see _IMPORT_INSERT_SQL).
+IMPORT_ROW_COLUMNS = ("id", "amount_cents", "merchant", "transaction_date", "category_id", "direction", "notes")
+
+_IMPORT_STAGING_SQL = f"CREATE TEMP TABLE IF NOT EXISTS finance_import_staging ({', '.join(IMPORT_ROW_COLUMNS)})"
+_IMPORT_INSERT_SQL = """
+    INSERT INTO transactions (
+        id, ts, amount_cents, currency, merchant, transaction_date,
+        category_id, account_id, direction, payment_method, notes,
+        source, tags, created_at, updated_at
+    )
+    SELECT id, :now, amount_cents, :currency, merchant, transaction_date,
+        category_id, :account_id, direction, NULL, notes,
+        :source, NULL, :now, :now
+    FROM temp.finance_import_staging
+"""
+_ROLLUP_DELTA_SQL = """
+    INSERT INTO finance_daily_rollups (
+        day, account_id, category_id, direction, currency, tx_count, amount_cents, abs_amount_cents
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (day, account_id, category_id, direction, currency) DO UPDATE SET
+        tx_count = tx_count + excluded.tx_count,
+        amount_cents = amount_cents + excluded.amount_cents,
+        abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents
+"""
+
+
+class _ImportDeltas:
+    """Rollup, spending-baseline and recurring-queue deltas of an import.
+
+    Each part mirrors the insert trigger it stands in for while the triggers
+    are paused. Rows are folded in as they are written (the baseline EWMA
+    depends on their order) and the totals are applied once, before the
+    commit, so every rollup day and baseline key is written once per import.
+    """
+
+    def __init__(self, *, account_id: str | None, currency: str) -> None:
+        self._account_id = account_id or ""
+        self._currency = currency
+        # (day, category_id, direction) -> tx_count, amount_cents, abs_amount_cents
+        self._rollups: dict[tuple[Any, ...], list[int]] = {}
+        # (scope, key) -> n, mean, m2, ewma seeded with the first sample, ewma from zero, last date
+        self._baselines: dict[tuple[str, str], list[Any]] = {}
+        # merchant -> its baseline key, () when it folds to nothing
+        self._merchant_keys: dict[str, tuple[str, ...]] = {}
+
+    def add(self, rows: Iterable[tuple[Any, ...]]) -> None:
+        alpha = SPENDING_BASELINE_ALPHA
+        keep = 1.0 - alpha
+        rollups = self._rollups
+        baselines = self._baselines
+        merchant_keys = self._merchant_keys
+        for _id, amount, merchant, day, category_id, direction, _notes in rows:
+            bucket = rollups.get((day, category_id, direction))
+            if bucket is None:
+                rollups[(day, category_id, direction)] = [1, amount, abs(amount)]
+            else:
+                bucket[0] += 1
+                bucket[1] += amount
+                bucket[2] += abs(amount)
+
+            if direction != "expense" and (direction == "income" or amount >= 0):
+                continue
+            x = float(abs(amount))
+            category_key = ("category", category_id or "uncategorized")
+            merchant_key = None
+            if merchant:
+                # LOWER(TRIM(merchant)) as the triggers compute it.
+                merchant_key = merchant_keys.get(merchant)
+                if merchant_key is None:
+                    key = merchant.strip(" ").translate(_ASCII_LOWER)
+                    merchant_key = merchant_keys[merchant] = ("merchant", key) if key else ()
+            for key in (category_key, merchant_key) if merchant_key else (category_key,):
+                entry = baselines.get(key)
+                if entry is None:
+                    baselines[key] = [1, x, 0.0, x, alpha * x, day]
+                    continue
+                n = entry[0] + 1
+                mean = entry[1]
+                delta = x - mean
+                mean += delta / n
+                entry[0] = n
+                entry[1] = mean
+                entry[2] += delta * (x - mean)
+                entry[3] += alpha * (x - entry[3])
+                entry[4] = entry[4] * keep + alpha * x
+                if day > entry[5]:
+                    entry[5] = day
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        keep = 1.0 - SPENDING_BASELINE_ALPHA
+        conn.executemany(
+            _ROLLUP_DELTA_SQL,
+            [
+                (day, self._account_id, category_id or "", direction, self._currency, *bucket)
+                for (day, category_id, direction), bucket in self._rollups.items()
+                if day is not None
+            ],
+        )
+        conn.executemany(
+            _BASELINE_MERGE_SQL,
+            [
+                (scope, key, n, mean, m2, ewma, last_date, keep ** n, increment)
+                for (scope, key), (n, mean, m2, ewma, increment, last_date) in self._baselines.items()
+            ],
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO finance_recurring_dirty (merchant_key) VALUES (?)",
+            [(key,) for scope, key in self._baselines if scope == "merchant"],
+        )
+
+
+def _drop_transaction_schema(conn: sqlite3.Connection) -> list[str]:
+    """Drop the secondary indexes and triggers on ``transactions``.
+
+    Returns the statements that recreate them, indexes first. The primary
+    key index has no stored SQL and stays.
+    """
+    objects = conn.execute(
+        """
+        SELECT type, name, sql FROM sqlite_master
+        WHERE tbl_name = 'transactions' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+        ORDER BY type = 'trigger', name
+        """
+    ).fetchall()
+    for kind, name, _sql in objects:
+        conn.execute(f'DROP {kind.upper()} "{name}"')
+    return [sql for _kind, _name, sql in objects]
+
+
+# Re-raising an alert in the same period refreshes the stored row instead of
+# adding another; a resolved alert stays resolved until the next period.
+_ALERT_UPSERT_SQL = """
+    INSERT INTO finance_alerts (
+        id, type, severity, title, message, source_rule,
+        related_entity_type, related_entity_id, created_at,
+        resolved_at, status, fingerprint, period, occurrences, last_seen_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, 'active', ?, ?, 1, ?)
+    ON CONFLICT (fingerprint) DO UPDATE SET
+        type = excluded.type,
+        severity = excluded.severity,
+        title = excluded.title,
+        message = excluded.message,
+        occurrences = occurrences + 1,
+        last_seen_at = excluded.last_seen_at
+"""
+
+
+def _alert_upsert_row(record: dict[str, Any]) -> tuple[Any, ...]:
+    period = record.get("period") or record["created_at"][:7]
+    fingerprint = ALERT_FINGERPRINT_SEPARATOR.join((
+        record["source_rule"],
+        record.get("related_entity_type") or "",
+        record.get("related_entity_id") or "",
+        period,
+    ))
+    return (
+        record["id"], record["type"], record["severity"],
+        record["title"], record["message"], record["source_rule"],
+        record.get("related_entity_type"), record.get("related_entity_id"),
+        record["created_at"], fingerprint, period, record["created_at"],
+    )
+
+
 def utc_now_iso() -> str:
     return datetime.now(tz=timezone.utc).isoformat()
 
 
+# One GROUP BY branch per breakdown; SQLite has no GROUPING SETS. The CTE is
+# materialized once from the covering idx_transactions_date_summary index.
+_SPENDING_SUMMARY_SQL = """
+WITH scoped AS (
+    SELECT
+        direction,
+        COALESCE(NULLIF(category_id, ''), 'uncategorized') AS category_key,
+        COALESCE(NULLIF(account_id, ''), 'unassigned') AS account_key,
+        COALESCE(NULLIF(merchant, ''), 'unknown') AS merchant_key,
+        currency,
+        ABS(amount_cents) AS amount
+    FROM transactions
+    WHERE {scope}
+)
+SELECT 'category' AS dimension, category_key AS key, SUM(amount) AS total, COUNT(*) AS n
+    FROM scoped GROUP BY category_key
+UNION ALL
+SELECT 'account', account_key, SUM(amount), COUNT(*) FROM scoped GROUP BY account_key
+UNION ALL
+SELECT 'merchant', merchant_key, SUM(amount), COUNT(*) FROM scoped GROUP BY merchant_key
+UNION ALL
+SELECT 'direction', direction, SUM(amount), COUNT(*) FROM scoped GROUP BY direction
+UNION ALL
+SELECT 'currency', currency, SUM(amount), COUNT(*) FROM scoped GROUP BY currency
+"""
+
+
+_ROLLUP_SUMMARY_SQL = """
+SELECT 'category' AS dimension, COALESCE(NULLIF(category_id, ''), 'uncategorized') AS key,
+       SUM(abs_amount_cents) AS total, SUM(tx_count) AS n
+    FROM finance_daily_rollups WHERE {scope} GROUP BY 2
+UNION ALL
+SELECT 'account', COALESCE(NULLIF(account_id, ''), 'unassigned'), SUM(abs_amount_cents), SUM(tx_count)
+    FROM finance_daily_rollups WHERE {scope} GROUP BY 2
+UNION ALL
+SELECT 'direction', direction, SUM(abs_amount_cents), SUM(tx_count)
+    FROM finance_daily_rollups WHERE {scope} GROUP BY 2
+UNION ALL
+SELECT 'currency', currency, SUM(abs_amount_cents), SUM(tx_count)
+    FROM finance_daily_rollups WHERE {scope} GROUP BY 2
+"""
+
+
+@dataclass
+class _Catalog:
+    """Process-wide copy of the small accounts/categories tables of one database.
+
+    Loaded lazily in full, then kept current by the repository's own writes
+    (write-through on create/update, full reload after bulk imports).
+    """
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    categories: dict[str, Category] | None = None
+    category_ids_by_name: dict[str, str] = field(default_factory=dict)
+    accounts: dict[str, Account] | None = None
+
+
+_CATALOGS: dict[str, _Catalog] = {}
+_CATALOGS_LOCK = threading.Lock()
+
+
+def _catalog() -> _Catalog:
+    key = str(resolve_db_path())
+    catalog = _CATALOGS.get(key)
+    if catalog is None:
+        with _CATALOGS_LOCK:
+            catalog = _CATALOGS.setdefault(key, _Catalog())
+    return catalog
+
+
+def invalidate_catalog() -> None:
+    """Drop cached accounts/categories (after writes made outside this repository)."""
+    catalog = _catalog()
+    with catalog.lock:
+        catalog.categories = None
+        catalog.category_ids_by_name = {}
+        catalog.accounts = None
+
+
 class FinanceRepository:
     def __init__(self) -> None:
         init_db()
 
+    # -----------------------------------------------------------------------
+    # Catalog cache
+    # -----------------------------------------------------------------------
+
+    def _categories(self) -> dict[str, Category]:
+        catalog = _catalog()
+        categories = catalog.categories
+        if categories is not None:
+            return categories
+        with get_connection() as conn:
+            rows = conn.execute("SELECT * FROM finance_categories ORDER BY created_at, id").fetchall()
+        loaded = {row["id"]: self._row_to_category(row) for row in rows}
+        with catalog.lock:
+            catalog.categories = loaded
+            catalog.category_ids_by_name = {}
+            for category in loaded.values():
+                catalog.category_ids_by_name.setdefault(category.name, category.id)
+        return loaded
+
+    def _cache_category(self, category: Category) -> None:
+        catalog = _catalog()
+        with catalog.lock:
+            if catalog.categories is None:
+                return
+            previous = catalog.categories.get(category.id)
+            if previous is not None and catalog.category_ids_by_name.get(previous.name) == previous.id:
+                del catalog.category_ids_by_name[previous.name]
+            catalog.categories = {**catalog.categories, category.id: category}
+            catalog.category_ids_by_name.setdefault(category.name, category.id)
+
+    def _accounts(self) -> dict[str, Account]:
+        catalog = _catalog()
+        accounts = catalog.accounts
+        if accounts is not None:
+            return accounts
+        with get_connection() as conn:
+            rows = conn.execute("SELECT * FROM finance_accounts").fetchall()
+        loaded = {row["id"]: self._row_to_account(row) for row in rows}
+        with catalog.lock:
+            catalog.accounts = loaded
+        return loaded
+
+    def _cache_account(self, account: Account) -> None:
+        catalog = _catalog()
+        with catalog.lock:
+            if catalog.accounts is not None:
+                catalog.accounts = {**catalog.accounts, account.id: account}
+
     # -----------------------------------------------------------------------
     # Accounts
     # -----------------------------------------------------------------------
@@ -44,12 +356,12 @@ class FinanceRepository:
             row = conn.execute("SELECT * FROM finance_accounts WHERE id = ?", (resolved_id,)).fetchone()
         if row is None:
             raise FinanceConflictError(f"Unable to persist account '{resolved_id}'")
-        return self._row_to_account(row)
+        account = self._row_to_account(row)
+        self._cache_account(account)
+        return account
 
     def get_account(self, account_id: str) -> Account | None:
-        with get_connection() as conn:
-            row = conn.execute("SELECT * FROM finance_accounts WHERE id = ?", (account_id,)).fetchone()
-        return self._row_to_account(row) if row else None
+        return self._accounts().get(account_id)
 
     def update_account(self, account_id: str, updates: dict[str, Any]) -> Account | None:
         if not updates:
@@ -60,17 +372,15 @@ class FinanceRepository:
         with get_connection() as conn:
             conn.execute(f"UPDATE finance_accounts SET {assignments} WHERE id = ?", params)
             row = conn.execute("SELECT * FROM finance_accounts WHERE id = ?", (account_id,)).fetchone()
-        return self._row_to_account(row) if row else None
+        if row is None:
+            return None
+        account = self._row_to_account(row)
+        self._cache_account(account)
+        return account
 
     def list_accounts(self, *, active_only: bool = True) -> list[Account]:
-        sql = "SELECT * FROM finance_accounts"
-        params: list[Any] = []
-        if active_only:
-            sql += " WHERE is_active = 1"
-        sql += " ORDER BY name ASC"
-        with get_connection() as conn:
-            rows = conn.execute(sql, params).fetchall()
-        return [self._row_to_account(row) for row in rows]
+        accounts = [account for account in self._accounts().values() if account.is_active or not active_only]
+        return sorted(accounts, key=lambda account: account.name)
 
     # -----------------------------------------------------------------------
     # Categories
@@ -94,17 +404,22 @@ class FinanceRepository:
             )
             row = conn.execute("SELECT * FROM finance_categories WHERE id = ?", (resolved_id,)).fetchone()
         assert row is not None
-        return self._row_to_category(row)
+        category = self._row_to_category(row)
+        self._cache_category(category)
+        return category
 
     def get_category(self, category_id: str) -> Category | None:
-        with get_connection() as conn:
-            row = conn.execute("SELECT * FROM finance_categories WHERE id = ?", (category_id,)).fetchone()
-        return self._row_to_category(row) if row else None
+        return self._categories().get(category_id)
+
+    def get_categories(self, category_ids: Iterable[str]) -> dict[str, Category]:
+        """Categories for the known ids among ``category_ids``, keyed by id."""
+        categories = self._categories()
+        return {category_id: categories[category_id] for category_id in category_ids if category_id in categories}
 
     def get_category_by_name(self, name: str) -> Category | None:
-        with get_connection() as conn:
-            row = conn.execute("SELECT * FROM finance_categories WHERE name = ?", (name,)).fetchone()
-        return self._row_to_category(row) if row else None
+        categories = self._categories()
+        category_id = _catalog().category_ids_by_name.get(name)
+        return categories.get(category_id) if category_id else None
 
     def update_category(self, category_id: str, updates: dict[str, Any]) -> Category | None:
         if not updates:
@@ -115,16 +430,15 @@ class FinanceRepository:
         with get_connection() as conn:
             conn.execute(f"UPDATE finance_categories SET {assignments} WHERE id = ?", params)
             row = conn.execute("SELECT * FROM finance_categories WHERE id = ?", (category_id,)).fetchone()
-        return self._row_to_category(row) if row else None
+        if row is None:
+            return None
+        category = self._row_to_category(row)
+        self._cache_category(category)
+        return category
 
     def list_categories(self, *, active_only: bool = True) -> list[Category]:
-        sql = "SELECT * FROM finance_categories"
-        if active_only:
-            sql += " WHERE is_active = 1"
-        sql += " ORDER BY name ASC"
-        with get_connection() as conn:
-            rows = conn.execute(sql).fetchall()
-        return [self._row_to_category(row) for row in rows]
+        categories = [category for category in self._categories().values() if category.is_active or not active_only]
+        return sorted(categories, key=lambda category: category.name)
 
     def ensure_category(self, name: str, cat_type: str = "expense") -> Category:
         existing = self.get_category_by_name(name)
@@ -168,6 +482,79 @@ class FinanceRepository:
         assert row is not None
         return self._row_to_transaction(row)
 
+    def import_transaction_batches(
+        self,
+        batches: Iterable[tuple[Sequence[dict[str, Any]], Sequence[tuple[Any, ...]]]],
+        *,
+        now: str,
+        currency: str,
+        account_id: str | None,
+        source: str,
+        on_batch: Callable[[int, int], None] | None = None,
+        rebuild_indexes_after: int = 5_000,
+    ) -> int:
+        """Insert ``(new_categories, rows)`` batches through a staging table.
+
+        ``rows`` are tuples in ``IMPORT_ROW_COLUMNS`` order; the remaining
+        columns come from the keyword arguments. Each batch is bound into a
+        temp staging table with ``executemany`` and moved into the ledger
+        with one ``INSERT ... SELECT``. All batches share one write
+        transaction: an import either lands completely or not at all.
+
+        The per-row rollup, spending-baseline and recurring triggers are
+        paused for the duration; their deltas are collected over every batch
+        and applied once at the end (``_ImportDeltas``).
+
+        Once the import has written ``rebuild_indexes_after`` rows and at
+        least as many as the ledger held before, the secondary indexes and
+        triggers on ``transactions`` are dropped and recreated from their
+        stored SQL before the commit: one sorted build per index is far
+        cheaper than maintaining eight indexes row by row. The DDL is part
+        of the same transaction, so other connections never see the ledger
+        without them. ``on_batch(batch_number, inserted)`` runs after each
+        batch is written (before the final commit).
+        """
+        constants = {"now": now, "currency": currency, "account_id": account_id, "source": source}
+        staging_sql = f"INSERT INTO temp.finance_import_staging VALUES ({', '.join('?' for _ in IMPORT_ROW_COLUMNS)})"
+        deltas = _ImportDeltas(account_id=account_id, currency=currency)
+        inserted = 0
+        suspended: list[str] = []
+        conn = get_connection()
+        try:
+            with conn:
+                conn.execute("INSERT INTO finance_rollup_pause (id) VALUES (1)")
+                conn.execute(_IMPORT_STAGING_SQL)
+                existing = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+                rebuild_after = max(rebuild_indexes_after, existing)
+                for number, (categories, rows) in enumerate(batches, start=1):
+                    if categories:
+                        conn.executemany(
+                            """
+                            INSERT INTO finance_categories (id, name, type, parent_category, is_system, is_active, created_at, updated_at)
+                            VALUES (:id, :name, :type, NULL, 0, 1, :created_at, :updated_at)
+                            """,
+                            categories,
+                        )
+                    conn.executemany(staging_sql, rows)
+                    conn.execute(_IMPORT_INSERT_SQL, constants)
+                    conn.execute("DELETE FROM temp.finance_import_staging")
+                    deltas.add(rows)
+                    inserted += len(rows)
+                    if not suspended and inserted >= rebuild_after:
+                        suspended = _drop_transaction_schema(conn)
+                    if on_batch is not None:
+                        on_batch(number, len(rows))
+                deltas.apply(conn)
+                for statement in suspended:
+                    conn.execute(statement)
+                conn.execute("DROP TABLE temp.finance_import_staging")
+                conn.execute("DELETE FROM finance_rollup_pause")
+        finally:
+            # Categories created inline bypass the write-through cache, and a
+            # rollback would leave cached names pointing at nothing.
+            invalidate_catalog()
+        return inserted
+
     def get_transaction(self, transaction_id: str) -> Transaction | None:
         with get_connection() as conn:
             row = conn.execute("SELECT * FROM transactions WHERE id = ?", (transaction_id,)).fetchone()
@@ -199,7 +586,100 @@ class FinanceRepository:
         direction: str | None = None,
         merchant: str | None = None,
         limit: int = 50,
+        after: Sequence[Any] | None = None,
     ) -> list[Transaction]:
+        """Newest-first transactions; ``after`` is the ``(transaction_date,
+        updated_at, id)`` key of the previous page's last row."""
+        sql, params = self._transaction_query(
+            date_from=date_from,
+            date_to=date_to,
+            category=category,
+            account_id=account_id,
+            direction=direction,
+            merchant=merchant,
+            limit=limit,
+            after=after,
+        )
+        with get_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._row_to_transaction(row) for row in rows]
+
+    def iter_expenses(
+        self,
+        *,
+        date_from: str,
+        date_to: str,
+        batch_size: int = 1000,
+    ) -> Iterator[tuple[str, int, str | None, str | None]]:
+        """Stream ``(transaction_date, amount_cents, category_id, merchant)``
+        for every expense in the range, newest first.
+
+        Reads only the columns of ``idx_transactions_date_summary`` (no table
+        lookups) and holds at most ``batch_size`` rows, so callers can fold
+        over ranges of any size. Expense classification matches the insight
+        engine: direction ``expense``, or a negative amount with no direction.
+        """
+        cursor = get_connection().execute(
+            """
+            SELECT transaction_date, amount_cents, category_id, merchant
+            FROM transactions
+            WHERE transaction_date >= ? AND transaction_date <= ?
+              AND (direction = 'expense'
+                   OR (COALESCE(direction, '') != 'income' AND amount_cents < 0))
+            ORDER BY transaction_date DESC
+            """,
+            (date_from, date_to),
+        )
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield tuple(row)
+        finally:
+            cursor.close()
+
+    def list_expenses_with_baselines(self, *, date_from: str, date_to: str, limit: int) -> list[dict[str, Any]]:
+        """Newest expenses in the range, each with its merchant and category
+        baseline rows (``merchant_*``/``category_*`` columns, NULL when absent).
+
+        One primary-key lookup per baseline; nothing is rescanned.
+        """
+        with get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT t.id, t.transaction_date, t.merchant, t.category_id, t.amount_cents,
+                       LOWER(TRIM(t.merchant)) AS merchant_key,
+                       m.n AS merchant_n, m.mean AS merchant_mean, m.m2 AS merchant_m2, m.ewma AS merchant_ewma,
+                       COALESCE(NULLIF(t.category_id, ''), 'uncategorized') AS category_key,
+                       c.n AS category_n, c.mean AS category_mean, c.m2 AS category_m2, c.ewma AS category_ewma
+                FROM transactions AS t
+                LEFT JOIN finance_spending_baselines AS m
+                    ON m.scope = 'merchant' AND m.key = LOWER(TRIM(t.merchant))
+                LEFT JOIN finance_spending_baselines AS c
+                    ON c.scope = 'category' AND c.key = COALESCE(NULLIF(t.category_id, ''), 'uncategorized')
+                WHERE t.transaction_date >= ? AND t.transaction_date <= ?
+                  AND (t.direction = 'expense' OR (t.direction != 'income' AND t.amount_cents < 0))
+                ORDER BY t.transaction_date DESC, t.updated_at DESC, t.id DESC
+                LIMIT ?
+                """,
+                (date_from, date_to, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def _transaction_query(
+        *,
+        date_from: str | None,
+        date_to: str | None,
+        category: str | None,
+        account_id: str | None,
+        direction: str | None,
+        merchant: str | None,
+        limit: int,
+        after: Sequence[Any] | None = None,
+    ) -> tuple[str, list[Any]]:
         sql = "SELECT * FROM transactions WHERE 1=1"
         params: list[Any] = []
         if date_from:
@@ -220,47 +700,121 @@ class FinanceRepository:
         if merchant:
             sql += " AND merchant = ?"
             params.append(merchant)
+        if after:
+            sql += " AND (transaction_date, updated_at, id) < (?, ?, ?)"
+            params.extend(after)
         sql += " ORDER BY transaction_date DESC, updated_at DESC, id DESC LIMIT ?"
         params.append(limit)
+        return sql, params
+
+    def summarize_spending(
+        self,
+        *,
+        date_from: str,
+        date_to: str,
+        account_id: str | None,
+        include_transactions: bool = False,
+    ) -> dict[str, Any]:
+        """Aggregate spending for a date range inside SQLite.
+
+        Transaction rows are only loaded when ``include_transactions`` is set.
+        """
+        scope = "transaction_date >= ? AND transaction_date <= ?"
+        scope_params: list[Any] = [date_from, date_to]
+        if account_id:
+            scope += " AND account_id = ?"
+            scope_params.append(account_id)
+        sql = _SPENDING_SUMMARY_SQL.format(scope=scope)
+        groups: dict[str, dict[str, int]] = {
+            "category": {}, "account": {}, "merchant": {}, "direction": {}, "currency": {},
+        }
+        currency_counts: dict[str, int] = {}
+        transaction_count = 0
         with get_connection() as conn:
-            rows = conn.execute(sql, params).fetchall()
-        return [self._row_to_transaction(row) for row in rows]
+            for row in conn.execute(sql, scope_params):
+                dimension, key, total, count = row[0], row[1], int(row[2] or 0), int(row[3])
+                groups[dimension][key] = total
+                if dimension == "direction":
+                    transaction_count += count
+                elif dimension == "currency":
+                    currency_counts[key] = count
+            transactions: list[Transaction] | None = None
+            if include_transactions:
+                rows = conn.execute(
+                    f"SELECT * FROM transactions WHERE {scope} ORDER BY transaction_date DESC, updated_at DESC, id DESC",
+                    scope_params,
+                ).fetchall()
+                transactions = [self._row_to_transaction(row) for row in rows]
+        by_direction = groups["direction"]
+        expense_cents = by_direction.get("expense", 0)
+        income_cents = by_direction.get("income", 0)
+        currency = max(currency_counts.items(), key=lambda item: (item[1], item[0]))[0] if currency_counts else None
+        snapshot: dict[str, Any] = {
+            "transaction_count": transaction_count,
+            "currency": currency,
+            "income_cents": income_cents,
+            "expense_cents": expense_cents,
+            "net_cents": income_cents - expense_cents,
+            "by_category": dict(sorted(groups["category"].items())),
+            "by_account": dict(sorted(groups["account"].items())),
+            "by_merchant": dict(sorted(groups["merchant"].items(), key=lambda x: (-x[1], x[0]))),
+            "by_direction": by_direction,
+        }
+        if transactions is not None:
+            snapshot["transactions"] = transactions
+        return snapshot
+
+    def summarize_daily_rollups(self, *, date_from: str, date_to: str, account_id: str | None) -> dict[str, Any]:
+        """Same totals as :meth:`summarize_spending`, minus the merchant breakdown.
 
-    def summarize_spending(self, *, date_from: str, date_to: str, account_id: str | None) -> dict[str, Any]:
-        sql = "SELECT * FROM transactions WHERE transaction_date >= ? AND transaction_date <= ?"
-        params: list[Any] = [date_from, date_to]
+        Reads ``finance_daily_rollups`` so the cost grows with the number of
+        days in range rather than the number of transactions.
+        """
+        scope = "day >= ? AND day <= ?"
+        scope_params: list[Any] = [date_from, date_to]
         if account_id:
-            sql += " AND account_id = ?"
-            params.append(account_id)
+            scope += " AND account_id = ?"
+            scope_params.append(account_id)
+        groups: dict[str, dict[str, int]] = {"category": {}, "account": {}, "direction": {}, "currency": {}}
+        currency_counts: dict[str, int] = {}
+        transaction_count = 0
         with get_connection() as conn:
-            rows = conn.execute(sql, params).fetchall()
-        transactions = [self._row_to_transaction(row) for row in rows]
-        expense_cents = sum(abs(tx.amount_cents) for tx in transactions if tx.direction == "expense")
-        income_cents = sum(abs(tx.amount_cents) for tx in transactions if tx.direction == "income")
-        by_category: dict[str, int] = {}
-        by_account: dict[str, int] = {}
-        by_merchant: dict[str, int] = {}
-        by_direction: dict[str, int] = {}
-        for tx in transactions:
-            abs_amount = abs(tx.amount_cents)
-            cat_key = tx.category_id or "uncategorized"
-            by_category[cat_key] = by_category.get(cat_key, 0) + abs_amount
-            account_key = tx.account_id or "unassigned"
-            by_account[account_key] = by_account.get(account_key, 0) + abs_amount
-            merchant_key = tx.merchant or "unknown"
-            by_merchant[merchant_key] = by_merchant.get(merchant_key, 0) + abs_amount
-            by_direction[tx.direction] = by_direction.get(tx.direction, 0) + abs_amount
+            for row in conn.execute(_ROLLUP_SUMMARY_SQL.format(scope=scope), scope_params * 4):
+                dimension, key, total, count = row[0], row[1], int(row[2] or 0), int(row[3] or 0)
+                groups[dimension][key] = total
+                if dimension == "direction":
+                    transaction_count += count
+                elif dimension == "currency":
+                    currency_counts[key] = count
+        by_direction = groups["direction"]
+        expense_cents = by_direction.get("expense", 0)
+        income_cents = by_direction.get("income", 0)
+        currency = max(currency_counts.items(), key=lambda item: (item[1], item[0]))[0] if currency_counts else None
         return {
-            "transactions": transactions,
+            "transaction_count": transaction_count,
+            "currency": currency,
             "income_cents": income_cents,
             "expense_cents": expense_cents,
             "net_cents": income_cents - expense_cents,
-            "by_category": dict(sorted(by_category.items())),
-            "by_account": dict(sorted(by_account.items())),
-            "by_merchant": dict(sorted(by_merchant.items(), key=lambda x: -x[1])),
+            "by_category": dict(sorted(groups["category"].items())),
+            "by_account": dict(sorted(groups["account"].items())),
             "by_direction": by_direction,
         }
 
+    def rollup_totals_by_category(self, *, date_from: str, date_to: str) -> dict[str, int]:
+        """Signed amount totals per category id (``''`` for uncategorized)."""
+        with get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT category_id, SUM(amount_cents) AS total
+                FROM finance_daily_rollups
+                WHERE day >= ? AND day <= ?
+                GROUP BY category_id
+                """,
+                (date_from, date_to),
+            ).fetchall()
+        return {row["category_id"]: int(row["total"] or 0) for row in rows}
+
     # -----------------------------------------------------------------------
     # Budgets
     # -----------------------------------------------------------------------
@@ -454,26 +1008,31 @@ class FinanceRepository:
     # -----------------------------------------------------------------------
 
     def create_alert(self, record: dict[str, Any]) -> Alert:
+        """Upsert one alert on its fingerprint, like :meth:`persist_brief`."""
         with get_connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO finance_alerts (
-                    id, type, severity, title, message, source_rule,
-                    related_entity_type, related_entity_id, created_at,
-                    resolved_at, status
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, 'active')
-                """,
-                (
-                    record["id"], record["type"], record["severity"],
-                    record["title"], record["message"], record["source_rule"],
-                    record.get("related_entity_type"), record.get("related_entity_id"),
-                    record["created_at"],
-                ),
-            )
-            row = conn.execute("SELECT * FROM finance_alerts WHERE id = ?", (record["id"],)).fetchone()
+            row = conn.execute(f"{_ALERT_UPSERT_SQL} RETURNING *", _alert_upsert_row(record)).fetchone()
         assert row is not None
         return self._row_to_alert(row)
 
+    def persist_brief(
+        self, alerts: Sequence[dict[str, Any]], behavior_logs: Sequence[dict[str, Any]]
+    ) -> None:
+        """Store one brief's alerts and behavior logs in a single transaction.
+
+        Alerts are upserted on their (source_rule, related entity, period)
+        fingerprint; ``period`` defaults to the month of ``created_at``.
+        """
+        with get_connection() as conn:
+            conn.executemany(_ALERT_UPSERT_SQL, [_alert_upsert_row(record) for record in alerts])
+            conn.executemany(
+                "INSERT INTO finance_behavior_logs (id, behavior_type, score, details, ts) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (record["id"], record["behavior_type"], record["score"],
+                     json.dumps(record.get("details", {}), sort_keys=True), record["ts"])
+                    for record in behavior_logs
+                ],
+            )
+
     def resolve_alert(self, alert_id: str) -> Alert | None:
         now = utc_now_iso()
         with get_connection() as conn:
@@ -484,15 +1043,98 @@ class FinanceRepository:
             row = conn.execute("SELECT * FROM finance_alerts WHERE id = ?", (alert_id,)).fetchone()
         return self._row_to_alert(row) if row else None
 
-    def list_alerts(self, *, limit: int = 100, active_only: bool = False) -> list[Alert]:
-        sql = "SELECT * FROM finance_alerts"
+    def list_alerts(
+        self, *, limit: int = 100, active_only: bool = False, after: Sequence[Any] | None = None
+    ) -> list[Alert]:
+        sql = "SELECT * FROM finance_alerts WHERE 1=1"
+        params: list[Any] = []
         if active_only:
-            sql += " WHERE status = 'active'"
-        sql += " ORDER BY created_at DESC LIMIT ?"
+            sql += " AND status = 'active'"
+        if after:
+            sql += " AND (created_at, id) < (?, ?)"
+            params.extend(after)
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
         with get_connection() as conn:
-            rows = conn.execute(sql, (limit,)).fetchall()
+            rows = conn.execute(sql, params).fetchall()
         return [self._row_to_alert(row) for row in rows]
 
+    # -----------------------------------------------------------------------
+    # Recurring expenses
+    # -----------------------------------------------------------------------
+
+    def refresh_recurring_expenses(
+        self, detect: Callable[[list[tuple[str, int]]], dict[str, Any] | None]
+    ) -> int:
+        """Re-classify the merchants queued by the ledger triggers.
+
+        ``detect`` gets one merchant's ``(transaction_date, amount_cents)``
+        expenses, oldest first, and returns the recurring fields or ``None``.
+        The queue is drained inside the same write transaction, so a charge
+        recorded meanwhile queues its merchant again. Returns how many
+        merchants were re-classified.
+        """
+        now = utc_now_iso()
+        with get_connection() as conn:
+            keys = [row[0] for row in conn.execute("DELETE FROM finance_recurring_dirty RETURNING merchant_key")]
+            for key in keys:
+                charges = conn.execute(
+                    """
+                    SELECT transaction_date, amount_cents FROM transactions
+                    WHERE LOWER(TRIM(merchant)) = ?
+                      AND (direction = 'expense' OR (direction != 'income' AND amount_cents < 0))
+                    ORDER BY transaction_date
+                    """,
+                    (key,),
+                ).fetchall()
+                detected = detect([(row[0], row[1]) for row in charges])
+                if detected is None:
+                    conn.execute(
+                        "UPDATE finance_recurring_expenses SET is_active = 0, updated_at = ? WHERE merchant = ? AND is_active = 1",
+                        (now, key),
+                    )
+                    continue
+                conn.execute(
+                    """
+                    INSERT INTO finance_recurring_expenses (
+                        id, merchant, expected_amount_cents, cadence_days, last_seen_ts, is_active,
+                        cadence, occurrences, next_expected_date, confidence, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?, ?)
+                    ON CONFLICT (merchant) DO UPDATE SET
+                        expected_amount_cents = excluded.expected_amount_cents,
+                        cadence_days = excluded.cadence_days,
+                        last_seen_ts = excluded.last_seen_ts,
+                        is_active = 1,
+                        cadence = excluded.cadence,
+                        occurrences = excluded.occurrences,
+                        next_expected_date = excluded.next_expected_date,
+                        confidence = excluded.confidence,
+                        updated_at = excluded.updated_at
+                    """,
+                    (
+                        str(uuid4()),
+                        key,
+                        detected["expected_amount_cents"],
+                        detected["cadence_days"],
+                        detected["last_seen_date"],
+                        detected["cadence"],
+                        detected["occurrences"],
+                        detected["next_expected_date"],
+                        detected["confidence"],
+                        now,
+                    ),
+                )
+        return len(keys)
+
+    def list_recurring_expenses(self, *, active_only: bool = True) -> list[RecurringExpense]:
+        sql = "SELECT * FROM finance_recurring_expenses"
+        if active_only:
+            sql += " WHERE is_active = 1"
+        sql += " ORDER BY next_expected_date, merchant"
+        with get_connection() as conn:
+            rows = conn.execute(sql).fetchall()
+        return [self._row_to_recurring_expense(row) for row in rows]
+
     # -----------------------------------------------------------------------
     # Rules (legacy support)
     # -----------------------------------------------------------------------
@@ -531,9 +1173,16 @@ class FinanceRepository:
                 (record["id"], record["behavior_type"], record["score"], json.dumps(record.get("details", {}), sort_keys=True), record["ts"]),
             )
 
-    def list_behavior_logs(self, limit: int = 200) -> list[dict[str, Any]]:
+    def list_behavior_logs(self, limit: int = 200, *, after: Sequence[Any] | None = None) -> list[dict[str, Any]]:
+        sql = "SELECT * FROM finance_behavior_logs"
+        params: list[Any] = []
+        if after:
+            sql += " WHERE (ts, id) < (?, ?)"
+            params.extend(after)
+        sql += " ORDER BY ts DESC, id DESC LIMIT ?"
+        params.append(limit)
         with get_connection() as conn:
-            rows = conn.execute("SELECT * FROM finance_behavior_logs ORDER BY ts DESC LIMIT ?", (limit,)).fetchall()
+            rows = conn.execute(sql, params).fetchall()
         parsed: list[dict[str, Any]] = []
         for row in rows:
             record = dict(row)
@@ -544,6 +1193,49 @@ class FinanceRepository:
             parsed.append(record)
         return parsed
 
+    def prune_behavior_logs(self, *, older_than: str, keep_latest: int) -> int:
+        """Delete logs with ``ts`` before ``older_than`` or beyond the newest ``keep_latest``."""
+        with get_connection() as conn:
+            aged = conn.execute("DELETE FROM finance_behavior_logs WHERE ts < ?", (older_than,)).rowcount
+            capped = conn.execute(
+                """
+                DELETE FROM finance_behavior_logs WHERE id IN (
+                    SELECT id FROM finance_behavior_logs ORDER BY ts DESC, id DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (keep_latest,),
+            ).rowcount
+        return aged + capped
+
+    def prune_resolved_alerts(self, *, older_than: str, keep_latest: int, current_period: str | None = None) -> int:
+        """Delete resolved alerts resolved before ``older_than`` or beyond the newest ``keep_latest``.
+
+        Active alerts are never pruned, nor are resolved alerts of
+        ``current_period`` (default: this month): their fingerprint row is
+        what keeps the next brief from raising them again as active.
+        """
+        period = current_period or utc_now_iso()[:7]
+        with get_connection() as conn:
+            aged = conn.execute(
+                """
+                DELETE FROM finance_alerts
+                WHERE status = 'resolved' AND COALESCE(resolved_at, created_at) < ?
+                  AND (period IS NULL OR period <> ?)
+                """,
+                (older_than, period),
+            ).rowcount
+            capped = conn.execute(
+                """
+                DELETE FROM finance_alerts WHERE id IN (
+                    SELECT id FROM finance_alerts
+                    WHERE status = 'resolved' AND (period IS NULL OR period <> ?)
+                    ORDER BY created_at DESC, id DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (period, keep_latest),
+            ).rowcount
+        return aged + capped
+
     # -----------------------------------------------------------------------
     # Row mappers
     # -----------------------------------------------------------------------
@@ -668,6 +1360,22 @@ class FinanceRepository:
             updated_at=row["updated_at"],
         )
 
+    @staticmethod
+    def _row_to_recurring_expense(row: Any) -> RecurringExpense:
+        return RecurringExpense(
+            id=row["id"],
+            merchant=row["merchant"],
+            cadence=row["cadence"],
+            cadence_days=int(row["cadence_days"]),
+            expected_amount_cents=int(row["expected_amount_cents"]),
+            occurrences=int(row["occurrences"]),
+            last_seen_date=row["last_seen_ts"],
+            next_expected_date=row["next_expected_date"],
+            confidence=float(row["confidence"]),
+            is_active=bool(row["is_active"]),
+            updated_at=row["updated_at"],
+        )
+
     @staticmethod
     def _row_to_alert(row: Any) -> Alert:
         keys = row.keys() if hasattr(row, "keys") else []
@@ -683,4 +1391,6 @@ class FinanceRepository:
             created_at=row["created_at"] if "created_at" in keys else row.get("ts", ""),
             resolved_at=row["resolved_at"] if "resolved_at" in keys else None,
             status=row["status"] if "status" in keys else "active",
+            occurrences=row["occurrences"] if "occurrences" in keys else 1,
+            last_seen_at=row["last_seen_at"] if "last_seen_at" in keys else None,
         )
@@ -325,6 +325,7 @@ class TransactionListFilters(BaseModel):
     direction: DIRECTION_TYPES | None = None
     merchant: str | None = None
     limit: int = Field(default=50, ge=1, le=500)
+    cursor: str | None = None
 
     @field_validator("date_from", "date_to", mode="before")
     @classmethod
@@ -351,6 +352,21 @@ class TransactionResponse(BaseModel):
 class TransactionsResponse(BaseModel):
     results: list[TransactionRecord]
     count: int
+    next_cursor: str | None = None
+
+
+class TransactionImportError(BaseModel):
+    line: int
+    message: str
+
+
+class TransactionImportSummary(BaseModel):
+    format: str
+    imported: int
+    skipped: int
+    batches: int
+    categories_created: int
+    errors: list[TransactionImportError]
 
 
 class DeleteResult(BaseModel):
@@ -386,6 +402,33 @@ class SpendingSummaryRequest(BaseModel):
         return self
 
 
+class AnomalyDetectionRequest(BaseModel):
+    date_from: date | str | None = None
+    date_to: date | str | None = None
+    limit: int = 200
+    include_normal: bool = False
+
+    @field_validator("date_from", "date_to", mode="before")
+    @classmethod
+    def validate_dates(cls, value: date | str | None) -> date | None:
+        return _validate_iso_date(value, "anomaly date", allow_none=True)
+
+    @field_validator("limit", mode="before")
+    @classmethod
+    def validate_limit(cls, value: Any) -> int:
+        if value is None:
+            return 200
+        message = "limit must be an integer between 1 and 1000."
+        if isinstance(value, str):
+            value = value.strip()
+            if not value.isdigit():
+                raise FinanceValidationError(message)
+            value = int(value)
+        if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= 1000:
+            raise FinanceValidationError(message)
+        return value
+
+
 class SummaryTotals(BaseModel):
     currency: str
     income_cents: int
@@ -773,11 +816,14 @@ class AlertRecord(BaseModel):
     created_at: str
     resolved_at: str | None
     status: str
+    occurrences: int = 1
+    last_seen_at: str | None = None
 
 
 class AlertsResponse(BaseModel):
     results: list[AlertRecord]
     count: int
+    next_cursor: str | None = None
 
 
 # ===========================================================================
@@ -798,6 +844,54 @@ class InsightsResponse(BaseModel):
     date_to: str
 
 
+class BaselineScore(BaseModel):
+    scope: str
+    key: str
+    z_score: float
+    baseline_mean_cents: float
+    baseline_std_cents: float
+    ewma_cents: float
+    samples: int
+
+
+class AnomalyRecord(BaseModel):
+    transaction_id: str
+    transaction_date: str
+    merchant: str | None
+    category_id: str | None
+    amount_cents: int
+    z_score: float | None
+    is_anomaly: bool
+    scores: list[BaselineScore]
+
+
+class AnomaliesResponse(BaseModel):
+    results: list[AnomalyRecord]
+    count: int
+    z_threshold: float
+    date_from: str
+    date_to: str
+
+
+class RecurringExpenseRecord(BaseModel):
+    id: str
+    merchant: str
+    cadence: str | None
+    cadence_days: int
+    expected_amount_cents: int
+    occurrences: int
+    last_seen_date: str
+    next_expected_date: str | None
+    confidence: float
+    updated_at: str | None
+
+
+class RecurringExpensesResponse(BaseModel):
+    results: list[RecurringExpenseRecord]
+    count: int
+    refreshed: int
+
+
 # ===========================================================================
 # G. GUIDANCE
 # ===========================================================================
@@ -827,6 +921,12 @@ class LegacySummaryReport(BaseModel):
     totals: dict[str, int]
 
 
+class BehaviorLogsResponse(BaseModel):
+    results: list[dict[str, Any]]
+    count: int
+    next_cursor: str | None = None
+
+
 class AuditExpectation(BaseModel):
     event: str
     redacted_note_excerpt: str | None = None
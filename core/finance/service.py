@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import re
+import secrets
+import time
 from datetime import date, datetime, timedelta, timezone
-from typing import Any
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator
 from uuid import uuid4
 
 from core.finance.audit import finance_audit
+from core.finance.columnar import TransactionColumns, columnar_available
+from core.finance.importers import IMPORT_FORMATS, parse_export
 from core.finance.intelligence import (
     DEFAULT_RULES,
     FinanceAlertEngine,
@@ -12,6 +18,9 @@ from core.finance.intelligence import (
     FinanceGuidanceEngine,
     FinanceInsightEngine,
     FinanceRuleConfig,
+    baseline_z_score,
+    detect_cadence,
+    ledger_expense_rows,
 )
 from core.finance.policy import (
     FinanceNotFoundError,
@@ -20,6 +29,7 @@ from core.finance.policy import (
     is_sensitive_action,
 )
 from core.finance.repository import FinanceRepository
+from core.storage.pagination import decode_cursor, split_page
 from core.finance.schemas import (
     AccountCreate,
     AccountRecord,
@@ -29,6 +39,10 @@ from core.finance.schemas import (
     AccountsResponse,
     AlertRecord,
     AlertsResponse,
+    AnomaliesResponse,
+    AnomalyRecord,
+    BaselineScore,
+    BehaviorLogsResponse,
     BillCreate,
     BillRecord,
     BillResponse,
@@ -52,6 +66,8 @@ from core.finance.schemas import (
     InsightRecord,
     InsightsResponse,
     LegacySummaryReport,
+    RecurringExpenseRecord,
+    RecurringExpensesResponse,
     SavingsGoalCreate,
     SavingsGoalRecord,
     SavingsGoalResponse,
@@ -63,12 +79,18 @@ from core.finance.schemas import (
     SpendingSummary,
     SpendingSummaryRequest,
     SummaryTotals,
+    DEFAULT_CATEGORY,
+    SUPPORTED_CURRENCIES,
+    TransactionImportError,
+    TransactionImportSummary,
     TransactionListFilters,
     TransactionRecord,
     TransactionResponse,
     TransactionUpdate,
     TransactionWrite,
     TransactionsResponse,
+    normalize_category,
+    parse_amount_to_cents,
 )
 
 
@@ -82,13 +104,75 @@ DEFAULT_RULE_THRESHOLDS: dict[str, float] = {
     "recurring_min_occurrences": float(DEFAULT_RULES.recurring_min_occurrences),
     "portfolio_concentration_caution": DEFAULT_RULES.portfolio_concentration_caution,
     "volatility_alert_threshold": DEFAULT_RULES.volatility_alert_threshold,
+    "anomaly_z_threshold": DEFAULT_RULES.anomaly_z_threshold,
+    "anomaly_min_samples": float(DEFAULT_RULES.anomaly_min_samples),
 }
 
+IMPORT_BATCH_SIZE = 5_000
+# Imports at least this large (and as large as the ledger) rebuild its indexes once.
+IMPORT_REBUILD_INDEXES_AFTER = 5_000
+_IMPORT_MAX_REPORTED_ERRORS = 50
+
+# Insight windows at least this long are totalled as NumPy columns; below it
+# building the columns costs more than the fold saves.
+COLUMNAR_INSIGHTS_MIN_ROWS = 10_000
+
+# Default look-back of detect_anomalies, and the window a brief alerts on.
+ANOMALY_WINDOW_DAYS = 30
+
+# Cursor kinds for keyset pagination (core.storage.pagination).
+_TRANSACTIONS_CURSOR = "transactions"
+_ALERTS_CURSOR = "alerts"
+_BEHAVIOR_LOGS_CURSOR = "behavior_logs"
+
 
 def _utc_now_iso() -> str:
     return datetime.now(tz=timezone.utc).isoformat()
 
 
+def _time_ordered_ids() -> Iterator[str]:
+    """UUIDv7-layout ids that sort in creation order.
+
+    Bulk imports use these so primary-key inserts append to the end of the
+    index instead of landing on random pages the way uuid4 keys do.
+    """
+    prefix = f"{time.time_ns() // 1_000_000:012x}"
+    head = f"{prefix[:8]}-{prefix[8:]}-7"
+    sequence = secrets.randbits(32)
+    low = (0b10 << 62) | secrets.randbits(34)
+    while True:
+        sequence += 1
+        # str(UUID(int=...)) of the 128-bit value, formatted in two pieces.
+        digits = f"{low | (sequence & 0xFFF_FFFF) << 34:016x}"
+        yield f"{head}{(sequence >> 28) & 0xFFF:03x}-{digits[:4]}-{digits[4:]}"
+
+
+_PLAIN_AMOUNT = re.compile(r"-?\d{1,12}(?:\.\d\d)?")
+
+
+def _import_amount_cents(amount: str) -> int:
+    """``parse_amount_to_cents`` with a fast path for plain decimals.
+
+    The export parsers emit signed decimal strings; those with no or exactly
+    two decimals need no Decimal rounding. Anything else, and every value
+    the checks reject, goes through ``parse_amount_to_cents``.
+    """
+    if _PLAIN_AMOUNT.fullmatch(amount) is None:
+        return parse_amount_to_cents(amount)
+    whole, _, fraction = amount.partition(".")
+    cents = int(whole + fraction) if fraction else int(whole) * 100
+    if cents == 0 or not -100_000_000_000 <= cents <= 100_000_000_000:
+        return parse_amount_to_cents(amount)
+    return cents
+
+
+def _clean_text(value: str | None, max_length: int) -> str | None:
+    if value is None:
+        return None
+    normalized = " ".join(value.split())
+    return normalized[:max_length] or None
+
+
 def _to_transaction_record(item: Any) -> TransactionRecord:
     return TransactionRecord(**item.__dict__)
 
@@ -113,6 +197,12 @@ def _to_alert_record(item: Any) -> AlertRecord:
     return AlertRecord(**item.__dict__)
 
 
+def _to_recurring_expense_record(item: Any) -> RecurringExpenseRecord:
+    fields = dict(item.__dict__)
+    fields.pop("is_active")
+    return RecurringExpenseRecord(**fields)
+
+
 def _to_category_record(item: Any) -> CategoryRecord:
     return CategoryRecord(**item.__dict__)
 
@@ -305,6 +395,138 @@ class FinanceService:
         )
         return TransactionResponse(transaction=_to_transaction_record(transaction))
 
+    def import_transactions(
+        self,
+        lines: Iterable[str],
+        *,
+        fmt: str,
+        account_id: str | None = None,
+        currency: str = "USD",
+        default_category: str = DEFAULT_CATEGORY,
+        source: str = "import",
+        batch_size: int = IMPORT_BATCH_SIZE,
+        rebuild_indexes_after: int = IMPORT_REBUILD_INDEXES_AFTER,
+    ) -> TransactionImportSummary:
+        """Stream a bank export into the ledger.
+
+        Rows are parsed one at a time and built straight into insert tuples;
+        category labels are resolved once each through an in-memory map (new
+        categories are created alongside the batch that first uses them).
+        Rows are written with ``executemany`` in ``batch_size`` chunks inside
+        a single transaction; large imports rebuild the ledger's secondary
+        indexes once at the end (see ``import_transaction_batches``). Invalid
+        rows are skipped and reported; a malformed file aborts the whole
+        import.
+        """
+        enforce_policy("import_transactions")
+        fmt = fmt.strip().lower()
+        if fmt not in IMPORT_FORMATS:
+            raise FinanceValidationError(f"Unsupported import format '{fmt}'")
+        currency = currency.strip().upper()
+        if currency not in SUPPORTED_CURRENCIES:
+            raise FinanceValidationError(f"Unsupported currency '{currency}'")
+        if account_id and self.repository.get_account(account_id) is None:
+            raise FinanceValidationError(f"Unknown account_id '{account_id}'")
+
+        category_ids = {category.name: category.id for category in self.repository.list_categories(active_only=False)}
+        # Category labels as they appear in the export, resolved once each.
+        label_ids: dict[str | None, str] = {}
+        fallback_category = normalize_category(default_category)
+        errors: list[TransactionImportError] = []
+        batch_skipped: list[int] = []
+        categories_created = 0
+        now = _utc_now_iso()
+        new_ids = _time_ordered_ids()
+
+        def resolve_category(label: str | None, new_categories: list[dict[str, Any]]) -> str:
+            nonlocal categories_created
+            name = normalize_category(label) if label else fallback_category
+            category_id = category_ids.get(name)
+            if category_id is None:
+                category_id = str(uuid4())
+                category_ids[name] = category_id
+                new_categories.append(
+                    {"id": category_id, "name": name, "type": "expense", "created_at": now, "updated_at": now}
+                )
+                categories_created += 1
+            label_ids[label] = category_id
+            return category_id
+
+        def batches() -> Iterator[tuple[list[dict[str, Any]], list[tuple[Any, ...]]]]:
+            new_categories: list[dict[str, Any]] = []
+            rows: list[tuple[Any, ...]] = []
+            skipped = 0
+            for parsed in parse_export(lines, fmt):
+                try:
+                    if parsed.transaction_date is None:
+                        raise FinanceValidationError("Missing or unrecognised date")
+                    if parsed.amount is None:
+                        raise FinanceValidationError("Missing amount")
+                    signed_cents = _import_amount_cents(parsed.amount)
+                except FinanceValidationError as exc:
+                    skipped += 1
+                    if len(errors) < _IMPORT_MAX_REPORTED_ERRORS:
+                        errors.append(TransactionImportError(line=parsed.line, message=exc.message))
+                    continue
+                category_id = label_ids.get(parsed.category) or resolve_category(parsed.category, new_categories)
+                # IMPORT_ROW_COLUMNS order (core.finance.repository).
+                rows.append((
+                    next(new_ids),
+                    -signed_cents if signed_cents < 0 else signed_cents,
+                    _clean_text(parsed.merchant, 160),
+                    parsed.transaction_date,
+                    category_id,
+                    "expense" if signed_cents < 0 else "income",
+                    _clean_text(parsed.notes, 1000),
+                ))
+                if len(rows) >= batch_size:
+                    batch_skipped.append(skipped)
+                    yield new_categories, rows
+                    new_categories, rows, skipped = [], [], 0
+            if rows or skipped:
+                batch_skipped.append(skipped)
+                yield new_categories, rows
+
+        def on_batch(number: int, inserted: int) -> None:
+            finance_audit(
+                "finance_transactions_import_batch",
+                format=fmt,
+                batch=number,
+                inserted=inserted,
+                skipped=batch_skipped[number - 1],
+            )
+
+        try:
+            imported = self.repository.import_transaction_batches(
+                batches(),
+                now=now,
+                currency=currency,
+                account_id=account_id,
+                source=source,
+                on_batch=on_batch,
+                rebuild_indexes_after=rebuild_indexes_after,
+            )
+        except ValueError as exc:
+            raise FinanceValidationError(str(exc)) from exc
+        summary = TransactionImportSummary(
+            format=fmt,
+            imported=imported,
+            skipped=sum(batch_skipped),
+            batches=len(batch_skipped),
+            categories_created=categories_created,
+            errors=errors,
+        )
+        finance_audit(
+            "finance_transactions_imported",
+            format=fmt,
+            account_id=account_id,
+            imported=summary.imported,
+            skipped=summary.skipped,
+            batches=summary.batches,
+            categories_created=categories_created,
+        )
+        return summary
+
     def delete_transaction(self, transaction_id: str) -> DeleteResult:
         enforce_policy("delete_transaction")
         deleted = self.repository.delete_transaction(transaction_id)
@@ -322,13 +544,21 @@ class FinanceService:
             account_id=filters.account_id,
             direction=filters.direction,
             merchant=filters.merchant,
-            limit=filters.limit,
+            limit=filters.limit + 1,
+            after=decode_cursor(_TRANSACTIONS_CURSOR, filters.cursor, 3),
+        )
+        results, next_cursor = split_page(
+            results, filters.limit, _TRANSACTIONS_CURSOR, lambda tx: (tx.transaction_date, tx.updated_at, tx.id)
         )
         finance_audit(
             "finance_transactions_listed",
             result_count=len(results),
         )
-        return TransactionsResponse(results=[_to_transaction_record(item) for item in results], count=len(results))
+        return TransactionsResponse(
+            results=[_to_transaction_record(item) for item in results],
+            count=len(results),
+            next_cursor=next_cursor,
+        )
 
     # -----------------------------------------------------------------------
     # A. LEDGER CORE — Summaries
@@ -341,7 +571,7 @@ class FinanceService:
             date_to=request.date_to.isoformat(),
             account_id=request.account_id,
         )
-        currency = snapshot["transactions"][0].currency if snapshot["transactions"] else "USD"
+        currency = snapshot["currency"] or "USD"
         response = SpendingSummary(
             date_from=request.date_from.isoformat(),
             date_to=request.date_to.isoformat(),
@@ -351,7 +581,7 @@ class FinanceService:
                 income_cents=snapshot["income_cents"],
                 expense_cents=snapshot["expense_cents"],
                 net_cents=snapshot["net_cents"],
-                transaction_count=len(snapshot["transactions"]),
+                transaction_count=snapshot["transaction_count"],
             ),
             by_category=snapshot["by_category"],
             by_account=snapshot["by_account"],
@@ -368,33 +598,40 @@ class FinanceService:
 
     def get_category_summary(self, request: SpendingSummaryRequest) -> CategorySummary:
         enforce_policy("get_category_summary")
-        spending = self.get_spending_summary(request)
+        snapshot = self._rollup_snapshot(request)
         categories = [
             {"category": category, "expense_cents": amount}
-            for category, amount in sorted(spending.by_category.items(), key=lambda item: (-item[1], item[0]))
+            for category, amount in sorted(snapshot["by_category"].items(), key=lambda item: (-item[1], item[0]))
         ]
         finance_audit("finance_category_summary_generated", category_count=len(categories))
         return CategorySummary(
-            date_from=spending.date_from,
-            date_to=spending.date_to,
-            account_id=spending.account_id,
+            date_from=request.date_from.isoformat(),
+            date_to=request.date_to.isoformat(),
+            account_id=request.account_id,
             categories=categories,
         )
 
     def get_account_summary(self, request: SpendingSummaryRequest) -> AccountSummary:
         enforce_policy("get_account_summary")
-        spending = self.get_spending_summary(request)
+        snapshot = self._rollup_snapshot(request)
         accounts = [
             {"account": account, "total_cents": amount}
-            for account, amount in sorted(spending.by_account.items(), key=lambda item: (-item[1], item[0]))
+            for account, amount in sorted(snapshot["by_account"].items(), key=lambda item: (-item[1], item[0]))
         ]
         finance_audit("finance_account_summary_generated", account_count=len(accounts))
         return AccountSummary(
-            date_from=spending.date_from,
-            date_to=spending.date_to,
+            date_from=request.date_from.isoformat(),
+            date_to=request.date_to.isoformat(),
             accounts=accounts,
         )
 
+    def _rollup_snapshot(self, request: SpendingSummaryRequest) -> dict[str, Any]:
+        return self.repository.summarize_daily_rollups(
+            date_from=request.date_from.isoformat(),
+            date_to=request.date_to.isoformat(),
+            account_id=request.account_id,
+        )
+
     # -----------------------------------------------------------------------
     # B. BUDGETING
     # -----------------------------------------------------------------------
@@ -466,7 +703,7 @@ class FinanceService:
         now = datetime.now(tz=timezone.utc)
         first_of_month = now.replace(day=1).date().isoformat()
         today = now.date().isoformat()
-        snapshot = self.repository.summarize_spending(date_from=first_of_month, date_to=today, account_id=None)
+        snapshot = self.repository.summarize_daily_rollups(date_from=first_of_month, date_to=today, account_id=None)
         by_category = snapshot.get("by_category", {})
         total_spent = snapshot.get("expense_cents", 0)
         statuses: list[BudgetStatusRecord] = []
@@ -686,11 +923,12 @@ class FinanceService:
     # E. ALERTS
     # -----------------------------------------------------------------------
 
-    def list_alerts(self, limit: int = 100) -> AlertsResponse:
+    def list_alerts(self, limit: int = 100, cursor: str | None = None) -> AlertsResponse:
         enforce_policy("list_alerts")
-        alerts = self.repository.list_alerts(limit=limit)
+        alerts = self.repository.list_alerts(limit=limit + 1, after=decode_cursor(_ALERTS_CURSOR, cursor, 2))
+        alerts, next_cursor = split_page(alerts, limit, _ALERTS_CURSOR, lambda alert: (alert.created_at, alert.id))
         records = [_to_alert_record(a) for a in alerts]
-        return AlertsResponse(results=records, count=len(records))
+        return AlertsResponse(results=records, count=len(records), next_cursor=next_cursor)
 
     def resolve_alert(self, alert_id: str) -> AlertRecord:
         enforce_policy("resolve_alert")
@@ -706,16 +944,115 @@ class FinanceService:
 
     def get_insights(self, date_from: str, date_to: str) -> InsightsResponse:
         enforce_policy("get_insights")
-        transactions = self.repository.list_transactions(
-            date_from=date_from, date_to=date_to, limit=500,
-        )
-        tx_dicts = [tx.__dict__ for tx in transactions]
+        rows = ledger_expense_rows(self.repository.iter_expenses(date_from=date_from, date_to=date_to))
         engine = FinanceInsightEngine()
-        insights = engine.analyze(tx_dicts, date_from=date_from, date_to=date_to)
+        if columnar_available():
+            head = list(islice(rows, COLUMNAR_INSIGHTS_MIN_ROWS))
+            if len(head) < COLUMNAR_INSIGHTS_MIN_ROWS:
+                insights = engine.analyze_expenses(head)
+            else:
+                insights = engine.analyze_columns(TransactionColumns.from_expenses(chain(head, rows)))
+        else:
+            insights = engine.analyze_expenses(rows)
         records = [InsightRecord(**i) for i in insights]
         finance_audit("finance_insights_generated", count=len(records))
         return InsightsResponse(results=records, date_from=date_from, date_to=date_to)
 
+    def detect_anomalies(
+        self,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        *,
+        limit: int = 200,
+        include_normal: bool = False,
+    ) -> AnomaliesResponse:
+        """Score recent expenses against their merchant and category baselines.
+
+        Baselines are maintained by the ledger triggers, so each transaction
+        costs two primary-key lookups. The higher of the two z-scores decides;
+        only unusually large amounts count as anomalies.
+        """
+        enforce_policy("detect_anomalies")
+        if not 1 <= limit <= 1000:
+            raise FinanceValidationError("limit must be between 1 and 1000")
+        today = datetime.now(tz=timezone.utc).date()
+        date_to = date_to or today.isoformat()
+        date_from = date_from or (today - timedelta(days=ANOMALY_WINDOW_DAYS)).isoformat()
+        config = self._load_rule_config()
+        records = self._score_expenses(date_from, date_to, config, limit=limit, include_normal=include_normal)
+        finance_audit(
+            "finance_anomalies_detected",
+            count=sum(1 for record in records if record.is_anomaly),
+            date_from=date_from,
+            date_to=date_to,
+        )
+        return AnomaliesResponse(
+            results=records,
+            count=len(records),
+            z_threshold=config.anomaly_z_threshold,
+            date_from=date_from,
+            date_to=date_to,
+        )
+
+    def _score_expenses(
+        self,
+        date_from: str,
+        date_to: str,
+        config: FinanceRuleConfig,
+        *,
+        limit: int,
+        include_normal: bool,
+    ) -> list[AnomalyRecord]:
+        records: list[AnomalyRecord] = []
+        for row in self.repository.list_expenses_with_baselines(date_from=date_from, date_to=date_to, limit=limit):
+            scores: list[BaselineScore] = []
+            for scope in ("merchant", "category"):
+                scored = baseline_z_score(
+                    row["amount_cents"], row[f"{scope}_n"], row[f"{scope}_mean"], row[f"{scope}_m2"],
+                    config.anomaly_min_samples,
+                )
+                if scored is None:
+                    continue
+                z_score, baseline_mean, baseline_std, samples = scored
+                scores.append(BaselineScore(
+                    scope=scope,
+                    key=row[f"{scope}_key"],
+                    z_score=round(z_score, 2),
+                    baseline_mean_cents=round(baseline_mean, 2),
+                    baseline_std_cents=round(baseline_std, 2),
+                    ewma_cents=round(row[f"{scope}_ewma"], 2),
+                    samples=samples,
+                ))
+            top = max((score.z_score for score in scores), default=None)
+            is_anomaly = top is not None and top >= config.anomaly_z_threshold
+            if is_anomaly or include_normal:
+                records.append(AnomalyRecord(
+                    transaction_id=row["id"],
+                    transaction_date=row["transaction_date"],
+                    merchant=row["merchant"],
+                    category_id=row["category_id"],
+                    amount_cents=row["amount_cents"],
+                    z_score=top,
+                    is_anomaly=is_anomaly,
+                    scores=scores,
+                ))
+        return records
+
+    def detect_recurring_expenses(self) -> RecurringExpensesResponse:
+        """Re-classify merchants with new ledger activity, then list active subscriptions.
+
+        The ledger triggers queue each merchant whose expenses changed, so
+        only those histories are re-read and run through the cadence detector.
+        """
+        enforce_policy("detect_recurring_expenses")
+        config = self._load_rule_config()
+        refreshed = self.repository.refresh_recurring_expenses(lambda charges: detect_cadence(charges, config))
+        records = [
+            _to_recurring_expense_record(item) for item in self.repository.list_recurring_expenses()
+        ]
+        finance_audit("finance_recurring_detected", count=len(records), refreshed=refreshed)
+        return RecurringExpensesResponse(results=records, count=len(records), refreshed=refreshed)
+
     # -----------------------------------------------------------------------
     # G. GUIDANCE
     # -----------------------------------------------------------------------
@@ -725,16 +1062,13 @@ class FinanceService:
         now = datetime.now(tz=timezone.utc)
         first_of_month = now.replace(day=1).date().isoformat()
         today = now.date().isoformat()
-        transactions = self.repository.list_transactions(
-            date_from=first_of_month, date_to=today, limit=500,
-        )
+        expenses = self.repository.iter_expenses(date_from=first_of_month, date_to=today)
         budgets = self.repository.list_budgets()
         bills = self.repository.get_due_bills(before_date=(now.date() + timedelta(days=14)).isoformat())
         goals = self.repository.list_savings_goals()
-        tx_dicts = [tx.__dict__ for tx in transactions]
         engine = FinanceGuidanceEngine()
-        guidance = engine.generate(
-            transactions=tx_dicts,
+        guidance = engine.generate_from_expenses(
+            ledger_expense_rows(expenses),
             budgets=[b.__dict__ for b in budgets],
             bills=[b.__dict__ for b in bills],
             savings_goals=[g.__dict__ for g in goals],
@@ -752,11 +1086,20 @@ class FinanceService:
         transactions = snapshot.get("transactions") or []
         cognition = FinanceCognition()
         insights = cognition.analyze(transactions, paycheck_days=snapshot.get("paycheck_days"))
-        recurring = cognition.detect_recurring_expenses(transactions)
 
         config = self._load_rule_config()
+        self.repository.refresh_recurring_expenses(lambda charges: detect_cadence(charges, config))
+        recurring = [
+            _to_recurring_expense_record(item).model_dump()
+            for item in self.repository.list_recurring_expenses()
+        ]
+        today = datetime.now(tz=timezone.utc).date()
+        anomalies = self._score_expenses(
+            (today - timedelta(days=ANOMALY_WINDOW_DAYS)).isoformat(), today.isoformat(), config,
+            limit=200, include_normal=False,
+        )
         alert_engine = FinanceAlertEngine(config=config)
-        alerts = alert_engine.evaluate(snapshot)
+        alerts = alert_engine.evaluate({**snapshot, "anomalies": [record.model_dump() for record in anomalies]})
 
         guidance_engine = FinanceGuidanceEngine()
         guidance = guidance_engine.generate(
@@ -766,26 +1109,32 @@ class FinanceService:
             savings_goals=snapshot.get("savings_goals", []),
         )
 
-        for alert in alerts:
-            self.repository.create_alert({
-                "id": str(uuid4()),
-                "type": alert.get("type", "rule_based"),
-                "severity": alert["severity"],
-                "title": alert["title"],
-                "message": alert["message"],
-                "source_rule": alert.get("source_rule", alert.get("reason", "")),
-                "related_entity_type": alert.get("related_entity_type", alert.get("entity_type")),
-                "related_entity_id": alert.get("related_entity_id", alert.get("entity_id")),
-                "created_at": alert.get("timestamp", _utc_now_iso()),
-            })
-        for insight in insights:
-            self.repository.add_behavior_log({
-                "id": str(uuid4()),
-                "behavior_type": insight["pattern"],
-                "score": float(insight["score"]),
-                "details": insight,
-                "ts": _utc_now_iso(),
-            })
+        self.repository.persist_brief(
+            alerts=[
+                {
+                    "id": str(uuid4()),
+                    "type": alert.get("type", "rule_based"),
+                    "severity": alert["severity"],
+                    "title": alert["title"],
+                    "message": alert["message"],
+                    "source_rule": alert.get("source_rule", alert.get("reason", "")),
+                    "related_entity_type": alert.get("related_entity_type", alert.get("entity_type")),
+                    "related_entity_id": alert.get("related_entity_id", alert.get("entity_id")),
+                    "created_at": alert.get("timestamp", _utc_now_iso()),
+                }
+                for alert in alerts
+            ],
+            behavior_logs=[
+                {
+                    "id": str(uuid4()),
+                    "behavior_type": insight["pattern"],
+                    "score": float(insight["score"]),
+                    "details": insight,
+                    "ts": _utc_now_iso(),
+                }
+                for insight in insights
+            ],
+        )
 
         finance_audit(
             "finance_intelligence_brief_generated",
@@ -841,14 +1190,20 @@ class FinanceService:
             recurring_min_occurrences=int(merged["recurring_min_occurrences"]),
             portfolio_concentration_caution=float(merged["portfolio_concentration_caution"]),
             volatility_alert_threshold=float(merged["volatility_alert_threshold"]),
+            anomaly_z_threshold=float(merged["anomaly_z_threshold"]),
+            anomaly_min_samples=int(merged["anomaly_min_samples"]),
         )
 
     # -----------------------------------------------------------------------
     # Behavior logs
     # -----------------------------------------------------------------------
 
-    def list_behavior_logs(self, limit: int = 100) -> list[dict[str, Any]]:
-        return self.repository.list_behavior_logs(limit=limit)
+    def list_behavior_logs(self, limit: int = 100, cursor: str | None = None) -> BehaviorLogsResponse:
+        logs = self.repository.list_behavior_logs(
+            limit=limit + 1, after=decode_cursor(_BEHAVIOR_LOGS_CURSOR, cursor, 2)
+        )
+        logs, next_cursor = split_page(logs, limit, _BEHAVIOR_LOGS_CURSOR, lambda log: (log["ts"], log["id"]))
+        return BehaviorLogsResponse(results=logs, count=len(logs), next_cursor=next_cursor)
 
 
 # ===========================================================================
@@ -923,14 +1278,32 @@ def list_transactions(
     limit: int = 50,
     account_id: str | None = None,
 ) -> list[dict[str, Any]]:
+    return list_transactions_page(
+        start_ts=start_ts, end_ts=end_ts, category=category, limit=limit, account_id=account_id
+    )["results"]
+
+
+def list_transactions_page(
+    start_ts: str | None = None,
+    end_ts: str | None = None,
+    category: str | None = None,
+    limit: int = 50,
+    account_id: str | None = None,
+    direction: str | None = None,
+    merchant: str | None = None,
+    cursor: str | None = None,
+) -> dict[str, Any]:
     filters = TransactionListFilters(
         date_from=_coerce_ts_to_date(start_ts) if start_ts else None,
         date_to=_coerce_ts_to_date(end_ts) if end_ts else None,
         category=category,
         account_id=account_id,
+        direction=direction,
+        merchant=merchant,
         limit=limit,
+        cursor=cursor,
     )
-    return _FINANCE_SERVICE.list_transactions(filters).model_dump()["results"]
+    return _FINANCE_SERVICE.list_transactions(filters).model_dump()
 
 
 def spending_summary(date_from: str, date_to: str, account_id: str | None = None) -> dict[str, Any]:
@@ -952,28 +1325,25 @@ def summary(
     start, end = _period_bounds(period, start_ts, end_ts)
     if start is None or end is None:
         raise FinanceValidationError(f"Unsupported period '{period}'")
-    items = _FINANCE_SERVICE.list_transactions(
-        TransactionListFilters(
-            date_from=_coerce_ts_to_date(start),
-            date_to=_coerce_ts_to_date(end),
-            limit=500,
-        )
-    ).results
-    # Resolve category IDs to names for backward compat
-    cat_name_cache: dict[str, str] = {}
-    if group_by == "category":
-        cat_ids = {item.category_id for item in items if item.category_id}
-        for cid in cat_ids:
-            cat = _FINANCE_SERVICE.repository.get_category(cid)
-            if cat:
-                cat_name_cache[cid] = cat.name
+    date_from = _coerce_ts_to_date(start)
+    date_to = _coerce_ts_to_date(end)
     totals: dict[str, int] = {}
-    for item in items:
-        if group_by == "category":
-            key = cat_name_cache.get(item.category_id, item.category_id) or "unknown"
-        else:
+    if group_by == "category":
+        # Served from the daily rollups; category IDs are resolved to names
+        # for backward compat.
+        by_category = _FINANCE_SERVICE.repository.rollup_totals_by_category(date_from=date_from, date_to=date_to)
+        categories = _FINANCE_SERVICE.repository.get_categories(cid for cid in by_category if cid)
+        for cid, amount in by_category.items():
+            cat = categories.get(cid)
+            key = (cat.name if cat else cid) or "unknown"
+            totals[key] = totals.get(key, 0) + amount
+    else:
+        items = _FINANCE_SERVICE.list_transactions(
+            TransactionListFilters(date_from=date_from, date_to=date_to, limit=500)
+        ).results
+        for item in items:
             key = getattr(item, group_by, None) or "unknown"
-        totals[key] = totals.get(key, 0) + item.amount_cents
+            totals[key] = totals.get(key, 0) + item.amount_cents
     report = LegacySummaryReport(
         period=period,
         start_ts=start,
@@ -1003,7 +1373,7 @@ def list_alerts(limit: int = 100) -> list[dict[str, Any]]:
 
 
 def list_behavior_logs(limit: int = 100) -> list[dict[str, Any]]:
-    return _FINANCE_SERVICE.list_behavior_logs(limit=limit)
+    return _FINANCE_SERVICE.list_behavior_logs(limit=limit).results
 
 
 # ---------------------------------------------------------------------------
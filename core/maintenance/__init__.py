@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+from core.maintenance.scheduler import MaintenanceScheduler, in_window
+from core.maintenance.service import MaintenanceReport, run_maintenance
+
+__all__ = ["MaintenanceReport", "MaintenanceScheduler", "in_window", "run_maintenance"]
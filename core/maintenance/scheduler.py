@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Callable
+
+from core.config import MaintenanceConfig, get_maintenance_config
+from core.logging.logger import get_logger
+from core.maintenance.service import MaintenanceReport, run_maintenance
+
+_POLL_SECONDS = 60.0
+
+
+def in_window(hour: int, start_hour: int, end_hour: int) -> bool:
+    """Whether local ``hour`` falls in ``[start_hour, end_hour)``, wrapping past midnight."""
+    if start_hour == end_hour:
+        return True
+    if start_hour < end_hour:
+        return start_hour <= hour < end_hour
+    return hour >= start_hour or hour < end_hour
+
+
+class MaintenanceScheduler:
+    """Background thread that runs :func:`run_maintenance` off-peak.
+
+    Disabled unless ``VICTUS_MAINTENANCE_ENABLED`` is set. The thread wakes
+    every minute and runs a pass when the local time is inside the
+    configured window and ``interval_seconds`` have passed since the last one.
+    """
+
+    def __init__(
+        self,
+        config: MaintenanceConfig | None = None,
+        *,
+        runner: Callable[[MaintenanceConfig], MaintenanceReport] = run_maintenance,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        self.config = config or get_maintenance_config()
+        self._runner = runner
+        self._clock = clock
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last_run: float | None = None
+        self.last_report: MaintenanceReport | None = None
+
+    def start(self) -> bool:
+        if not self.config.enabled or self._thread is not None:
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="victus-maintenance", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def due(self) -> bool:
+        if not in_window(self._clock().hour, self.config.window_start_hour, self.config.window_end_hour):
+            return False
+        return self._last_run is None or time.monotonic() - self._last_run >= self.config.interval_seconds
+
+    def tick(self) -> MaintenanceReport | None:
+        """Run one pass if it is due; returns its report."""
+        if not self.due():
+            return None
+        self._last_run = time.monotonic()
+        self.last_report = self._runner(self.config)
+        return self.last_report
+
+    def _loop(self) -> None:
+        while not self._stop.wait(_POLL_SECONDS):
+            try:
+                self.tick()
+            except Exception:  # a failed pass must not kill the thread
+                get_logger().exception("Scheduled maintenance failed")
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from core.config import MaintenanceConfig, get_maintenance_config
+from core.finance.repository import FinanceRepository
+from core.logging.audit import audit_event
+from core.memory.store import DEFAULT_REPOSITORY as MEMORY_REPOSITORY
+from core.storage.db import get_connection, get_db_path
+from victus.ui_state.store import get_ui_state_db_path, prune_timeline_events
+
+# auto_vacuum mode number reported by ``PRAGMA auto_vacuum``.
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass(frozen=True)
+class MaintenanceReport:
+    started_at: str
+    duration_ms: float
+    rows_deleted: dict[str, int] = field(default_factory=dict)
+    bytes_reclaimed: int = 0
+    vacuum: str = "skipped"
+
+    @property
+    def total_rows_deleted(self) -> int:
+        return sum(self.rows_deleted.values())
+
+    def as_dict(self) -> dict[str, object]:
+        return {**asdict(self), "total_rows_deleted": self.total_rows_deleted}
+
+
+def run_maintenance(
+    config: MaintenanceConfig | None = None,
+    *,
+    now: datetime | None = None,
+    ui_state_db_path: Path | None = None,
+) -> MaintenanceReport:
+    """Apply retention to the unbounded tables, then give the space back.
+
+    Decayed memories, old or surplus behavior logs, resolved alerts and
+    timeline events are deleted; the main database then runs an incremental
+    VACUUM and ``PRAGMA optimize``. Returns what was removed and how many
+    bytes the database files shrank by.
+    """
+    config = config or get_maintenance_config()
+    started = time.perf_counter()
+    now = now or datetime.now(tz=timezone.utc)
+    db_path = get_db_path()
+    ui_path = ui_state_db_path or get_ui_state_db_path()
+    size_before = _file_size(db_path) + _file_size(ui_path)
+
+    finance = FinanceRepository()
+    rows_deleted = {
+        "memories": MEMORY_REPOSITORY.prune_decayed(
+            now=now.isoformat(),
+            half_life_days=config.memory_half_life_days,
+            min_score=config.memory_min_score,
+            protected_importance=config.memory_protected_importance,
+        ),
+        "finance_behavior_logs": finance.prune_behavior_logs(
+            older_than=(now - timedelta(days=config.behavior_log_max_age_days)).isoformat(),
+            keep_latest=config.behavior_log_max_rows,
+        ),
+        "finance_alerts": finance.prune_resolved_alerts(
+            older_than=(now - timedelta(days=config.resolved_alert_max_age_days)).isoformat(),
+            keep_latest=config.resolved_alert_max_rows,
+            current_period=now.strftime("%Y-%m"),
+        ),
+        "timeline_events": prune_timeline_events(
+            older_than_ms=int((now - timedelta(days=config.timeline_max_age_days)).timestamp() * 1000),
+            keep_latest=config.timeline_max_rows,
+            db_path=ui_path,
+        ),
+    }
+
+    vacuum = _vacuum(get_connection(), config.vacuum_pages, convert=config.convert_auto_vacuum)
+    if rows_deleted["timeline_events"]:
+        # The UI state database is small; a plain VACUUM is cheap there.
+        conn = sqlite3.connect(str(ui_path))
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+
+    report = MaintenanceReport(
+        started_at=now.isoformat(),
+        duration_ms=round((time.perf_counter() - started) * 1000, 2),
+        rows_deleted=rows_deleted,
+        bytes_reclaimed=max(0, size_before - _file_size(db_path) - _file_size(ui_path)),
+        vacuum=vacuum,
+    )
+    audit_event("maintenance_completed", **report.as_dict())
+    return report
+
+
+def _vacuum(conn: sqlite3.Connection, pages: int, *, convert: bool) -> str:
+    """Return free pages to the filesystem and refresh planner statistics.
+
+    Databases created before incremental auto-vacuum was enabled need one
+    full VACUUM, which rewrites the whole file under an exclusive lock. It
+    only runs when ``convert`` is set (VICTUS_MAINTENANCE_CONVERT_AUTO_VACUUM);
+    otherwise the pass reports ``conversion_required``. VACUUM can renumber
+    implicit rowids, so the external-content FTS index is rebuilt afterwards.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == _AUTO_VACUUM_INCREMENTAL:
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        mode = "incremental"
+    elif convert:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        MEMORY_REPOSITORY.rebuild_search_index()
+        mode = "full"
+    else:
+        audit_event("maintenance_vacuum_conversion_required", setting="VICTUS_MAINTENANCE_CONVERT_AUTO_VACUUM")
+        mode = "conversion_required"
+    conn.execute("PRAGMA optimize").fetchall()
+    if conn.in_transaction:
+        conn.commit()
+    # In WAL mode freed pages only leave the main file at a checkpoint.
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+    return mode
+
+
+def _file_size(path: Path) -> int:
+    total = 0
+    for candidate in (path, path.with_name(f"{path.name}-wal")):
+        try:
+            total += candidate.stat().st_size
+        except FileNotFoundError:
+            pass
+    return total
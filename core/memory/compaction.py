@@ -0,0 +1,22 @@
+"""Merge duplicate memories in the local database.
+
+Run once after upgrading to content-hash deduplication::
+
+    python -m core.memory.compaction
+
+Prints the number of memories scanned, merged groups and removed rows.
+"""
+from __future__ import annotations
+
+import json
+
+from core.memory.service import compact_memories
+
+
+def main() -> int:
+    print(json.dumps(compact_memories()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from core.errors import VictusError
 
+SENSITIVITY_LEVELS: tuple[str, ...] = ("public", "internal", "sensitive", "critical")
+SENSITIVITY_RANK: dict[str, int] = {name: idx for idx, name in enumerate(SENSITIVITY_LEVELS)}
+DEFAULT_SENSITIVITY = "internal"
 
 ALLOWED_MEMORY_ACTIONS = {
     "write_memory",
@@ -9,6 +12,7 @@ ALLOWED_MEMORY_ACTIONS = {
     "list_recent",
     "get_memory_by_id",
     "delete_memory",
+    "list_tag_facets",
 }
 
 SENSITIVE_MEMORY_ACTIONS = {"delete_memory"}
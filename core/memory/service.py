@@ -7,10 +7,13 @@ from uuid import uuid4
 
 from core.config import get_security_config
 from core.logging.audit import audit_event
+from core.memory.policy import SENSITIVITY_LEVELS, SENSITIVITY_RANK as _SENSITIVITY_RANK
 from core.memory.store import DEFAULT_REPOSITORY, MemoryRepository
+from core.storage.pagination import decode_cursor, split_page
 
-SENSITIVITY_LEVELS: tuple[str, ...] = ("public", "internal", "sensitive", "critical")
-_SENSITIVITY_RANK = {name: idx for idx, name in enumerate(SENSITIVITY_LEVELS)}
+_MEMORIES_CURSOR = "memories"
+
+MAX_BULK_ITEMS = 1000
 
 
 class MemoryService:
@@ -30,7 +33,7 @@ class MemoryService:
             raise ValueError(f"Unsupported sensitivity level: {sensitivity}")
         return normalized
 
-    def write(self, item: dict[str, object]) -> str:
+    def _build_record(self, item: dict[str, object]) -> dict[str, object]:
         memory_id = str(item.get("id") or uuid4())
         ts = str(item.get("ts") or datetime.now(tz=timezone.utc).isoformat())
         content = str(item.get("content") or "").strip()
@@ -38,7 +41,7 @@ class MemoryService:
             raise ValueError("Memory content is required")
 
         sensitivity = self._normalize_sensitivity(item.get("sensitivity") if isinstance(item.get("sensitivity"), str) else None)
-        record = {
+        return {
             "id": memory_id,
             "ts": ts,
             "type": str(item.get("type") or "note"),
@@ -49,25 +52,111 @@ class MemoryService:
             "confidence": float(item.get("confidence") or 0.8),
             "sensitivity": sensitivity,
         }
-        self.repository.add_memory(record)
-        audit_event("memory_added", memory_id=memory_id, memory_type=record["type"], sensitivity=sensitivity)
+
+    def write(self, item: dict[str, object]) -> str:
+        record = self._build_record(item)
+        memory_id = self.repository.add_memory(record)
+        audit_event(
+            "memory_added",
+            memory_id=memory_id,
+            memory_type=record["type"],
+            sensitivity=record["sensitivity"],
+            merged=memory_id != record["id"],
+        )
         return memory_id
 
+    def write_many(self, items: Sequence[dict[str, object]]) -> dict[str, object]:
+        """Validate and insert a batch of memories in one transaction.
+
+        Invalid items (and ids that already exist) are reported in ``errors``
+        by their position in ``items``; the rest of the batch is still written.
+        Items repeating an existing memory's content are folded into it (see
+        ``MemoryRepository.add_memory``) and counted in ``merged``; ``ids``
+        lists each stored memory once. One aggregated audit event covers the
+        whole batch.
+        """
+        if len(items) > MAX_BULK_ITEMS:
+            raise ValueError(f"At most {MAX_BULK_ITEMS} memories can be written per batch")
+        records: list[dict[str, object]] = []
+        positions: list[int] = []
+        errors: list[dict[str, object]] = []
+        for position, item in enumerate(items):
+            try:
+                records.append(self._build_record(item))
+            except (TypeError, ValueError) as exc:
+                errors.append({"index": position, "error": str(exc)})
+                continue
+            positions.append(position)
+
+        stored = self.repository.add_memories(records) if records else []
+        ids: list[str] = []
+        written: list[dict[str, object]] = []
+        for offset, memory_id in enumerate(stored):
+            if memory_id is None:
+                errors.append({"index": positions[offset], "error": f"Memory id already exists: {records[offset]['id']}"})
+                continue
+            if memory_id not in ids:
+                ids.append(memory_id)
+            written.append(records[offset])
+        errors.sort(key=lambda error: error["index"])
+        merged = len(written) - sum(1 for record in written if record["id"] in ids)
+
+        type_counts: dict[str, int] = {}
+        for record in written:
+            type_counts[str(record["type"])] = type_counts.get(str(record["type"]), 0) + 1
+        audit_event(
+            "memory_bulk_added",
+            requested=len(items),
+            written=len(ids),
+            merged=merged,
+            failed=len(errors),
+            memory_types=type_counts,
+        )
+        return {"ids": ids, "written": len(ids), "merged": merged, "errors": errors}
+
     def retrieve(
         self,
         query: str,
         *,
         max_items: int = 5,
         tags: Iterable[str] | None = None,
+        tag_mode: str = "all",
         allowed_sensitivity: Sequence[str] | None = None,
+        mode: str = "fts",
     ) -> list[dict[str, object]]:
         config = get_security_config()
         cap = min(max(1, max_items), config.max_memory_retrieval)
         normalized_tags = self._normalize_tags(tags)
-        raw = self.repository.search_memories(query, normalized_tags, cap)
-        filtered = self._filter_by_sensitivity(raw, allowed_sensitivity)
-        audit_event("memory_searched", query=query, tags=normalized_tags, limit=cap, returned=len(filtered))
-        return filtered
+        results = self.repository.search_memories(
+            query,
+            normalized_tags,
+            cap,
+            tag_mode=tag_mode,
+            max_rank=self._max_allowed_rank(allowed_sensitivity),
+            mode=mode,
+        )
+        audit_event(
+            "memory_searched",
+            query=query,
+            tags=normalized_tags,
+            tag_mode=tag_mode,
+            mode=mode,
+            limit=cap,
+            returned=len(results),
+        )
+        return results
+
+    def tag_facets(
+        self,
+        *,
+        max_items: int = 20,
+        allowed_sensitivity: Sequence[str] | None = None,
+    ) -> list[dict[str, object]]:
+        facets = self.repository.tag_facets(
+            limit=max(1, min(max_items, 100)), max_rank=self._max_allowed_rank(allowed_sensitivity)
+        )
+        audit_event("memory_tag_facets_listed", returned=len(facets))
+        return facets
 
     def list_recent(
         self,
@@ -75,12 +164,26 @@ class MemoryService:
         max_items: int = 20,
         allowed_sensitivity: Sequence[str] | None = None,
     ) -> list[dict[str, object]]:
+        return self.list_page(max_items=max_items, allowed_sensitivity=allowed_sensitivity)["results"]
+
+    def list_page(
+        self,
+        *,
+        max_items: int = 20,
+        cursor: str | None = None,
+        allowed_sensitivity: Sequence[str] | None = None,
+    ) -> dict[str, object]:
+        """One page of newest-first memories plus the cursor for the next page."""
         config = get_security_config()
         cap = min(max(1, max_items), config.max_memory_retrieval)
-        raw = self.repository.list_recent(cap)
-        filtered = self._filter_by_sensitivity(raw, allowed_sensitivity)
-        audit_event("memory_listed", limit=cap, returned=len(filtered))
-        return filtered
+        rows = self.repository.list_recent(
+            cap + 1,
+            max_rank=self._max_allowed_rank(allowed_sensitivity),
+            after=decode_cursor(_MEMORIES_CURSOR, cursor, 2),
+        )
+        results, next_cursor = split_page(rows, cap, _MEMORIES_CURSOR, lambda record: (record["ts"], record["id"]))
+        audit_event("memory_listed", limit=cap, returned=len(results), paged=cursor is not None)
+        return {"results": results, "count": len(results), "next_cursor": next_cursor}
 
     def get_by_id(self, memory_id: str, *, allowed_sensitivity: Sequence[str] | None = None) -> dict[str, object] | None:
         record = self.repository.get_by_id(memory_id)
@@ -94,6 +197,17 @@ class MemoryService:
         audit_event("memory_deleted", memory_id=memory_id, deleted=deleted)
         return deleted
 
+    def sync_vectors(self) -> int:
+        embedded = self.repository.sync_vector_index()
+        if embedded:
+            audit_event("memory_vectors_synced", embedded=embedded)
+        return embedded
+
+    def compact(self) -> dict[str, int]:
+        result = self.repository.compact_duplicates()
+        audit_event("memory_compacted", **result)
+        return result
+
     def _filter_by_sensitivity(
         self,
         records: list[dict[str, object]],
@@ -143,27 +257,55 @@ def add_memory(
     )
 
 
+def add_memories(items: Sequence[dict[str, object]]) -> dict[str, object]:
+    return _DEFAULT_MEMORY_SERVICE.write_many(items)
+
+
 def search_memories(
     query: str,
     tags: Iterable[str] | None,
     limit: int = 10,
     allowed_sensitivity: Sequence[str] | None = None,
+    tag_mode: str = "all",
+    mode: str = "fts",
 ) -> list[dict[str, object]]:
     return _DEFAULT_MEMORY_SERVICE.retrieve(
         query,
         max_items=limit,
         tags=tags,
+        tag_mode=tag_mode,
         allowed_sensitivity=allowed_sensitivity,
+        mode=mode,
     )
 
 
+def tag_facets(limit: int = 20) -> list[dict[str, object]]:
+    return _DEFAULT_MEMORY_SERVICE.tag_facets(max_items=limit)
+
+
 def list_recent(limit: int = 20, allowed_sensitivity: Sequence[str] | None = None) -> list[dict[str, object]]:
     return _DEFAULT_MEMORY_SERVICE.list_recent(max_items=limit, allowed_sensitivity=allowed_sensitivity)
 
 
+def list_recent_page(
+    limit: int = 20,
+    cursor: str | None = None,
+    allowed_sensitivity: Sequence[str] | None = None,
+) -> dict[str, object]:
+    return _DEFAULT_MEMORY_SERVICE.list_page(max_items=limit, cursor=cursor, allowed_sensitivity=allowed_sensitivity)
+
+
 def get_memory_by_id(memory_id: str, allowed_sensitivity: Sequence[str] | None = None) -> dict[str, object] | None:
     return _DEFAULT_MEMORY_SERVICE.get_by_id(memory_id, allowed_sensitivity=allowed_sensitivity)
 
 
 def delete_memory(memory_id: str) -> bool:
     return _DEFAULT_MEMORY_SERVICE.delete(memory_id)
+
+
+def compact_memories() -> dict[str, int]:
+    return _DEFAULT_MEMORY_SERVICE.compact()
+
+
+def sync_memory_vectors() -> int:
+    return _DEFAULT_MEMORY_SERVICE.sync_vectors()
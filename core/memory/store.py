@@ -1,23 +1,158 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from typing import Any, Iterable
+import re
+import sqlite3
+from typing import Any, Iterable, Sequence
 
-from core.storage.db import get_connection
+from core.memory.policy import DEFAULT_SENSITIVITY, SENSITIVITY_RANK
+from core.memory.vectors import VectorIndex, get_vector_index, semantic_available
+from core.storage.db import get_connection, resolve_db_path
+
+_FTS_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+TAG_MODES = ("all", "any")
+SEARCH_MODES = ("fts", "semantic", "hybrid")
+
+# Share of the hybrid score taken by cosine similarity; the rest is the BM25
+# score normalised against the best FTS hit of the same query.
+HYBRID_SEMANTIC_WEIGHT = 0.5
+
+
+def build_fts_query(query: str) -> str:
+    """Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term (``"coff"*``) and terms are ANDed,
+    so user input can never inject FTS5 operators.
+    """
+    return " ".join(f'"{token}"*' for token in _FTS_TOKEN_RE.findall(query.lower()))
+
+
+def fts_missing(exc: sqlite3.OperationalError) -> bool:
+    """Whether ``exc`` means SQLite lacks FTS5 or the ``memories_fts`` table."""
+    message = str(exc).lower()
+    return "no such table: memories_fts" in message or "no such module: fts5" in message
+
+
+def sensitivity_rank(sensitivity: str | None) -> int:
+    return SENSITIVITY_RANK.get((sensitivity or DEFAULT_SENSITIVITY).lower(), SENSITIVITY_RANK[DEFAULT_SENSITIVITY])
+
+
+def _rank_clause(max_rank: int | None, rank_column: str) -> tuple[str, list[Any]]:
+    if max_rank is None:
+        return "", []
+    return f" AND {rank_column} <= ?", [max_rank]
+
+
+def _tag_clause(tags: Iterable[str] | None, tag_mode: str, id_column: str) -> tuple[str, list[Any]]:
+    """SQL fragment restricting ``id_column`` to memories carrying the tags.
+
+    ``all`` requires every tag (AND), ``any`` at least one (OR). Matching is
+    case-insensitive, like the ``memory_tags.tag`` column.
+    """
+    unique = list({tag.lower(): tag for tag in tags or () if tag}.values())
+    if not unique:
+        return "", []
+    if tag_mode not in TAG_MODES:
+        raise ValueError(f"Unsupported tag mode: {tag_mode}")
+    placeholders = ", ".join("?" for _ in unique)
+    if tag_mode == "any" or len(unique) == 1:
+        return f" AND {id_column} IN (SELECT memory_id FROM memory_tags WHERE tag IN ({placeholders}))", unique
+    return (
+        f" AND {id_column} IN (SELECT memory_id FROM memory_tags WHERE tag IN ({placeholders})"
+        f" GROUP BY memory_id HAVING COUNT(*) = {len(unique)})",
+        unique,
+    )
+
+
+def content_hash(content: str) -> str:
+    """Hash of ``content`` with case and whitespace differences folded away."""
+    normalized = " ".join(content.casefold().split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# A repeat of an existing (content, type, source) refreshes that memory: the
+# latest wording and timestamp win, tags are merged, importance grows with
+# each repetition and sensitivity can only be raised. SET expressions see the pre-update row.
+_UPSERT_MEMORY_SQL = """
+    INSERT INTO memories (
+        id, ts, type, tags, source, content, importance, confidence, sensitivity, sensitivity_rank, content_hash
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (content_hash, type, source) DO UPDATE SET
+        ts = MAX(ts, excluded.ts),
+        content = excluded.content,
+        tags = memory_merge_tags(tags, excluded.tags),
+        importance = MIN(MAX(importance, excluded.importance) + 1, 10),
+        confidence = MAX(confidence, excluded.confidence),
+        sensitivity = CASE WHEN excluded.sensitivity_rank > sensitivity_rank
+            THEN excluded.sensitivity ELSE sensitivity END,
+        sensitivity_rank = MAX(sensitivity_rank, excluded.sensitivity_rank)
+"""
+
+
+def _memory_params(record: dict[str, Any]) -> tuple[Any, ...]:
+    return (
+        record["id"],
+        record["ts"],
+        record["type"],
+        record["tags"],
+        record["source"],
+        record["content"],
+        record["importance"],
+        record["confidence"],
+        record["sensitivity"],
+        sensitivity_rank(record["sensitivity"]),
+        content_hash(record["content"]),
+    )
+
+
+def _parse_tags(raw: str | None) -> list[Any]:
+    tags_raw = raw or "[]"
+    if tags_raw == "[]":
+        return []
+    try:
+        return json.loads(tags_raw)
+    except json.JSONDecodeError:
+        return [tag for tag in tags_raw.split(",") if tag]
+
+
+def merge_tags(*raw_tags: str | None) -> str:
+    """JSON union of stored tag lists, keeping the first spelling of each tag (case-insensitive)."""
+    merged: dict[str, str] = {}
+    for raw in raw_tags:
+        for tag in _parse_tags(raw):
+            merged.setdefault(str(tag).lower(), str(tag))
+    return json.dumps(list(merged.values()))
+
+
+def _register_functions(conn: sqlite3.Connection) -> None:
+    conn.create_function("memory_merge_tags", 2, merge_tags, deterministic=True)
+
+
+def _retention_score(weight: float | None, age_days: float | None, half_life_days: float) -> float | None:
+    if weight is None or age_days is None:
+        return None
+    return weight * 0.5 ** (max(age_days, 0.0) / half_life_days)
+
+
+def _content_key(params: tuple[Any, ...]) -> tuple[str, str, str]:
+    """``(content_hash, type, source)`` of a :func:`_memory_params` tuple."""
+    return params[10], params[2], params[4]
 
 
 class MemoryRepository:
+    @staticmethod
+    def _vector_index() -> VectorIndex:
+        return get_vector_index(resolve_db_path())
+
     def _row_to_memory(self, row: Any) -> dict[str, Any]:
-        tags_raw = row["tags"] or "[]"
-        try:
-            tags = json.loads(tags_raw)
-        except json.JSONDecodeError:
-            tags = [tag for tag in tags_raw.split(",") if tag]
         return {
             "id": row["id"],
             "ts": row["ts"],
             "type": row["type"],
-            "tags": tags,
+            "tags": _parse_tags(row["tags"]),
             "source": row["source"],
             "content": row["content"],
             "importance": row["importance"],
@@ -26,48 +161,253 @@ class MemoryRepository:
         }
 
     def add_memory(self, record: dict[str, Any]) -> str:
+        """Insert ``record``, or fold it into the memory with the same content.
+
+        Returns the id of the stored memory, which is an older memory's id
+        when the content (ignoring case and whitespace), type and source
+        match it.
+        """
+        index = self._vector_index()
+        conn = get_connection()
+        _register_functions(conn)
+        with conn:
+            memory_id = conn.execute(f"{_UPSERT_MEMORY_SQL} RETURNING id", _memory_params(record)).fetchone()[0]
+            index.add(conn, memory_id, record["content"])
+        return memory_id
+
+    def sync_vector_index(self) -> int:
+        """Embed memories that have no vector yet; returns how many.
+
+        Runs at startup (and before the first semantic search), never on the
+        write path.
+        """
+        return self._vector_index().sync(get_connection())
+
+    def add_memories(self, records: Sequence[dict[str, Any]]) -> list[str | None]:
+        """Upsert a batch in one transaction with ``executemany``.
+
+        Returns, per record, the id of the memory it was stored as (see
+        :meth:`add_memory`), or ``None`` when its explicit id is already
+        taken by another memory or repeated earlier in the batch.
+        """
+        index = self._vector_index()
+        conn = get_connection()
+        _register_functions(conn)
+        with conn:
+            taken = self._existing_ids(conn, [record["id"] for record in records])
+            params = [_memory_params(record) for record in records]
+            canonical = self._ids_by_content_key(conn, params)
+            preexisting = set(canonical.values())
+            stored: list[str | None] = []
+            accepted: list[tuple[Any, ...]] = []
+            latest: dict[str, str] = {}
+            for record, row in zip(records, params):
+                if record["id"] in taken:
+                    stored.append(None)
+                    continue
+                taken.add(record["id"])
+                memory_id = canonical.setdefault(_content_key(row), record["id"])
+                latest[memory_id] = record["content"]
+                stored.append(memory_id)
+                accepted.append(row)
+            conn.executemany(_UPSERT_MEMORY_SQL, accepted)
+            index.add_many(conn, [(memory_id, text) for memory_id, text in latest.items() if memory_id not in preexisting])
+            for memory_id in preexisting & latest.keys():
+                index.add(conn, memory_id, latest[memory_id])
+        return stored
+
+    @staticmethod
+    def _ids_by_content_key(conn: Any, params: list[tuple[Any, ...]]) -> dict[tuple[str, str, str], str]:
+        hashes = list({_content_key(row)[0] for row in params})
+        found: dict[tuple[str, str, str], str] = {}
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"SELECT id, content_hash, type, source FROM memories WHERE content_hash IN ({placeholders})", chunk
+            ).fetchall()
+            found.update(((row[1], row[2], row[3]), row[0]) for row in rows)
+        return found
+
+    @staticmethod
+    def _existing_ids(conn: Any, ids: list[str]) -> set[str]:
+        found: set[str] = set()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(f"SELECT id FROM memories WHERE id IN ({placeholders})", chunk).fetchall()
+            found.update(row[0] for row in rows)
+        return found
+
+    def search_memories(
+        self,
+        query: str,
+        tags: Iterable[str] | None,
+        limit: int,
+        *,
+        tag_mode: str = "all",
+        max_rank: int | None = None,
+        mode: str = "fts",
+    ) -> list[dict[str, Any]]:
+        """Full-text search ranked by BM25, newest-first when there is no query.
+
+        FTS results carry a ``snippet`` and a ``score`` (higher is better).
+        Falls back to ``LIKE`` matching when the FTS5 index is unavailable.
+        ``tag_mode`` selects AND (``all``) or OR (``any``) tag filtering and
+        ``max_rank`` hides memories above that sensitivity rank before LIMIT.
+        ``mode`` switches to cosine similarity over the vector index
+        (``semantic``) or a weighted blend of both scores (``hybrid``); both
+        degrade to full-text search when NumPy is not installed.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unsupported search mode: {mode}")
+        tag_sql, tag_params = _tag_clause(tags, tag_mode, "m.id")
+        rank_sql, rank_params = _rank_clause(max_rank, "m.sensitivity_rank")
+        tag_sql += rank_sql
+        tag_params = tag_params + rank_params
+        if query and mode != "fts" and semantic_available():
+            semantic = self._search_semantic(query, tag_sql, tag_params, limit if mode == "semantic" else limit * 4)
+            if mode == "semantic":
+                return semantic
+            return self._blend(semantic, self._search_text(query, tag_sql, tag_params, limit * 4), limit)
+        return self._search_text(query, tag_sql, tag_params, limit)
+
+    def _search_text(self, query: str, tag_sql: str, tag_params: list[Any], limit: int) -> list[dict[str, Any]]:
+        match = build_fts_query(query) if query else ""
+        if match:
+            try:
+                return self._search_fts(match, tag_sql, tag_params, limit)
+            except sqlite3.OperationalError as exc:
+                if not fts_missing(exc):
+                    raise
+        return self._search_like(query, tag_sql, tag_params, limit)
+
+    def tag_facets(self, limit: int = 20, *, max_rank: int | None = None) -> list[dict[str, Any]]:
+        """Most used tags with the number of memories carrying each."""
+        sql = "SELECT t.tag AS tag, COUNT(*) AS count FROM memory_tags t"
+        params: list[Any] = []
+        if max_rank is not None:
+            sql += " JOIN memories m ON m.id = t.memory_id WHERE m.sensitivity_rank <= ?"
+            params.append(max_rank)
+        sql += " GROUP BY t.tag ORDER BY count DESC, t.tag ASC LIMIT ?"
+        params.append(limit)
         with get_connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO memories (id, ts, type, tags, source, content, importance, confidence, sensitivity)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            rows = conn.execute(sql, params).fetchall()
+        return [{"tag": row["tag"], "count": int(row["count"])} for row in rows]
+
+    def _search_fts(self, match: str, tag_sql: str, tag_params: list[Any], limit: int) -> list[dict[str, Any]]:
+        sql = """
+            SELECT m.*, bm25(memories_fts) AS fts_rank,
+                   snippet(memories_fts, 0, '[', ']', '...', 12) AS snippet
+            FROM memories_fts
+            JOIN memories m ON m.rowid = memories_fts.rowid
+            WHERE memories_fts MATCH ?
+        """
+        sql += tag_sql
+        params: list[Any] = [match, *tag_params]
+        sql += " ORDER BY fts_rank LIMIT ?"
+        params.append(limit)
+        with get_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        results: list[dict[str, Any]] = []
+        for row in rows:
+            record = self._row_to_memory(row)
+            record["snippet"] = row["snippet"]
+            record["score"] = -float(row["fts_rank"])
+            results.append(record)
+        return results
+
+    def _search_semantic(
+        self, query: str, tag_sql: str, tag_params: list[Any], limit: int
+    ) -> list[dict[str, Any]]:
+        index = self._vector_index()
+        conn = get_connection()
+        index.sync(conn)
+        total = index.row_count()
+        want = limit * 4 + 16
+        while True:
+            # Over-fetch so tag/sensitivity filters and zeroed (deleted) rows
+            # still leave ``limit`` hits; widen until the whole index is covered.
+            candidates = dict(index.top_slots(query, want))
+            results = self._load_slots(conn, candidates, tag_sql, tag_params)
+            if len(results) >= limit or want >= total:
+                return results[:limit]
+            want *= 4
+
+    def _load_slots(
+        self, conn: Any, candidates: dict[int, float], tag_sql: str, tag_params: list[Any]
+    ) -> list[dict[str, Any]]:
+        if not candidates:
+            return []
+        results: list[dict[str, Any]] = []
+        slots = list(candidates)
+        for start in range(0, len(slots), 500):
+            chunk = slots[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"""
+                SELECT m.*, v.slot AS vector_slot
+                FROM memory_vectors v
+                JOIN memories m ON m.id = v.memory_id
+                WHERE v.slot IN ({placeholders}){tag_sql}
                 """,
-                (
-                    record["id"],
-                    record["ts"],
-                    record["type"],
-                    record["tags"],
-                    record["source"],
-                    record["content"],
-                    record["importance"],
-                    record["confidence"],
-                    record["sensitivity"],
-                ),
-            )
-        return record["id"]
+                [*chunk, *tag_params],
+            ).fetchall()
+            for row in rows:
+                record = self._row_to_memory(row)
+                record["score"] = candidates[row["vector_slot"]]
+                results.append(record)
+        results.sort(key=lambda record: (-record["score"], record["id"]))
+        return results
 
-    def search_memories(self, query: str, tags: Iterable[str] | None, limit: int) -> list[dict[str, Any]]:
-        sql = "SELECT * FROM memories WHERE 1=1"
+    @staticmethod
+    def _blend(
+        semantic: list[dict[str, Any]], lexical: list[dict[str, Any]], limit: int
+    ) -> list[dict[str, Any]]:
+        best_lexical = max((record.get("score", 0.0) for record in lexical), default=0.0)
+        merged: dict[str, dict[str, Any]] = {}
+        for record in semantic:
+            merged[record["id"]] = {**record, "score": HYBRID_SEMANTIC_WEIGHT * record["score"]}
+        for record in lexical:
+            lexical_score = record.get("score", 0.0) / best_lexical if best_lexical > 0 else 0.0
+            weighted = (1.0 - HYBRID_SEMANTIC_WEIGHT) * lexical_score
+            if record["id"] in merged:
+                merged[record["id"]]["score"] += weighted
+                if "snippet" in record:
+                    merged[record["id"]]["snippet"] = record["snippet"]
+            else:
+                merged[record["id"]] = {**record, "score": weighted}
+        ranked = sorted(merged.values(), key=lambda record: (-record["score"], record["id"]))
+        return ranked[:limit]
+
+    def _search_like(self, query: str, tag_sql: str, tag_params: list[Any], limit: int) -> list[dict[str, Any]]:
+        sql = "SELECT * FROM memories m WHERE 1=1"
         params: list[Any] = []
         if query:
             sql += " AND content LIKE ?"
             params.append(f"%{query}%")
-        if tags:
-            for tag in tags:
-                sql += " AND tags LIKE ?"
-                params.append(f'%"{tag}"%')
+        sql += tag_sql
+        params.extend(tag_params)
         sql += " ORDER BY ts DESC LIMIT ?"
         params.append(limit)
         with get_connection() as conn:
             rows = conn.execute(sql, params).fetchall()
         return [self._row_to_memory(row) for row in rows]
 
-    def list_recent(self, limit: int) -> list[dict[str, Any]]:
+    def list_recent(
+        self, limit: int, *, max_rank: int | None = None, after: Sequence[Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """Newest-first memories; ``after`` is the ``(ts, id)`` key of the previous page's last row."""
+        sql = "SELECT * FROM memories WHERE 1=1"
+        rank_sql, params = _rank_clause(max_rank, "sensitivity_rank")
+        sql += rank_sql
+        if after:
+            sql += " AND (ts, id) < (?, ?)"
+            params.extend(after)
+        sql += " ORDER BY ts DESC, id DESC LIMIT ?"
+        params.append(limit)
         with get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM memories ORDER BY ts DESC LIMIT ?",
-                (limit,),
-            ).fetchall()
+            rows = conn.execute(sql, params).fetchall()
         return [self._row_to_memory(row) for row in rows]
 
     def get_by_id(self, memory_id: str) -> dict[str, Any] | None:
@@ -79,9 +419,118 @@ class MemoryRepository:
 
     def delete_memory(self, memory_id: str) -> bool:
         with get_connection() as conn:
+            slot = conn.execute("SELECT slot FROM memory_vectors WHERE memory_id = ?", (memory_id,)).fetchone()
             cursor = conn.execute("DELETE FROM memories WHERE id = ?", (memory_id,))
             deleted = cursor.rowcount > 0
+        if slot is not None:
+            self._vector_index().discard(slot[0])
         return deleted
 
+    def compact_duplicates(self) -> dict[str, int]:
+        """Merge memories whose content, type and source repeat; hash the rest.
+
+        One-shot cleanup for rows written before ``content_hash`` existed.
+        Each duplicate group collapses onto its already-hashed member (or the
+        newest one) with the same rules as the write-time upsert: newest
+        content and timestamp, importance bumped per repetition, highest
+        confidence and sensitivity, and the union of tags. The vector file is
+        rebuilt afterwards so deleted rows stop being scanned.
+        """
+        conn = get_connection()
+        groups: dict[tuple[str, str, str], list[Any]] = {}
+        with conn:
+            rows = conn.execute(
+                """
+                SELECT id, ts, type, source, content, tags, importance, confidence,
+                       sensitivity, sensitivity_rank, content_hash
+                FROM memories ORDER BY ts, id
+                """
+            )
+            for row in rows:
+                key = (content_hash(row["content"] or ""), row["type"], row["source"])
+                groups.setdefault(key, []).append(row)
+
+            removed: list[tuple[str]] = []
+            merged: list[tuple[Any, ...]] = []
+            hashed: list[tuple[str, str]] = []
+            for key, members in groups.items():
+                if len(members) == 1:
+                    if members[0]["content_hash"] is None:
+                        hashed.append((key[0], members[0]["id"]))
+                    continue
+                survivor = next((row for row in members if row["content_hash"] is not None), members[-1])
+                newest = members[-1]
+                top = max(members, key=lambda row: row["sensitivity_rank"])
+                removed.extend((row["id"],) for row in members if row is not survivor)
+                merged.append(
+                    (
+                        newest["ts"],
+                        newest["content"],
+                        merge_tags(*(row["tags"] for row in members)),
+                        min(max(row["importance"] or 0 for row in members) + len(members) - 1, 10),
+                        max(row["confidence"] or 0.0 for row in members),
+                        top["sensitivity"],
+                        top["sensitivity_rank"],
+                        key[0],
+                        survivor["id"],
+                    )
+                )
+            # Deletes first: a survivor only takes its group's hash once no
+            # other row of the group can collide with it in the unique index.
+            conn.executemany("DELETE FROM memories WHERE id = ?", removed)
+            conn.executemany(
+                """
+                UPDATE memories SET ts = ?, content = ?, tags = ?, importance = ?, confidence = ?,
+                    sensitivity = ?, sensitivity_rank = ?, content_hash = ?
+                WHERE id = ?
+                """,
+                merged,
+            )
+            conn.executemany("UPDATE memories SET content_hash = ? WHERE id = ?", hashed)
+            try:
+                conn.execute("INSERT INTO memories_fts (memories_fts) VALUES ('optimize')")
+            except sqlite3.OperationalError as exc:
+                if not fts_missing(exc):
+                    raise
+        if removed or merged:
+            self._vector_index().rebuild(conn)
+        return {"scanned": sum(len(members) for members in groups.values()), "merged": len(merged), "removed": len(removed)}
+
+    def prune_decayed(
+        self, *, now: str, half_life_days: float, min_score: float, protected_importance: int
+    ) -> int:
+        """Delete memories whose decayed retention score fell below ``min_score``.
+
+        The score is ``importance * confidence`` halved every
+        ``half_life_days`` since ``ts``; memories at or above
+        ``protected_importance`` are never pruned. Returns the number removed.
+        """
+        conn = get_connection()
+        conn.create_function("memory_retention_score", 3, _retention_score, deterministic=True)
+        with conn:
+            doomed = conn.execute(
+                """
+                SELECT m.id, v.slot FROM memories m
+                LEFT JOIN memory_vectors v ON v.memory_id = m.id
+                WHERE m.importance < ?
+                  AND memory_retention_score(m.importance * m.confidence, julianday(?) - julianday(m.ts), ?) < ?
+                """,
+                (protected_importance, now, half_life_days, min_score),
+            ).fetchall()
+            conn.executemany("DELETE FROM memories WHERE id = ?", [(row["id"],) for row in doomed])
+        index = self._vector_index()
+        for row in doomed:
+            index.discard(row["slot"])
+        return len(doomed)
+
+    def rebuild_search_index(self) -> None:
+        """Re-index FTS from ``memories``; required after anything renumbers rowids (VACUUM)."""
+        try:
+            with get_connection() as conn:
+                conn.execute("INSERT INTO memories_fts (memories_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as exc:
+            if not fts_missing(exc):
+                raise
+
 
 DEFAULT_REPOSITORY = MemoryRepository()
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # semantic search is optional; writes still keep vectors current
+    np = None
+
+# 64 dims keeps a 1M-row index at 256 MiB, small enough for one core to score
+# every row in a few tens of milliseconds. Changing it invalidates existing
+# vector files, so it is deliberately not configurable.
+EMBEDDING_DIM = 64
+VECTOR_FILENAME = "memory_vectors.f32"
+
+_ITEM_SIZE = 4
+_ROW_BYTES = EMBEDDING_DIM * _ITEM_SIZE
+_SCAN_CHUNK_ROWS = 262_144
+_WORD_WEIGHT = 1.0
+_TRIGRAM_WEIGHT = 0.5
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def semantic_available() -> bool:
+    return np is not None
+
+
+def embed_text(text: str) -> array:
+    """Deterministic, offline embedding of ``text`` as an L2-normalised float32 vector.
+
+    Words and their character trigrams are feature-hashed (CRC32) into
+    ``EMBEDDING_DIM`` signed buckets, so near-spellings and shared word stems
+    land close together without any model download.
+    """
+    vector = [0.0] * EMBEDDING_DIM
+    for word in _TOKEN_RE.findall(text.lower()):
+        _add_feature(vector, f"w:{word}", _WORD_WEIGHT)
+        padded = f"<{word}>"
+        for start in range(len(padded) - 2):
+            _add_feature(vector, f"c:{padded[start:start + 3]}", _TRIGRAM_WEIGHT)
+    norm = sum(value * value for value in vector) ** 0.5
+    if norm:
+        vector = [value / norm for value in vector]
+    return array("f", vector)
+
+
+def _add_feature(vector: list[float], feature: str, weight: float) -> None:
+    digest = zlib.crc32(feature.encode("utf-8"))
+    vector[digest % EMBEDDING_DIM] += weight if digest & 0x8000_0000 else -weight
+
+
+class VectorIndex:
+    """Contiguous float32 matrix on disk, one row per memory.
+
+    ``memory_vectors`` maps memory ids to row slots; the matrix itself is
+    read through a memory map and scored with one NumPy matrix-vector product
+    per chunk. Rows of deleted memories are zeroed and never reused.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._matrix: Any = None
+        self._mapped_rows = -1
+        self._synced = False
+
+    # -- writes -------------------------------------------------------------
+
+    def add(self, conn: sqlite3.Connection, memory_id: str, content: str) -> int:
+        """Assign a slot to ``memory_id`` and write its vector.
+
+        Must run inside the caller's write transaction so slot allocation is
+        serialised by SQLite's write lock.
+        """
+        slot = conn.execute(
+            """
+            INSERT INTO memory_vectors (memory_id, slot)
+            VALUES (?, (SELECT COALESCE(MAX(slot), -1) + 1 FROM memory_vectors))
+            ON CONFLICT(memory_id) DO UPDATE SET slot = slot
+            RETURNING slot
+            """,
+            (memory_id,),
+        ).fetchone()[0]
+        if self._writable_at(slot):
+            self._write_rows(slot, embed_text(content).tobytes())
+        return int(slot)
+
+    def add_many(self, conn: sqlite3.Connection, items: list[tuple[str, str]]) -> None:
+        """Assign consecutive slots to new ``(memory_id, content)`` pairs in one write.
+
+        Same transaction requirement as :meth:`add`; the ids must not have a
+        slot yet.
+        """
+        if not items:
+            return
+        max_slot = conn.execute("SELECT MAX(slot) FROM memory_vectors").fetchone()[0]
+        first_slot = 0 if max_slot is None else int(max_slot) + 1
+        conn.executemany(
+            "INSERT INTO memory_vectors (memory_id, slot) VALUES (?, ?)",
+            [(memory_id, first_slot + offset) for offset, (memory_id, _) in enumerate(items)],
+        )
+        if self._writable_at(first_slot):
+            self._write_rows(first_slot, b"".join(embed_text(content).tobytes() for _, content in items))
+
+    def _writable_at(self, slot: int) -> bool:
+        # Until sync() has checked the file, a write past its end would pad
+        # the rows of a lost or truncated file with zeros that sync() can no
+        # longer tell apart; such rows are left for sync() to re-embed.
+        return self._synced or self.row_count() >= slot
+
+    def discard(self, slot: int | None) -> None:
+        if slot is not None and self.row_count() > slot:
+            self._write_rows(slot, bytes(_ROW_BYTES))
+
+    def sync(self, conn: sqlite3.Connection) -> int:
+        """Embed memories that have no vector yet (legacy rows, lost files).
+
+        Runs once per process per index, at startup or on the first semantic
+        search; writes keep it current afterwards.
+        Returns the number of memories embedded.
+        """
+        if self._synced:
+            return 0
+        with self._lock:
+            if self._synced:
+                return 0
+            with conn:
+                embedded = self._backfill_locked(conn)
+            self._synced = True
+        return embedded
+
+    def rebuild(self, conn: sqlite3.Connection) -> int:
+        """Re-embed every memory into a fresh file with no zeroed rows.
+
+        Used after bulk deletes (compaction) so the file and the scan shrink.
+        Returns the number of memories embedded.
+        """
+        with self._lock:
+            with conn:
+                conn.execute("DELETE FROM memory_vectors")
+                self.path.unlink(missing_ok=True)
+                self._matrix = None
+                self._mapped_rows = -1
+                embedded = self._backfill_locked(conn)
+            self._synced = True
+        return embedded
+
+    def _backfill_locked(self, conn: sqlite3.Connection) -> int:
+        max_slot = conn.execute("SELECT MAX(slot) FROM memory_vectors").fetchone()[0]
+        if max_slot is not None and self.row_count() <= max_slot:
+            conn.execute("DELETE FROM memory_vectors")
+            max_slot = None
+        next_slot = -1 if max_slot is None else int(max_slot)
+        rows = conn.execute(
+            """
+            SELECT m.id, m.content FROM memories m
+            WHERE NOT EXISTS (SELECT 1 FROM memory_vectors v WHERE v.memory_id = m.id)
+            ORDER BY m.rowid
+            """
+        ).fetchall()
+        if rows:
+            first_slot = next_slot + 1
+            payload = b"".join(embed_text(row[1] or "").tobytes() for row in rows)
+            conn.executemany(
+                "INSERT INTO memory_vectors (memory_id, slot) VALUES (?, ?)",
+                [(row[0], first_slot + offset) for offset, row in enumerate(rows)],
+            )
+            self._write_rows_locked(first_slot, payload)
+        return len(rows)
+
+    def _write_rows(self, slot: int, payload: bytes) -> None:
+        with self._lock:
+            self._write_rows_locked(slot, payload)
+
+    def _write_rows_locked(self, slot: int, payload: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        mode = "r+b" if self.path.exists() else "w+b"
+        with self.path.open(mode) as handle:
+            handle.seek(slot * _ROW_BYTES)
+            handle.write(payload)
+
+    # -- reads --------------------------------------------------------------
+
+    def row_count(self) -> int:
+        try:
+            return self.path.stat().st_size // _ROW_BYTES
+        except FileNotFoundError:
+            return 0
+
+    def top_slots(self, query: str, count: int) -> list[tuple[int, float]]:
+        """Slots of the ``count`` rows most cosine-similar to ``query``, best first."""
+        if np is None:
+            raise RuntimeError("numpy is required for semantic memory search")
+        matrix = self._map()
+        if matrix is None or count <= 0:
+            return []
+        probe = np.frombuffer(embed_text(query).tobytes(), dtype=np.float32)
+        if not probe.any():
+            return []
+        best_slots: list[Any] = []
+        best_scores: list[Any] = []
+        for start in range(0, matrix.shape[0], _SCAN_CHUNK_ROWS):
+            scores = matrix[start:start + _SCAN_CHUNK_ROWS] @ probe
+            if scores.shape[0] > count:
+                keep = np.argpartition(scores, -count)[-count:]
+            else:
+                keep = np.arange(scores.shape[0])
+            best_slots.append(keep + start)
+            best_scores.append(scores[keep])
+        slots = np.concatenate(best_slots)
+        scores = np.concatenate(best_scores)
+        order = np.argsort(-scores, kind="stable")[:count]
+        return [(int(slots[i]), float(scores[i])) for i in order if scores[i] > 0.0]
+
+    def _map(self) -> Any:
+        rows = self.row_count()
+        if rows == 0:
+            return None
+        if rows != self._mapped_rows:
+            self._matrix = np.memmap(self.path, dtype=np.float32, mode="r", shape=(rows, EMBEDDING_DIM))
+            self._mapped_rows = rows
+        return self._matrix
+
+
+_INDEXES: dict[str, VectorIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_vector_index(db_path: Path) -> VectorIndex:
+    """The vector index stored next to the SQLite database at ``db_path``."""
+    path = db_path.with_name(VECTOR_FILENAME)
+    key = str(path)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = VectorIndex(path)
+            _INDEXES[key] = index
+        return index
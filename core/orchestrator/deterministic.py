@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
 from functools import lru_cache
 import os
 import re
 from pathlib import Path
 from typing import Optional
 
+from core.config import get_confidence_config
+from core.orchestrator.matcher import DOMAINS, finance_transaction_params, match_domain_intent, normalize_text
 from core.orchestrator.policy import _ALLOWED_ACTIONS
 from core.orchestrator.schemas import Intent
 from victus.core.confidence import ConfidenceCore, ConfidenceStore, make_key
@@ -22,195 +23,26 @@ _PAYLOAD_FIELD_BY_ACTION: dict[str, str] = {
 }
 
 
-def _normalize(text: str) -> str:
-    return " ".join(text.strip().split())
-
-
-def parse_memory_intent(utterance: str) -> Optional[Intent]:
-    lowered = utterance.lower().strip()
-    if lowered.startswith("remember "):
-        content = _normalize(utterance[len("remember ") :])
-        if content:
-            return Intent(action="memory.add", parameters={"content": content}, confidence=1.0)
-    if lowered.startswith("save "):
-        content = _normalize(utterance[len("save ") :])
-        if content:
-            return Intent(action="memory.add", parameters={"content": content}, confidence=1.0)
-    if lowered.startswith("what do you remember about "):
-        query = _normalize(utterance[len("what do you remember about ") :])
-        if query:
-            return Intent(action="memory.search", parameters={"query": query}, confidence=1.0)
-    if lowered.startswith("recall "):
-        query = _normalize(utterance[len("recall ") :])
-        if query:
-            return Intent(action="memory.search", parameters={"query": query}, confidence=1.0)
-    if lowered in {"list memories", "show memories"}:
-        return Intent(action="memory.list", parameters={}, confidence=1.0)
-    if lowered.startswith("forget "):
-        memory_id = _normalize(utterance[len("forget ") :])
-        if memory_id:
-            return Intent(action="memory.delete", parameters={"id": memory_id}, confidence=1.0)
-    return None
-
-
-def _extract_amount(text: str) -> Optional[float]:
-    match = re.search(r"\$?(\d+(?:\.\d{1,2})?)", text)
-    if not match:
-        return None
-    return float(match.group(1))
-
-
-def _finance_transaction_params(amount: float, *, merchant: str | None = None, category: str | None = None) -> dict[str, object]:
-    resolved_merchant = _normalize(merchant) if merchant else None
-    resolved_category = _normalize(category) if category else (resolved_merchant or "uncategorized")
-    return {
-        "amount": amount,
-        "category": resolved_category,
-        "merchant": resolved_merchant,
-        "currency": "USD",
-        "occurred_at": datetime.now(tz=timezone.utc).isoformat(),
-    }
-
-
 def _parse_finance_payload(payload: str) -> Optional[dict[str, object]]:
     match = re.match(r"^\$?(?P<amount>\d+(?:\.\d{1,2})?)\s+(?P<merchant>.+)$", payload.strip())
     if not match:
         return None
     amount = float(match.group("amount"))
     merchant = match.group("merchant")
-    return _finance_transaction_params(amount, merchant=merchant)
-
-
-def _parse_category_and_merchant(text: str) -> tuple[str | None, str | None]:
-    lowered = text.strip()
-    if " at " in lowered:
-        category_part, merchant_part = lowered.split(" at ", 1)
-        return category_part.strip(), merchant_part.strip()
-    return lowered.strip(), None
-
-
-def parse_finance_intent(utterance: str) -> Optional[Intent]:
-    lowered = utterance.lower()
-
-    add_transaction_match = re.search(r"\badd\s+transaction\s+\$?(\d+(?:\.\d{1,2})?)\s+(?:for\s+)?(.+)", utterance, re.IGNORECASE)
-    if add_transaction_match:
-        amount = float(add_transaction_match.group(1))
-        merchant = add_transaction_match.group(2)
-        return Intent(action="finance.add_transaction", parameters=_finance_transaction_params(amount, merchant=merchant), confidence=1.0)
-
-    log_match = re.search(r"\blog\s+\$?(\d+(?:\.\d{1,2})?)\s+(.+)", utterance, re.IGNORECASE)
-    if log_match:
-        amount = float(log_match.group(1))
-        merchant = log_match.group(2)
-        return Intent(action="finance.add_transaction", parameters=_finance_transaction_params(amount, merchant=merchant), confidence=1.0)
-
-    spent_at_match = re.search(r"\b(?:spent|paid)\s+\$?(\d+(?:\.\d{1,2})?)\s+(?:at|for)\s+(.+)", utterance, re.IGNORECASE)
-    if spent_at_match:
-        amount = float(spent_at_match.group(1))
-        merchant = spent_at_match.group(2)
-        return Intent(action="finance.add_transaction", parameters=_finance_transaction_params(amount, merchant=merchant), confidence=1.0)
-
-    spent_paid = re.search(r"\b(spent|paid)\b", lowered)
-    if spent_paid:
-        amount = _extract_amount(lowered)
-        if amount is None:
-            return None
-        match = re.search(r"\b(spent|paid)\b.*?\$?\d+(?:\.\d{1,2})?\s*(?:dollars|bucks)?\s*(?:on|for)\s+(.+)", lowered)
-        if not match:
-            return None
-        category_raw = match.group(2)
-        category, merchant = _parse_category_and_merchant(category_raw)
-        if not category:
-            return None
-        return Intent(
-            action="finance.add_transaction",
-            parameters=_finance_transaction_params(amount, merchant=merchant, category=category),
-            confidence=1.0,
-        )
-    if "bought " in lowered and " for " in lowered:
-        match = re.search(r"\bbought\s+(.+?)\s+for\s+\$?(\d+(?:\.\d{1,2})?)", lowered)
-        if not match:
-            return None
-        category_raw = match.group(1)
-        amount = float(match.group(2))
-        category, merchant = _parse_category_and_merchant(category_raw)
-        if not category:
-            return None
-        return Intent(
-            action="finance.add_transaction",
-            parameters=_finance_transaction_params(amount, merchant=merchant, category=category),
-            confidence=1.0,
-        )
-    if lowered in {"list transactions", "show transactions"}:
-        return Intent(action="finance.list_transactions", parameters={}, confidence=1.0)
-    if ("summary" in lowered and "transaction" in lowered) or "spending summary" in lowered:
-        period = "week"
-        if "month" in lowered:
-            period = "month"
-        if "week" in lowered:
-            period = "week"
-        return Intent(action="finance.summary", parameters={"period": period}, confidence=1.0)
-    if lowered in {"finance summary", "summary"}:
-        return Intent(action="finance.summary", parameters={"period": "week"}, confidence=1.0)
-    return None
-
-
-def parse_files_intent(utterance: str) -> Optional[Intent]:
-    lowered = utterance.lower().strip()
-    if lowered == "list files":
-        return Intent(action="files.list", parameters={}, confidence=1.0)
-    if lowered.startswith("read file "):
-        path = _normalize(utterance[len("read file ") :])
-        if path:
-            return Intent(action="files.read", parameters={"path": path}, confidence=1.0)
-    if lowered.startswith("append to "):
-        payload = utterance[len("append to ") :]
-        if ":" in payload:
-            path, content = payload.split(":", 1)
-            path = _normalize(path)
-            if path:
-                return Intent(
-                    action="files.write",
-                    parameters={"path": path, "content": content.lstrip(), "mode": "append"},
-                    confidence=1.0,
-                )
-    if lowered.startswith("write to "):
-        payload = utterance[len("write to ") :]
-        if ":" in payload:
-            path, content = payload.split(":", 1)
-            path = _normalize(path)
-            if path:
-                return Intent(
-                    action="files.write",
-                    parameters={"path": path, "content": content.lstrip(), "mode": "overwrite"},
-                    confidence=1.0,
-                )
-    return None
-
-
-def parse_camera_intent(utterance: str) -> Optional[Intent]:
-    lowered = utterance.lower().strip()
-    if lowered in {"camera status", "status camera", "camera state"}:
-        return Intent(action="camera.status", parameters={}, confidence=1.0)
-    if lowered in {"capture photo", "take a picture", "take a photo"}:
-        return Intent(action="camera.capture", parameters={}, confidence=1.0)
-    if lowered in {"detect face", "detect faces", "recognize", "recognize faces"}:
-        return Intent(action="camera.recognize", parameters={}, confidence=1.0)
-    return None
-
-
-_DOMAIN_PARSERS = (
-    ("camera", parse_camera_intent),
-    ("memories", parse_memory_intent),
-    ("finance", parse_finance_intent),
-    ("files", parse_files_intent),
-)
+    return finance_transaction_params(amount, merchant=merchant)
 
 
 @lru_cache(maxsize=1)
 def _router_confidence_components() -> tuple[ConfidenceStore, ConfidenceCore]:
     data_dir = Path(os.getenv("VICTUS_DATA_DIR", "victus/data"))
-    store = ConfidenceStore(data_dir / "confidence" / "router_domain_store.json")
+    config = get_confidence_config()
+    # Updates stay in memory; the store journals them off the request path.
+    store = ConfidenceStore(
+        data_dir / "confidence" / "router_domain_store.json",
+        flush_interval_seconds=config.flush_interval_seconds,
+        flush_max_pending=config.flush_max_pending,
+        compact_after_entries=config.compact_after_entries,
+    )
     return store, ConfidenceCore(store)
 
 
@@ -218,23 +50,17 @@ def _router_domain_key(domain: str) -> str:
     return make_key("router", "domain", domain)
 
 
-def _select_domain_intent(utterance: str) -> Optional[Intent]:
-    store, core = _router_confidence_components()
-    best: Optional[Intent] = None
-    best_score = -1.0
-
-    for domain, parser in _DOMAIN_PARSERS:
-        intent = parser(utterance)
-        domain_score = 1.0 if intent is not None else 0.0
-        key = _router_domain_key(domain)
-        core.get_score(key)
-        store.update_score(key, domain_score)
+_ROUTER_DOMAIN_KEYS = {domain: _router_domain_key(domain) for domain in DOMAINS}
 
-        if intent is not None and domain_score > best_score:
-            best = intent
-            best_score = domain_score
 
-    return best
+def _select_domain_intent(utterance: str) -> Optional[Intent]:
+    store, _core = _router_confidence_components()
+    matched = match_domain_intent(utterance)
+    winner = matched[0] if matched is not None else None
+    # Resolution stops at the first match, so the winner scores 1.0 and every
+    # other domain 0.0, recorded in one batched update.
+    store.update_scores({key: 1.0 if domain == winner else 0.0 for domain, key in _ROUTER_DOMAIN_KEYS.items()})
+    return matched[1] if matched is not None else None
 
 
 def parse_intent(utterance: str) -> Optional[Intent]:
@@ -242,7 +68,7 @@ def parse_intent(utterance: str) -> Optional[Intent]:
     with_payload_match = _EXPLICIT_ACTION_WITH_PAYLOAD.match(stripped)
     if with_payload_match:
         action = with_payload_match.group("action")
-        payload = _normalize(with_payload_match.group("payload"))
+        payload = normalize_text(with_payload_match.group("payload"))
         supported_actions = set(_ALLOWED_ACTIONS) | set(_PAYLOAD_FIELD_BY_ACTION)
         if action not in supported_actions:
             return Intent(
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Hashable
+
+from adapters.llm.provider import ProposalResult
+from core.config import OrchestratorConfig, get_orchestrator_config
+from core.orchestrator.schemas import Intent
+
+# Parameters the deterministic parsers fill with the current time. They are
+# dropped before caching and stamped afresh on every hit.
+_STAMPED_PARAMETERS = ("occurred_at",)
+# Context keys that only shape the response, never the routing decision.
+_RESPONSE_ONLY_CONTEXT = frozenset({"debug"})
+
+
+@dataclass(frozen=True)
+class IntentCacheStats:
+    max_entries: int
+    ttl_seconds: float
+    entries: int
+    hits: int
+    misses: int
+    expired: int
+    evicted: int
+    hit_rate: float
+
+
+@dataclass(frozen=True)
+class _CachedIntent:
+    intent: Intent | None
+    stamped: tuple[str, ...]
+
+
+def deterministic_key(stage: str, text: str) -> tuple[str, str, str]:
+    """Key for a deterministic parse of ``text``.
+
+    The text is used as the request normalizes it (``normalized_text()``);
+    payloads keep their case and whitespace, so folding either would let
+    two different commands share an entry.
+    """
+    return ("deterministic", stage, text)
+
+
+def proposal_key(
+    text: str,
+    domain: str | None,
+    context: dict[str, Any],
+    config: OrchestratorConfig,
+) -> tuple[object, ...] | None:
+    """Key for an LLM proposal, or ``None`` when the context is not hashable."""
+    routed_context = {key: value for key, value in context.items() if key not in _RESPONSE_ONLY_CONTEXT}
+    try:
+        context_json = json.dumps(routed_context, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return None
+    return ("proposal", text, domain, context_json, config.llm_provider, config.model_priority)
+
+
+class IntentCache:
+    """LRU cache with a TTL for routing results.
+
+    Holds deterministic intents (including "no match") and validated LLM
+    proposals. Entries are immutable copies; every hit returns a fresh one,
+    with time-stamped parameters re-stamped for deterministic intents.
+    """
+
+    def __init__(
+        self,
+        config: OrchestratorConfig | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        config = config or get_orchestrator_config()
+        self.max_entries = config.intent_cache_size
+        self.ttl_seconds = config.intent_cache_ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evicted = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get_intent(self, key: Hashable) -> tuple[bool, Intent | None]:
+        """Return ``(hit, intent)``; a hit may carry ``None`` (no match)."""
+        cached = self._get(key)
+        if not isinstance(cached, _CachedIntent):
+            return False, None
+        if cached.intent is None:
+            return True, None
+        parameters = dict(cached.intent.parameters)
+        now = datetime.now(tz=timezone.utc).isoformat()
+        for name in cached.stamped:
+            parameters[name] = now
+        return True, cached.intent.model_copy(update={"parameters": parameters}, deep=True)
+
+    def put_intent(self, key: Hashable, intent: Intent | None) -> None:
+        if intent is None:
+            self._put(key, _CachedIntent(intent=None, stamped=()))
+            return
+        stamped = tuple(name for name in _STAMPED_PARAMETERS if name in intent.parameters)
+        parameters = {name: value for name, value in intent.parameters.items() if name not in stamped}
+        self._put(key, _CachedIntent(intent=intent.model_copy(update={"parameters": parameters}, deep=True), stamped=stamped))
+
+    def get_proposal(self, key: Hashable | None) -> ProposalResult | None:
+        if key is None:
+            return None
+        cached = self._get(key)
+        return cached.model_copy(deep=True) if isinstance(cached, ProposalResult) else None
+
+    def put_proposal(self, key: Hashable | None, proposal: ProposalResult) -> None:
+        if key is not None:
+            self._put(key, proposal.model_copy(deep=True))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> IntentCacheStats:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return IntentCacheStats(
+                max_entries=self.max_entries,
+                ttl_seconds=self.ttl_seconds,
+                entries=len(self._entries),
+                hits=self._hits,
+                misses=self._misses,
+                expired=self._expired,
+                evicted=self._evicted,
+                hit_rate=round(self._hits / lookups, 4) if lookups else 0.0,
+            )
+
+    def _get(self, key: Hashable) -> object | None:
+        if not self.enabled:
+            return None
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self._expired += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def _put(self, key: Hashable, value: object) -> None:
+        if not self.enabled:
+            return
+        expires_at = self._clock() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evicted += 1
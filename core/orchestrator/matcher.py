@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from core.orchestrator.schemas import Intent
+
+# Compiled routing table for deterministic intents.
+#
+# Verb-led and exact commands (camera, memory, files) are indexed by their
+# first word, a one-level prefix trie, so one dict lookup finds the few
+# phrases that can apply. Finance phrasing can appear anywhere in the text;
+# its positional rules are one alternation regex with a named group per rule.
+# The router's looser finance phrasing and its tool-domain hints are compiled
+# here as well. Domains keep the precedence camera > memories > finance >
+# files and resolution stops at the first intent.
+
+DOMAINS = ("camera", "memories", "finance", "files")
+
+_AMOUNT = r"\d+(?:\.\d{1,2})?"
+_CURRENCY_CODES = {"$": "USD", "€": "EUR", "£": "GBP"}
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.strip().split())
+
+
+def finance_transaction_params(
+    amount: float, *, merchant: str | None = None, category: str | None = None
+) -> dict[str, object]:
+    resolved_merchant = normalize_text(merchant) if merchant else None
+    resolved_category = normalize_text(category) if category else (resolved_merchant or "uncategorized")
+    return {
+        "amount": amount,
+        "category": resolved_category,
+        "merchant": resolved_merchant,
+        "currency": "USD",
+        "occurred_at": datetime.now(tz=timezone.utc).isoformat(),
+    }
+
+
+def _category_and_merchant(text: str) -> tuple[str | None, str | None]:
+    stripped = text.strip()
+    if " at " in stripped:
+        category_part, merchant_part = stripped.split(" at ", 1)
+        return category_part.strip(), merchant_part.strip()
+    return stripped, None
+
+
+# ---------------------------------------------------------------------------
+# Ranked alternations
+# ---------------------------------------------------------------------------
+
+def _compile_ranked(
+    rules: tuple[tuple[str, str], ...], first_letters: str, flags: int = 0
+) -> tuple[re.Pattern[str], ...]:
+    """``patterns[k]`` matches any of the first ``k + 1`` rules, each in a group named after it.
+
+    Every rule starts with one of ``first_letters``; the leading lookahead
+    lets the engine skip other offsets with a character-set scan.
+    """
+    return tuple(
+        re.compile(
+            f"(?=[{first_letters}])(?:" + "|".join(f"(?P<{name}>{body})" for name, body in rules[: rank + 1]) + ")",
+            flags,
+        )
+        for rank in range(len(rules))
+    )
+
+
+def _first_ranked(patterns: tuple[re.Pattern[str], ...], ranks: dict[str, int], text: str) -> Optional[re.Match[str]]:
+    """The match searching each rule in rank order would settle on.
+
+    One search over the full alternation finds the leftmost hit. No rule can
+    match further left, and higher-ranked rules already failed at that
+    offset, so only they need a look past it; in practice that second search
+    only runs when two rules both occur in one utterance.
+    """
+    match = patterns[-1].search(text)
+    while match is not None:
+        rank = ranks[match.lastgroup or ""]
+        if rank == 0:
+            break
+        higher = patterns[rank - 1].search(text, match.start() + 1)
+        if higher is None:
+            break
+        match = higher
+    return match
+
+
+# ---------------------------------------------------------------------------
+# Commands (camera, memories, files)
+# ---------------------------------------------------------------------------
+
+# build(utterance, phrase) -> Intent, or None to fall through to the next rule
+_Builder = Callable[[str, str], Optional[Intent]]
+
+
+@dataclass(frozen=True)
+class _Command:
+    domain: str
+    phrase: str
+    exact: bool
+    build: _Builder
+
+    def resolve(self, utterance: str, stripped: str) -> Optional[Intent]:
+        if stripped == self.phrase if self.exact else stripped.startswith(self.phrase):
+            return self.build(utterance, self.phrase)
+        return None
+
+
+def _fixed(action: str) -> _Builder:
+    return lambda _utterance, _phrase: Intent(action=action, parameters={}, confidence=1.0)
+
+
+def _with_payload(action: str, field_name: str) -> _Builder:
+    def build(utterance: str, phrase: str) -> Optional[Intent]:
+        value = normalize_text(utterance[len(phrase) :])
+        if not value:
+            return None
+        return Intent(action=action, parameters={field_name: value}, confidence=1.0)
+
+    return build
+
+
+def _file_write(mode: str) -> _Builder:
+    def build(utterance: str, phrase: str) -> Optional[Intent]:
+        payload = utterance[len(phrase) :]
+        if ":" not in payload:
+            return None
+        path, content = payload.split(":", 1)
+        path = normalize_text(path)
+        if not path:
+            return None
+        return Intent(
+            action="files.write",
+            parameters={"path": path, "content": content.lstrip(), "mode": mode},
+            confidence=1.0,
+        )
+
+    return build
+
+
+# In precedence order; prefix phrases end with the space that must follow the verb.
+_COMMAND_TABLE: tuple[_Command, ...] = (
+    *(_Command("camera", phrase, True, _fixed("camera.status")) for phrase in ("camera status", "status camera", "camera state")),
+    *(_Command("camera", phrase, True, _fixed("camera.capture")) for phrase in ("capture photo", "take a picture", "take a photo")),
+    *(
+        _Command("camera", phrase, True, _fixed("camera.recognize"))
+        for phrase in ("detect face", "detect faces", "recognize", "recognize faces")
+    ),
+    _Command("memories", "remember ", False, _with_payload("memory.add", "content")),
+    _Command("memories", "save ", False, _with_payload("memory.add", "content")),
+    _Command("memories", "what do you remember about ", False, _with_payload("memory.search", "query")),
+    _Command("memories", "recall ", False, _with_payload("memory.search", "query")),
+    _Command("memories", "list memories", True, _fixed("memory.list")),
+    _Command("memories", "show memories", True, _fixed("memory.list")),
+    _Command("memories", "forget ", False, _with_payload("memory.delete", "id")),
+    _Command("files", "list files", True, _fixed("files.list")),
+    _Command("files", "read file ", False, _with_payload("files.read", "path")),
+    _Command("files", "append to ", False, _file_write("append")),
+    _Command("files", "write to ", False, _file_write("overwrite")),
+)
+
+
+def _index_commands() -> dict[str, tuple[_Command, ...]]:
+    by_word: dict[str, list[_Command]] = {}
+    for command in _COMMAND_TABLE:
+        by_word.setdefault(command.phrase.partition(" ")[0], []).append(command)
+    return {word: tuple(commands) for word, commands in by_word.items()}
+
+
+_COMMANDS_BY_WORD = _index_commands()
+
+
+# ---------------------------------------------------------------------------
+# Finance
+# ---------------------------------------------------------------------------
+
+# Rules found by position, in rank order. The rest are checked on the lowered
+# text once none of these match: a bare spent/paid, then substring tests.
+_FINANCE_RULES = (
+    ("add", rf"\badd\s+transaction\s+\$?(?P<add_amount>{_AMOUNT})\s+(?:for\s+)?(?P<add_merchant>.+)"),
+    ("log", rf"\blog\s+\$?(?P<log_amount>{_AMOUNT})\s+(?P<log_merchant>.+)"),
+    ("spent_at", rf"\b(?:spent|paid)\s+\$?(?P<spent_at_amount>{_AMOUNT})\s+(?:at|for)\s+(?P<spent_at_merchant>.+)"),
+)
+_FINANCE_PATTERNS = _compile_ranked(_FINANCE_RULES, "alsp", re.IGNORECASE)
+_FINANCE_RANKS = {name: rank for rank, (name, _body) in enumerate(_FINANCE_RULES)}
+_SPENT_OR_PAID = re.compile(r"\b(?:spent|paid)\b")
+_FIRST_AMOUNT = re.compile(rf"\$?({_AMOUNT})")
+_SPENT_ON = re.compile(rf"\b(spent|paid)\b.*?\$?{_AMOUNT}\s*(?:dollars|bucks)?\s*(?:on|for)\s+(.+)")
+_BOUGHT_FOR = re.compile(rf"\bbought\s+(.+?)\s+for\s+\$?({_AMOUNT})")
+_LIST_TRANSACTIONS = frozenset({"list transactions", "show transactions"})
+_SHORT_SUMMARY = frozenset({"finance summary", "summary"})
+
+
+def _finance_intent(utterance: str, lowered: str) -> Optional[Intent]:
+    match = _first_ranked(_FINANCE_PATTERNS, _FINANCE_RANKS, utterance)
+    if match is not None:
+        rule = match.lastgroup
+        amount = float(match.group(f"{rule}_amount"))
+        params = finance_transaction_params(amount, merchant=match.group(f"{rule}_merchant"))
+        return Intent(action="finance.add_transaction", parameters=params, confidence=1.0)
+    if _SPENT_OR_PAID.search(lowered) is not None:
+        amount_match = _FIRST_AMOUNT.search(lowered)
+        described = _SPENT_ON.search(lowered) if amount_match is not None else None
+        if described is None:
+            return None
+        amount = float(amount_match.group(1))
+        category, merchant = _category_and_merchant(described.group(2))
+    elif "bought " in lowered and " for " in lowered:
+        described = _BOUGHT_FOR.search(lowered)
+        if described is None:
+            return None
+        amount = float(described.group(2))
+        category, merchant = _category_and_merchant(described.group(1))
+    elif lowered in _LIST_TRANSACTIONS:
+        return Intent(action="finance.list_transactions", parameters={}, confidence=1.0)
+    elif ("summary" in lowered and "transaction" in lowered) or "spending summary" in lowered:
+        period = "month" if "month" in lowered and "week" not in lowered else "week"
+        return Intent(action="finance.summary", parameters={"period": period}, confidence=1.0)
+    elif lowered in _SHORT_SUMMARY:
+        return Intent(action="finance.summary", parameters={"period": "week"}, confidence=1.0)
+    else:
+        return None
+    if not category:
+        return None
+    return Intent(
+        action="finance.add_transaction",
+        parameters=finance_transaction_params(amount, merchant=merchant, category=category),
+        confidence=1.0,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Router scans (looser finance phrasing, tool-domain hints)
+# ---------------------------------------------------------------------------
+
+_FINANCE_CANDIDATE_RULES = (
+    (
+        "spent",
+        rf"\b(?:i\s+)?(?:spent|paid)\s+(?P<spent_currency>[$€£])?(?P<spent_amount>{_AMOUNT})"
+        r"(?:\s*(?:dollars?|bucks))?\s+(?:at|for|on)\s+(?P<spent_merchant>.+)$",
+    ),
+    ("add", rf"\badd\s+transaction\s+(?P<add_currency>[$€£])?(?P<add_amount>{_AMOUNT})\s+(?:for\s+)?(?P<add_merchant>.+)$"),
+)
+_FINANCE_CANDIDATE_PATTERNS = _compile_ranked(_FINANCE_CANDIDATE_RULES, "ispa", re.IGNORECASE)
+_FINANCE_CANDIDATE_RANKS = {name: rank for rank, (name, _body) in enumerate(_FINANCE_CANDIDATE_RULES)}
+_FINANCE_CANDIDATE_SINGLE = tuple((name, re.compile(body, re.IGNORECASE)) for name, body in _FINANCE_CANDIDATE_RULES)
+
+TOOL_DOMAIN_HINTS: dict[str, tuple[str, ...]] = {
+    "memory": ("memory", "remember", "recall", "forget"),
+    "finance": ("finance", "spent", "paid", "transaction", "summary", "$"),
+    "files": ("file", "files", "read", "write", "append", "list"),
+    "camera": ("camera", "photo", "picture", "capture", "recognize", "face"),
+}
+# A zero-width probe at every offset, so hints of different domains that
+# overlap in the text ("recallist") are all seen.
+_TOOL_DOMAIN_PATTERN = re.compile(
+    "(?="
+    + "|".join(
+        f"(?P<{domain}>{'|'.join(re.escape(hint) for hint in hints)})" for domain, hints in TOOL_DOMAIN_HINTS.items()
+    )
+    + ")"
+)
+
+
+def _finance_candidate_from(match: re.Match[str], rule: str) -> Optional[Intent]:
+    merchant = match.group(f"{rule}_merchant").strip(" .,!?")
+    if not merchant:
+        return None
+    symbol = (match.group(f"{rule}_currency") or "$").strip()
+    return Intent(
+        action="finance.add_transaction",
+        parameters={
+            "amount": float(match.group(f"{rule}_amount")),
+            "merchant": merchant,
+            "category": merchant,
+            "currency": _CURRENCY_CODES.get(symbol, "USD"),
+            "occurred_at": datetime.now(tz=timezone.utc).isoformat(),
+        },
+        confidence=0.92,
+    )
+
+
+def finance_candidate(text: str) -> Optional[Intent]:
+    """Looser finance phrasing (currency symbols, "on"), confidence 0.92."""
+    stripped = text.strip()
+    match = _first_ranked(_FINANCE_CANDIDATE_PATTERNS, _FINANCE_CANDIDATE_RANKS, stripped)
+    if match is None:
+        return None
+    rule = match.lastgroup or ""
+    intent = _finance_candidate_from(match, rule)
+    if intent is not None:
+        return intent
+    # Rare: the winning rule left no merchant; lower-ranked rules may still apply.
+    for name, pattern in _FINANCE_CANDIDATE_SINGLE[_FINANCE_CANDIDATE_RANKS[rule] + 1 :]:
+        later = pattern.search(stripped)
+        if later is not None and (intent := _finance_candidate_from(later, name)) is not None:
+            return intent
+    return None
+
+
+def tool_domains(text: str) -> list[str]:
+    """Tool domains hinted at anywhere in ``text``, in TOOL_DOMAIN_HINTS order."""
+    seen: set[str] = set()
+    for match in _TOOL_DOMAIN_PATTERN.finditer(text.lower()):
+        seen.add(match.lastgroup or "")
+        if len(seen) == len(TOOL_DOMAIN_HINTS):
+            break
+    return [domain for domain in TOOL_DOMAIN_HINTS if domain in seen]
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def match_domain_intent(utterance: str) -> Optional[tuple[str, Intent]]:
+    """Resolve ``utterance`` to ``(domain, intent)`` in one pass, or ``None``."""
+    lowered = utterance.lower()
+    stripped = lowered.strip()
+    finance_pending = True
+    for command in _COMMANDS_BY_WORD.get(stripped.partition(" ")[0], ()):
+        if finance_pending and command.domain == "files":
+            finance_pending = False
+            intent = _finance_intent(utterance, lowered)
+            if intent is not None:
+                return "finance", intent
+        intent = command.resolve(utterance, stripped)
+        if intent is not None:
+            return command.domain, intent
+    if finance_pending:
+        intent = _finance_intent(utterance, lowered)
+        if intent is not None:
+            return "finance", intent
+    return None
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import re
-from datetime import datetime, timezone
 from typing import Callable
 
 from adapters.llm.provider import LLMProposer, ProposalResult
@@ -13,6 +12,8 @@ from core.finance.service import add_transaction, list_transactions, summary
 from core.logging.audit import audit_event, safe_excerpt, text_hash
 from core.memory.service import add_memory, delete_memory, list_recent, search_memories
 from core.orchestrator.deterministic import parse_intent
+from core.orchestrator.intent_cache import IntentCache, deterministic_key, proposal_key
+from core.orchestrator.matcher import finance_candidate, tool_domains
 from core.orchestrator.policy import validate_intent
 from core.orchestrator.schemas import (
     ActionResult,
@@ -49,12 +50,7 @@ _SMALLTALK_PATTERNS: tuple[re.Pattern[str], ...] = (
     re.compile(r"^\s*howdy\b", re.IGNORECASE),
 )
 
-_TOOL_DOMAIN_HINTS = {
-    "memory": ("memory", "remember", "recall", "forget"),
-    "finance": ("finance", "spent", "paid", "transaction", "summary", "$"),
-    "files": ("file", "files", "read", "write", "append", "list"),
-    "camera": ("camera", "photo", "picture", "capture", "recognize", "face"),
-}
+INTENT_CACHE = IntentCache()
 
 
 def _is_smalltalk(text: str) -> bool:
@@ -68,13 +64,12 @@ def _deterministic_route(request: OrchestrateRequest) -> Intent | None:
     return parse_intent(request.normalized_text())
 
 
-def _tool_domains_in_text(text: str) -> list[str]:
-    lowered = text.lower()
-    matches: list[str] = []
-    for domain, hints in _TOOL_DOMAIN_HINTS.items():
-        if any(hint in lowered for hint in hints):
-            matches.append(domain)
-    return matches
+def _cached_intent(key: tuple[str, str, str], parse: Callable[[], Intent | None]) -> Intent | None:
+    hit, intent = INTENT_CACHE.get_intent(key)
+    if not hit:
+        intent = parse()
+        INTENT_CACHE.put_intent(key, intent)
+    return intent
 
 
 def _tool_memory_add(params: dict[str, object]) -> tuple[str, dict[str, object]]:
@@ -260,35 +255,6 @@ def _noop_response(message: str, trace: dict[str, object] | None) -> Orchestrate
     )
 
 
-def _regex_finance_candidate(text: str) -> Intent | None:
-    patterns = (
-        re.compile(r"\b(?:i\s+)?(?:spent|paid)\s+(?P<currency>[$€£])?(?P<amount>\d+(?:\.\d{1,2})?)(?:\s*(?:dollars?|bucks))?\s+(?:at|for|on)\s+(?P<merchant>.+)$", re.IGNORECASE),
-        re.compile(r"\badd\s+transaction\s+(?P<currency>[$€£])?(?P<amount>\d+(?:\.\d{1,2})?)\s+(?:for\s+)?(?P<merchant>.+)$", re.IGNORECASE),
-    )
-    for pattern in patterns:
-        match = pattern.search(text.strip())
-        if not match:
-            continue
-        amount = float(match.group("amount"))
-        merchant = match.group("merchant").strip(" .,!?")
-        if not merchant:
-            continue
-        symbol = (match.groupdict().get("currency") or "$").strip()
-        currency = {"$": "USD", "€": "EUR", "£": "GBP"}.get(symbol, "USD")
-        return Intent(
-            action="finance.add_transaction",
-            parameters={
-                "amount": amount,
-                "merchant": merchant,
-                "category": merchant,
-                "currency": currency,
-                "occurred_at": datetime.now(tz=timezone.utc).isoformat(),
-            },
-            confidence=0.92,
-        )
-    return None
-
-
 def _response_result(
     actions: list[ActionResult],
     trace: dict[str, object] | None,
@@ -357,7 +323,10 @@ def route_intent(
 
 
     if not force_llm:
-        deterministic_intent = _deterministic_route(request)
+        deterministic_intent = _cached_intent(
+            deterministic_key("parse", request.normalized_text()),
+            lambda: _deterministic_route(request),
+        )
         if deterministic_intent is not None and deterministic_intent.confidence >= 1.0:
             decision_path.append("deterministic:tool_match")
             explicit_error = deterministic_intent.parameters.get("error")
@@ -391,7 +360,10 @@ def route_intent(
                     result=_response_result(actions, _trace("deterministic")),
                 )
 
-        regex_finance_intent = _regex_finance_candidate(text)
+        regex_finance_intent = _cached_intent(
+            deterministic_key("finance_candidate", text),
+            lambda: finance_candidate(text),
+        )
         if regex_finance_intent is not None:
             decision_path.append("deterministic:regex_finance_candidate")
             selected_intent = validate_intent(regex_finance_intent)
@@ -415,8 +387,8 @@ def route_intent(
                     result=_response_result(actions, _trace("deterministic")),
                 )
 
-        tool_domains = _tool_domains_in_text(text)
-        if not tool_domains:
+        hinted_domains = tool_domains(text)
+        if not hinted_domains:
             decision_path.append("deterministic:noop_non_tool")
             return _noop_response("Please ask for a supported tool action (memory, finance, files, or camera).", _trace("deterministic"))
 
@@ -424,7 +396,7 @@ def route_intent(
             decision_path.append("deterministic:no_match")
             return _noop_response("I need a concrete tool request to continue.", _trace("deterministic"))
 
-        if len(tool_domains) > 1:
+        if len(hinted_domains) > 1:
             decision_path.append("deterministic:clarify")
             if not config.enable_llm_fallback:
                 return _clarify_response("I can help with tools—do you want memory, finance, files, or camera?")
@@ -442,16 +414,24 @@ def route_intent(
         )
         return _noop_response("I need a concrete tool request to continue.", _trace("chat_fallback"))
 
-    audit_event(
-        "llm.propose.request",
-        text_hash=text_hash(text),
-        text_excerpt=safe_excerpt(text),
-        domain=request.domain,
-        candidate_count=len(_ALLOWED_ACTIONS),
-    )
-    proposal = llm_provider.propose(text=text, domain=request.domain, candidates=_ALLOWED_ACTIONS, context=request.context)
-    decision_path.append("llm:propose")
-    llm_was_called = True
+    proposal_cache_key = proposal_key(text, request.domain, request.context, config)
+    proposal = INTENT_CACHE.get_proposal(proposal_cache_key)
+    if proposal is not None:
+        decision_path.append("llm:propose_cached")
+    else:
+        audit_event(
+            "llm.propose.request",
+            text_hash=text_hash(text),
+            text_excerpt=safe_excerpt(text),
+            domain=request.domain,
+            candidate_count=len(_ALLOWED_ACTIONS),
+        )
+        proposal = llm_provider.propose(text=text, domain=request.domain, candidates=_ALLOWED_ACTIONS, context=request.context)
+        decision_path.append("llm:propose")
+        llm_was_called = True
+        # Only validated proposals are reused; failures (e.g. Ollama down) retry.
+        if _validate_proposal(proposal) is not None:
+            INTENT_CACHE.put_proposal(proposal_cache_key, proposal)
     selected_model = proposal.selected_model
     proposal_confidence = proposal.confidence
     audit_event(
@@ -10,6 +10,8 @@ from core.domains.finance.handlers import (
     create_bill_handler,
     create_budget_handler,
     create_savings_goal_handler,
+    detect_anomalies_handler,
+    detect_recurring_expenses_handler,
     get_budget_status_handler,
     get_category_summary_handler,
     get_due_bills_handler,
@@ -55,6 +57,8 @@ ACTION_REGISTRY: dict[str, ActionHandler | None] = {
     # Alerts / Insights / Guidance
     "finance.list_alerts": list_alerts_handler,
     "finance.get_insights": get_insights_handler,
+    "finance.detect_anomalies": detect_anomalies_handler,
+    "finance.detect_recurring_expenses": detect_recurring_expenses_handler,
     "finance.get_guidance": get_guidance_handler,
     # Memory
     "memory.create_note": create_note_handler,
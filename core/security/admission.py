@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+from core.config import AuthConfig, get_auth_config
+
+
+@dataclass(frozen=True)
+class AdmissionStats:
+    tracked_keys: int
+    admitted: int
+    rejected: int
+
+
+class LoginAdmission:
+    """Token buckets for login attempts per (username, client) and per client.
+
+    An attempt is admitted only when both of its buckets hold a token, so one
+    address cannot spray usernames or passwords. Buckets are never keyed on
+    the username alone: failed attempts from one address cannot lock the
+    account out for everyone else. A successful login refills its
+    (username, client) bucket and returns the client's token, so only failed
+    attempts count in the end. At most ``max_keys`` buckets are kept (least
+    recently used are dropped; a dropped bucket starts full again).
+    """
+
+    def __init__(
+        self,
+        config: AuthConfig | None = None,
+        *,
+        max_keys: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        config = config or get_auth_config()
+        self.burst = float(config.login_burst)
+        self.refill_per_second = config.login_attempts_per_minute / 60.0
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: OrderedDict[tuple[str, ...], list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._rejected = 0
+
+    def admit(self, username: str, client: str | None) -> float | None:
+        """Take one attempt; return ``None`` when admitted, else seconds to wait."""
+        now = self._clock()
+        with self._lock:
+            buckets = [self._refilled(key, now) for key in self._keys(username, client)]
+            short = [bucket for bucket in buckets if bucket[0] < 1.0]
+            if short:
+                self._rejected += 1
+                return max((1.0 - bucket[0]) / self.refill_per_second for bucket in short)
+            for bucket in buckets:
+                bucket[0] -= 1.0
+            self._admitted += 1
+            return None
+
+    def succeeded(self, username: str, client: str | None) -> None:
+        """Forgive the failures of a client that just logged in."""
+        now = self._clock()
+        with self._lock:
+            pair, *rest = self._keys(username, client)
+            self._refilled(pair, now)[0] = self.burst
+            for key in rest:
+                bucket = self._refilled(key, now)
+                bucket[0] = min(self.burst, bucket[0] + 1.0)
+
+    def refund(self, username: str, client: str | None) -> None:
+        """Give back an admitted attempt whose password was never checked."""
+        now = self._clock()
+        with self._lock:
+            for key in self._keys(username, client):
+                bucket = self._refilled(key, now)
+                bucket[0] = min(self.burst, bucket[0] + 1.0)
+
+    def stats(self) -> AdmissionStats:
+        with self._lock:
+            return AdmissionStats(tracked_keys=len(self._buckets), admitted=self._admitted, rejected=self._rejected)
+
+    @staticmethod
+    def _keys(username: str, client: str | None) -> list[tuple[str, ...]]:
+        keys: list[tuple[str, ...]] = [("user", username.strip().lower(), client or "")]
+        if client:
+            keys.append(("client", client))
+        return keys
+
+    def _refilled(self, key: tuple[str, ...], now: float) -> list[float]:
+        # bucket = [tokens, last refill time]
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.refill_per_second)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+        return bucket
+
+
+LOGIN_ADMISSION = LoginAdmission()
@@ -1,17 +1,33 @@
 from __future__ import annotations
 
 import base64
+import hashlib
+import hmac
 import json
 import secrets
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Optional
 
 import bcrypt
 from fastapi import Depends, HTTPException, Request, status
 
+from core.config import get_auth_config
 from core.logging.audit import audit_event
-from core.security.bootstrap_store import get_jwt_secret, is_bootstrapped, verify_admin_password
+from core.security.admission import LOGIN_ADMISSION
+from core.security.bootstrap_store import (
+    get_admin_password_hash,
+    get_jwt_secret,
+    is_bootstrapped,
+    verify_admin_password,
+)
+from core.security.hashing import PASSWORD_HASHER, PasswordHasherBusy
+
+# Tokens are ``v2.<payload>.<hmac-sha256>``; legacy ``<payload>.<bcrypt-kdf>``
+# tokens are still accepted while AuthConfig.accept_legacy_tokens is set.
+_TOKEN_VERSION = "v2"
 
 
 @dataclass(frozen=True)
@@ -21,37 +37,89 @@ class TokenPayload:
     exp: int
 
 
+class _VerifiedTokenCache:
+    """Bounded LRU of verified tokens, keyed by SHA-256 of the token.
+
+    Entries remember the secret they were verified against, so a re-bootstrap
+    (new secret) or another database makes them miss; they expire with ``exp``.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[str, TokenPayload]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes, secret: str, now: int) -> Optional[TokenPayload]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            cached_secret, payload = entry
+            if cached_secret != secret or payload.exp < now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key: bytes, secret: str, payload: TokenPayload) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (secret, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_VERIFIED_TOKENS = _VerifiedTokenCache(get_auth_config().token_cache_size)
+
+
 def authenticate(username: str, password: str) -> bool:
     if not is_bootstrapped():
         return False
     return username == "admin" and verify_admin_password(password)
 
 
-def _encode_payload(payload: TokenPayload, secret: str) -> str:
-    payload_json = json.dumps(payload.__dict__).encode("utf-8")
-    payload_b64 = base64.urlsafe_b64encode(payload_json).rstrip(b"=").decode("utf-8")
-    signature = bcrypt.kdf(
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("utf-8")
+
+
+def _hmac_signature(signed: str, secret: str) -> str:
+    return _b64encode(hmac.new(secret.encode("utf-8"), signed.encode("utf-8"), hashlib.sha256).digest())
+
+
+def _legacy_signature(payload_b64: str, secret: str) -> str:
+    return _b64encode(bcrypt.kdf(
         password=payload_b64.encode("utf-8"),
         salt=secret.encode("utf-8"),
         desired_key_bytes=32,
         rounds=64,
-    )
-    signature_b64 = base64.urlsafe_b64encode(signature).rstrip(b"=").decode("utf-8")
-    return f"{payload_b64}.{signature_b64}"
+    ))
+
+
+def _encode_payload(payload: TokenPayload, secret: str) -> str:
+    payload_json = json.dumps(payload.__dict__).encode("utf-8")
+    signed = f"{_TOKEN_VERSION}.{_b64encode(payload_json)}"
+    return f"{signed}.{_hmac_signature(signed, secret)}"
 
 
 def _decode_payload(token: str, secret: str) -> Optional[TokenPayload]:
-    try:
-        payload_b64, signature_b64 = token.split(".", 1)
-    except ValueError:
+    parts = token.split(".")
+    if len(parts) == 3 and parts[0] == _TOKEN_VERSION:
+        payload_b64, signature_b64 = parts[1], parts[2]
+        expected_b64 = _hmac_signature(f"{parts[0]}.{payload_b64}", secret)
+    elif len(parts) == 2 and get_auth_config().accept_legacy_tokens:
+        payload_b64, signature_b64 = parts
+        expected_b64 = _legacy_signature(payload_b64, secret)
+    else:
         return None
-    expected_signature = bcrypt.kdf(
-        password=payload_b64.encode("utf-8"),
-        salt=secret.encode("utf-8"),
-        desired_key_bytes=32,
-        rounds=64,
-    )
-    expected_b64 = base64.urlsafe_b64encode(expected_signature).rstrip(b"=").decode("utf-8")
     if not secrets.compare_digest(expected_b64, signature_b64):
         return None
     padded = payload_b64 + "=" * (-len(payload_b64) % 4)
@@ -71,11 +139,17 @@ def verify_token(token: str) -> Optional[TokenPayload]:
     if not is_bootstrapped():
         return None
     secret = get_jwt_secret()
+    now = int(time.time())
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _VERIFIED_TOKENS.get(key, secret, now)
+    if payload is not None:
+        return payload
     payload = _decode_payload(token, secret)
     if payload is None:
         return None
-    if payload.exp < int(time.time()):
+    if payload.exp < now:
         return None
+    _VERIFIED_TOKENS.put(key, secret, payload)
     return payload
 
 
@@ -94,7 +168,8 @@ def require_user(user: str = Depends(get_current_user)) -> str:
     return user
 
 
-def login_user(username: str, password: str) -> str:
+async def login_user(username: str, password: str, client: str | None = None) -> str:
+    """Check credentials off the request threads, behind per-(user, client) and per-client admission."""
     if not is_bootstrapped():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -103,8 +178,31 @@ def login_user(username: str, password: str) -> str:
                 "message": "Call POST /bootstrap/init (or run `python -m apps.local.bootstrap`) to initialize Victus Local.",
             },
         )
-    if not authenticate(username, password):
+    retry_after = LOGIN_ADMISSION.admit(username, client)
+    if retry_after is not None:
+        audit_event("auth_throttled", username=username)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={"error": "too_many_attempts", "message": "Too many login attempts. Try again later."},
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+    password_hash = get_admin_password_hash()
+    try:
+        valid = (
+            username == "admin"
+            and password_hash is not None
+            and await PASSWORD_HASHER.check(password, password_hash)
+        )
+    except PasswordHasherBusy as exc:
+        LOGIN_ADMISSION.refund(username, client)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=exc.to_response(),
+            headers={"Retry-After": "1"},
+        ) from exc
+    if not valid:
         audit_event("auth_failed", username=username)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    LOGIN_ADMISSION.succeeded(username, client)
     audit_event("auth_success", username=username)
     return create_token(username)
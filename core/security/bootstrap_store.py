@@ -1,21 +1,65 @@
 from __future__ import annotations
 
+import threading
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 import bcrypt
 
-from core.storage.db import get_connection
+from core.storage.db import get_connection, resolve_db_path
 
 
-def is_bootstrapped() -> bool:
+@dataclass(frozen=True)
+class _BootstrapState:
+    jwt_secret: str
+    admin_password_hash: str
+
+
+# Bootstrapped state per database. Only the bootstrapped state is cached; it
+# changes solely through set_bootstrap, which drops the entry. The generation
+# guards against a reader re-caching state it loaded before a concurrent
+# set_bootstrap committed.
+_STATES: dict[str, _BootstrapState] = {}
+_STATES_LOCK = threading.Lock()
+_generation = 0
+
+
+def _bootstrap_state() -> _BootstrapState | None:
+    key = str(resolve_db_path())
+    state = _STATES.get(key)
+    if state is not None:
+        return state
+    generation = _generation
     conn = get_connection()
     try:
         row = conn.execute(
-            "SELECT bootstrapped FROM bootstrap_state WHERE id = 1"
+            """
+            SELECT jwt_secret, admin_password_hash
+            FROM bootstrap_state
+            WHERE id = 1 AND bootstrapped = 1
+            """
         ).fetchone()
     finally:
         conn.close()
-    return bool(row["bootstrapped"]) if row else False
+    if not row:
+        return None
+    state = _BootstrapState(jwt_secret=str(row["jwt_secret"]), admin_password_hash=str(row["admin_password_hash"]))
+    with _STATES_LOCK:
+        if generation == _generation:
+            _STATES[key] = state
+    return state
+
+
+def invalidate_bootstrap_cache() -> None:
+    """Forget the cached bootstrap state of the active database."""
+    global _generation
+    with _STATES_LOCK:
+        _generation += 1
+        _STATES.pop(str(resolve_db_path()), None)
+
+
+def is_bootstrapped() -> bool:
+    return _bootstrap_state() is not None
 
 
 def set_bootstrap(admin_hash: str, jwt_secret: str) -> None:
@@ -35,34 +79,23 @@ def set_bootstrap(admin_hash: str, jwt_secret: str) -> None:
         conn.commit()
     finally:
         conn.close()
+    invalidate_bootstrap_cache()
 
 
 def get_jwt_secret() -> str:
-    conn = get_connection()
-    try:
-        row = conn.execute(
-            "SELECT jwt_secret FROM bootstrap_state WHERE id = 1 AND bootstrapped = 1"
-        ).fetchone()
-    finally:
-        conn.close()
-    if not row:
+    state = _bootstrap_state()
+    if state is None:
         raise RuntimeError("System is not bootstrapped")
-    return str(row["jwt_secret"])
+    return state.jwt_secret
+
+
+def get_admin_password_hash() -> str | None:
+    state = _bootstrap_state()
+    return state.admin_password_hash if state else None
 
 
 def verify_admin_password(plain: str) -> bool:
-    conn = get_connection()
-    try:
-        row = conn.execute(
-            """
-            SELECT admin_password_hash
-            FROM bootstrap_state
-            WHERE id = 1 AND bootstrapped = 1
-            """
-        ).fetchone()
-    finally:
-        conn.close()
-    if not row:
+    password_hash = get_admin_password_hash()
+    if password_hash is None:
         return False
-    password_hash = str(row["admin_password_hash"])
     return bcrypt.checkpw(plain.encode("utf-8"), password_hash.encode("utf-8"))
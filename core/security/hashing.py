@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+import bcrypt
+
+from core.config import AuthConfig, get_auth_config
+from core.errors import VictusError
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(VictusError):
+    def __init__(self, message: str = "Password hashing queue is full", *, code: str = "auth_busy") -> None:
+        super().__init__(message=message, safe_message="The service is busy. Try again shortly.", code=code)
+
+
+@dataclass(frozen=True)
+class HasherStats:
+    max_workers: int
+    max_queue: int
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+
+
+class PasswordHasher:
+    """Runs bcrypt on a small dedicated thread pool.
+
+    bcrypt releases the GIL, so ``max_workers`` threads hash in parallel
+    without touching the request threadpool. At most ``max_queue`` calls wait
+    behind them; further calls fail fast with :class:`PasswordHasherBusy`.
+    """
+
+    def __init__(self, config: AuthConfig | None = None) -> None:
+        config = config or get_auth_config()
+        self.max_workers = config.hash_workers
+        self.max_queue = config.hash_max_queue
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="victus-bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def check(self, plain: str, password_hash: str) -> bool:
+        return await self._run(bcrypt.checkpw, plain.encode("utf-8"), password_hash.encode("utf-8"))
+
+    async def hash(self, plain: str) -> str:
+        hashed = await self._run(lambda raw: bcrypt.hashpw(raw, bcrypt.gensalt()), plain.encode("utf-8"))
+        return hashed.decode("utf-8")
+
+    def stats(self) -> HasherStats:
+        with self._lock:
+            return HasherStats(
+                max_workers=self.max_workers,
+                max_queue=self.max_queue,
+                running=self._running,
+                queued=self._pending - self._running,
+                completed=self._completed,
+                rejected=self._rejected,
+            )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, fn: Callable[..., T], *args: object) -> T:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHasherBusy()
+            self._pending += 1
+        future: Future[T] = self._executor.submit(self._tracked, fn, *args)
+        return await asyncio.wrap_future(future)
+
+    def _tracked(self, fn: Callable[..., T], *args: object) -> T:
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._completed += 1
+
+
+PASSWORD_HASHER = PasswordHasher()
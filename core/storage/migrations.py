@@ -0,0 +1,1002 @@
+"""Versioned schema migrations for the local SQLite database.
+
+The schema version lives in ``PRAGMA user_version`` so an up-to-date database
+is recognised with a single header read. Every applied step is also recorded
+in the ``schema_version`` table for diagnostics. Migrations are append-only:
+never edit a released step, add a new one with the next number instead.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+def ensure_columns(conn: sqlite3.Connection, table_name: str, columns: dict[str, str | None]) -> None:
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})").fetchall()}
+    for column_name, column_sql in columns.items():
+        if column_name not in existing and column_sql is not None:
+            conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_sql}")
+
+
+# ---------------------------------------------------------------------------
+# Migrations
+# ---------------------------------------------------------------------------
+# Steps 1-3 are the pre-versioning baseline. They stay idempotent (IF NOT
+# EXISTS + column probing) because databases created before versioning report
+# user_version 0 and may be missing columns added over time.
+
+
+def _m001_memory_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS memories (
+            id TEXT PRIMARY KEY,
+            ts TEXT,
+            type TEXT,
+            tags TEXT,
+            source TEXT,
+            content TEXT,
+            importance INTEGER,
+            confidence REAL
+        )
+        """
+    )
+    ensure_columns(conn, "memories", {"sensitivity": "TEXT DEFAULT 'internal'"})
+
+
+def _m002_finance_tables(conn: sqlite3.Connection) -> None:
+    # -- Finance domain: Accounts ----------------------------------------
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_accounts (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            account_type TEXT NOT NULL,
+            currency TEXT NOT NULL DEFAULT 'USD',
+            institution TEXT,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+    ensure_columns(conn, "finance_accounts", {
+        "currency": "TEXT NOT NULL DEFAULT 'USD'",
+        "updated_at": "TEXT NOT NULL DEFAULT ''",
+    })
+
+    # -- Finance domain: Categories --------------------------------------
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_categories (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            type TEXT NOT NULL DEFAULT 'expense',
+            parent_category TEXT,
+            is_system INTEGER NOT NULL DEFAULT 0,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+    ensure_columns(conn, "finance_categories", {
+        "id": None,  # PK exists
+        "type": "TEXT NOT NULL DEFAULT 'expense'",
+        "parent_category": "TEXT",
+        "is_system": "INTEGER NOT NULL DEFAULT 0",
+        "is_active": "INTEGER NOT NULL DEFAULT 1",
+    })
+
+    # -- Finance domain: Transactions ------------------------------------
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS transactions (
+            id TEXT PRIMARY KEY,
+            ts TEXT,
+            amount_cents INTEGER NOT NULL,
+            currency TEXT NOT NULL DEFAULT 'USD',
+            merchant TEXT,
+            transaction_date TEXT,
+            category_id TEXT,
+            account_id TEXT,
+            direction TEXT NOT NULL DEFAULT 'expense',
+            payment_method TEXT,
+            notes TEXT,
+            source TEXT,
+            tags TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        )
+        """
+    )
+    ensure_columns(conn, "transactions", {
+        "transaction_date": "TEXT",
+        "account_id": "TEXT",
+        "direction": "TEXT NOT NULL DEFAULT 'expense'",
+        "payment_method": "TEXT",
+        "notes": "TEXT",
+        "tags": "TEXT",
+        "category_id": "TEXT",
+        "created_at": "TEXT",
+        "updated_at": "TEXT",
+    })
+
+    # -- Finance domain: Budgets -----------------------------------------
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_budgets (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            category_id TEXT,
+            account_id TEXT,
+            amount_limit_cents INTEGER NOT NULL,
+            currency TEXT NOT NULL DEFAULT 'USD',
+            period TEXT NOT NULL DEFAULT 'monthly',
+            warning_threshold_percent INTEGER NOT NULL DEFAULT 80,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+    ensure_columns(conn, "finance_budgets", {
+        "name": "TEXT NOT NULL DEFAULT ''",
+        "category_id": "TEXT",
+        "account_id": "TEXT",
+        "amount_limit_cents": "INTEGER NOT NULL DEFAULT 0",
+        "currency": "TEXT NOT NULL DEFAULT 'USD'",
+        "period": "TEXT NOT NULL DEFAULT 'monthly'",
+        "warning_threshold_percent": "INTEGER NOT NULL DEFAULT 80",
+        "is_active": "INTEGER NOT NULL DEFAULT 1",
+        "created_at": "TEXT NOT NULL DEFAULT ''",
+    })
+
+    # -- Finance domain: Bills / Obligations -----------------------------
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_bills (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            amount_expected_cents INTEGER,
+            currency TEXT NOT NULL DEFAULT 'USD',
+            due_date TEXT NOT NULL,
+            recurrence_rule TEXT,
+            category_id TEXT,
+            account_id TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            auto_reminder INTEGER NOT NULL DEFAULT 1,
+            notes TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+
+    # -- Finance domain: Savings Goals -----------------------------------
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_savings_goals (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            target_amount_cents INTEGER NOT NULL,
+            currency TEXT NOT NULL DEFAULT 'USD',
+            target_date TEXT,
+            linked_account_id TEXT,
+            current_progress_cents INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'active',
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+    ensure_columns(conn, "finance_savings_goals", {
+        "target_amount_cents": "INTEGER NOT NULL DEFAULT 0",
+        "currency": "TEXT NOT NULL DEFAULT 'USD'",
+        "linked_account_id": "TEXT",
+        "current_progress_cents": "INTEGER NOT NULL DEFAULT 0",
+        "status": "TEXT NOT NULL DEFAULT 'active'",
+        "created_at": "TEXT NOT NULL DEFAULT ''",
+    })
+
+    # -- Finance domain: Alerts ------------------------------------------
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_alerts (
+            id TEXT PRIMARY KEY,
+            type TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            title TEXT NOT NULL,
+            message TEXT NOT NULL,
+            source_rule TEXT NOT NULL,
+            related_entity_type TEXT,
+            related_entity_id TEXT,
+            created_at TEXT NOT NULL,
+            resolved_at TEXT,
+            status TEXT NOT NULL DEFAULT 'active'
+        )
+        """
+    )
+    ensure_columns(conn, "finance_alerts", {
+        "type": "TEXT NOT NULL DEFAULT ''",
+        "source_rule": "TEXT NOT NULL DEFAULT ''",
+        "related_entity_type": "TEXT",
+        "related_entity_id": "TEXT",
+        "resolved_at": "TEXT",
+        "status": "TEXT NOT NULL DEFAULT 'active'",
+    })
+
+    # -- Finance domain: Behavior Logs -----------------------------------
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_behavior_logs (
+            id TEXT PRIMARY KEY,
+            behavior_type TEXT NOT NULL,
+            score REAL NOT NULL,
+            details TEXT,
+            ts TEXT NOT NULL
+        )
+        """
+    )
+
+    # -- Finance domain: Rules -------------------------------------------
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_rules (
+            id TEXT PRIMARY KEY,
+            rule_key TEXT NOT NULL UNIQUE,
+            threshold_value REAL NOT NULL,
+            enabled INTEGER NOT NULL DEFAULT 1,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+
+    # -- Legacy tables kept for backward compatibility -------------------
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_cards (
+            id TEXT PRIMARY KEY,
+            account_id TEXT,
+            name TEXT NOT NULL,
+            credit_limit_cents INTEGER NOT NULL,
+            current_balance_cents INTEGER NOT NULL DEFAULT 0,
+            minimum_payment_cents INTEGER NOT NULL DEFAULT 0,
+            due_day INTEGER NOT NULL,
+            statement_day INTEGER NOT NULL,
+            autopay_enabled INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_budget_categories (
+            id TEXT PRIMARY KEY,
+            budget_id TEXT NOT NULL,
+            category TEXT NOT NULL,
+            limit_cents INTEGER NOT NULL,
+            warning_percent INTEGER NOT NULL DEFAULT 80
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_savings_contributions (
+            id TEXT PRIMARY KEY,
+            goal_id TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            ts TEXT NOT NULL,
+            source TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_holdings (
+            id TEXT PRIMARY KEY,
+            symbol TEXT NOT NULL,
+            asset_type TEXT NOT NULL,
+            quantity REAL NOT NULL,
+            cost_basis_cents INTEGER NOT NULL,
+            market_value_cents INTEGER NOT NULL,
+            volatility_score REAL NOT NULL DEFAULT 0,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_watchlist (
+            id TEXT PRIMARY KEY,
+            symbol TEXT NOT NULL,
+            thesis TEXT,
+            review_by TEXT,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_recurring_expenses (
+            id TEXT PRIMARY KEY,
+            merchant TEXT NOT NULL,
+            expected_amount_cents INTEGER NOT NULL,
+            cadence_days INTEGER NOT NULL,
+            last_seen_ts TEXT NOT NULL,
+            is_active INTEGER NOT NULL DEFAULT 1
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_reminders (
+            id TEXT PRIMARY KEY,
+            reminder_type TEXT NOT NULL,
+            entity_id TEXT,
+            due_ts TEXT NOT NULL,
+            message TEXT NOT NULL,
+            acked INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+
+
+def _m003_bootstrap_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS bootstrap_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            bootstrapped INTEGER NOT NULL,
+            admin_username TEXT NOT NULL,
+            admin_password_hash TEXT NOT NULL,
+            jwt_secret TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+
+
+# Managed secondary indexes, one entry per hot query shape. Keep names stable:
+# the EXPLAIN QUERY PLAN regression tests assert on them.
+QUERY_INDEXES: tuple[tuple[str, str], ...] = (
+    # list_transactions: default ordering and each supported filter. Filter
+    # indexes carry the full sort key so no temp B-tree is needed for ORDER BY.
+    ("idx_transactions_date_updated_id", "transactions (transaction_date, updated_at, id)"),
+    ("idx_transactions_account_date", "transactions (account_id, transaction_date, updated_at, id)"),
+    ("idx_transactions_category_date", "transactions (category_id, transaction_date, updated_at, id)"),
+    ("idx_transactions_merchant_date", "transactions (merchant, transaction_date, updated_at, id)"),
+    ("idx_transactions_direction_date", "transactions (direction, transaction_date, updated_at, id)"),
+    # Covering index for date-range aggregation (summaries never touch the table).
+    (
+        "idx_transactions_date_summary",
+        "transactions (transaction_date, direction, category_id, account_id, merchant, currency, amount_cents)",
+    ),
+    # Legacy store ordering.
+    ("idx_transactions_ts", "transactions (ts)"),
+    # Category lookups: exact name (ensure_category) and case-insensitive filter.
+    ("idx_finance_categories_name", "finance_categories (name)"),
+    ("idx_finance_categories_lower_name", "finance_categories (LOWER(name))"),
+    ("idx_finance_alerts_created", "finance_alerts (created_at)"),
+    ("idx_finance_alerts_status_created", "finance_alerts (status, created_at)"),
+    ("idx_finance_behavior_logs_ts", "finance_behavior_logs (ts)"),
+    ("idx_finance_bills_due_date", "finance_bills (due_date)"),
+    ("idx_memories_ts", "memories (ts)"),
+)
+
+
+def _m004_query_indexes(conn: sqlite3.Connection) -> None:
+    for name, target in QUERY_INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+_ROLLUP_ADD_NEW = """
+    INSERT INTO finance_daily_rollups (
+        day, account_id, category_id, direction, currency, tx_count, amount_cents, abs_amount_cents
+    ) VALUES (
+        NEW.transaction_date, COALESCE(NEW.account_id, ''), COALESCE(NEW.category_id, ''),
+        NEW.direction, NEW.currency, 1, NEW.amount_cents, ABS(NEW.amount_cents)
+    )
+    ON CONFLICT (day, account_id, category_id, direction, currency) DO UPDATE SET
+        tx_count = tx_count + 1,
+        amount_cents = amount_cents + excluded.amount_cents,
+        abs_amount_cents = abs_amount_cents + excluded.abs_amount_cents;
+"""
+
+
+def _m005_daily_rollups(conn: sqlite3.Connection) -> None:
+    # Per-day aggregates of the ledger, kept current by triggers so every
+    # writer (repository, legacy store, bulk import) updates them inside its
+    # own transaction. NULL account/category ids are stored as '' so they
+    # take part in the primary key.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_daily_rollups (
+            day TEXT NOT NULL,
+            account_id TEXT NOT NULL DEFAULT '',
+            category_id TEXT NOT NULL DEFAULT '',
+            direction TEXT NOT NULL,
+            currency TEXT NOT NULL,
+            tx_count INTEGER NOT NULL DEFAULT 0,
+            amount_cents INTEGER NOT NULL DEFAULT 0,
+            abs_amount_cents INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, account_id, category_id, direction, currency)
+        ) WITHOUT ROWID
+        """
+    )
+    add_new = _ROLLUP_ADD_NEW
+    old_key = """
+        day = OLD.transaction_date AND account_id = COALESCE(OLD.account_id, '')
+        AND category_id = COALESCE(OLD.category_id, '') AND direction = OLD.direction
+        AND currency = OLD.currency
+    """
+    remove_old = f"""
+        UPDATE finance_daily_rollups SET
+            tx_count = tx_count - 1,
+            amount_cents = amount_cents - OLD.amount_cents,
+            abs_amount_cents = abs_amount_cents - ABS(OLD.amount_cents)
+        WHERE {old_key};
+        DELETE FROM finance_daily_rollups WHERE {old_key} AND tx_count <= 0;
+    """
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_insert
+        AFTER INSERT ON transactions WHEN NEW.transaction_date IS NOT NULL
+        BEGIN {add_new} END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_delete
+        AFTER DELETE ON transactions WHEN OLD.transaction_date IS NOT NULL
+        BEGIN {remove_old} END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_update_old
+        AFTER UPDATE OF transaction_date, account_id, category_id, direction, currency, amount_cents
+        ON transactions WHEN OLD.transaction_date IS NOT NULL
+        BEGIN {remove_old} END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_update_new
+        AFTER UPDATE OF transaction_date, account_id, category_id, direction, currency, amount_cents
+        ON transactions WHEN NEW.transaction_date IS NOT NULL
+        BEGIN {add_new} END
+        """
+    )
+    conn.execute("DELETE FROM finance_daily_rollups")
+    conn.execute(
+        """
+        INSERT INTO finance_daily_rollups (
+            day, account_id, category_id, direction, currency, tx_count, amount_cents, abs_amount_cents
+        )
+        SELECT transaction_date, COALESCE(account_id, ''), COALESCE(category_id, ''), direction, currency,
+               COUNT(*), SUM(amount_cents), SUM(ABS(amount_cents))
+        FROM transactions
+        WHERE transaction_date IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+        """
+    )
+
+
+def _m006_memory_fts(conn: sqlite3.Connection) -> None:
+    # External-content FTS5 index over memories.content, kept in sync by
+    # triggers. FTS rows are keyed by memories.rowid; anything that may
+    # renumber rowids (a full VACUUM) must be followed by a 'rebuild'.
+    # Builds without FTS5 skip this step and search falls back to LIKE.
+    try:
+        conn.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+                content,
+                content='memories',
+                content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+    except sqlite3.OperationalError as exc:
+        if "fts5" not in str(exc).lower():
+            raise
+        return
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_memories_fts_insert AFTER INSERT ON memories BEGIN
+            INSERT INTO memories_fts (rowid, content) VALUES (NEW.rowid, NEW.content);
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_memories_fts_delete AFTER DELETE ON memories BEGIN
+            INSERT INTO memories_fts (memories_fts, rowid, content) VALUES ('delete', OLD.rowid, OLD.content);
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_memories_fts_update AFTER UPDATE OF content ON memories BEGIN
+            INSERT INTO memories_fts (memories_fts, rowid, content) VALUES ('delete', OLD.rowid, OLD.content);
+            INSERT INTO memories_fts (rowid, content) VALUES (NEW.rowid, NEW.content);
+        END
+        """
+    )
+    conn.execute("INSERT INTO memories_fts (memories_fts) VALUES ('rebuild')")
+
+
+def _m007_memory_tags(conn: sqlite3.Connection) -> None:
+    # Normalized copy of memories.tags (which stays the canonical, ordered
+    # JSON list). NOCASE keeps the case-insensitive matching of the old LIKE
+    # filter. Triggers only understand JSON tag lists, which is all the
+    # service writes; legacy comma-separated values are handled by the
+    # backfill below.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS memory_tags (
+            memory_id TEXT NOT NULL,
+            tag TEXT NOT NULL COLLATE NOCASE,
+            PRIMARY KEY (memory_id, tag)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_tags_tag ON memory_tags (tag, memory_id)")
+    insert_new = """
+        INSERT OR IGNORE INTO memory_tags (memory_id, tag)
+        SELECT NEW.id, TRIM(value)
+        FROM json_each(CASE WHEN json_valid(NEW.tags) THEN NEW.tags ELSE '[]' END)
+        WHERE type = 'text' AND TRIM(value) != '';
+    """
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_memories_tags_insert AFTER INSERT ON memories BEGIN {insert_new} END"
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_memories_tags_delete AFTER DELETE ON memories BEGIN
+            DELETE FROM memory_tags WHERE memory_id = OLD.id;
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_memories_tags_update AFTER UPDATE OF id, tags ON memories BEGIN
+            DELETE FROM memory_tags WHERE memory_id = OLD.id;
+            {insert_new}
+        END
+        """
+    )
+    conn.execute("DELETE FROM memory_tags")
+    rows = conn.execute("SELECT id, tags FROM memories WHERE tags IS NOT NULL AND tags != '' AND tags != '[]'")
+    pairs: list[tuple[str, str]] = []
+    for memory_id, tags_raw in rows.fetchall():
+        try:
+            tags = json.loads(tags_raw)
+        except json.JSONDecodeError:
+            tags = tags_raw.split(",")
+        if not isinstance(tags, list):
+            continue
+        pairs.extend((memory_id, str(tag).strip()) for tag in tags if str(tag).strip())
+    conn.executemany("INSERT OR IGNORE INTO memory_tags (memory_id, tag) VALUES (?, ?)", pairs)
+
+
+def _m008_memory_sensitivity_rank(conn: sqlite3.Connection) -> None:
+    # Numeric form of memories.sensitivity (core.memory.policy.SENSITIVITY_RANK)
+    # so visibility filtering happens in SQL, before LIMIT.
+    ensure_columns(conn, "memories", {"sensitivity_rank": "INTEGER NOT NULL DEFAULT 1"})
+    conn.execute(
+        """
+        UPDATE memories SET sensitivity_rank = CASE LOWER(COALESCE(sensitivity, 'internal'))
+            WHEN 'public' THEN 0
+            WHEN 'internal' THEN 1
+            WHEN 'sensitive' THEN 2
+            WHEN 'critical' THEN 3
+            ELSE 1
+        END
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_memories_rank_ts ON memories (sensitivity_rank, ts)")
+
+
+def _m009_memory_vectors(conn: sqlite3.Connection) -> None:
+    # Slot of each memory's row in the on-disk vector file (core.memory.vectors).
+    # Vectors are embedded lazily by VectorIndex.sync, not here.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS memory_vectors (
+            memory_id TEXT PRIMARY KEY,
+            slot INTEGER NOT NULL UNIQUE
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_memories_vectors_delete AFTER DELETE ON memories BEGIN
+            DELETE FROM memory_vectors WHERE memory_id = OLD.id;
+        END
+        """
+    )
+
+
+# Keyset pagination sorts every listing by a unique key ending in ``id``; these
+# replace the single-column ordering indexes from migration 4 so a cursor seek
+# is one index range scan and ties never need a temp B-tree.
+KEYSET_INDEXES: tuple[tuple[str, str, str], ...] = (
+    ("idx_memories_ts_id", "memories (ts, id)", "idx_memories_ts"),
+    ("idx_finance_alerts_created_id", "finance_alerts (created_at, id)", "idx_finance_alerts_created"),
+    (
+        "idx_finance_alerts_status_created_id",
+        "finance_alerts (status, created_at, id)",
+        "idx_finance_alerts_status_created",
+    ),
+    ("idx_finance_behavior_logs_ts_id", "finance_behavior_logs (ts, id)", "idx_finance_behavior_logs_ts"),
+)
+
+
+def _m010_keyset_indexes(conn: sqlite3.Connection) -> None:
+    # Row-value cursor comparisons skip NULL keys, so give legacy rows values.
+    conn.execute("UPDATE memories SET ts = '' WHERE ts IS NULL")
+    conn.execute(
+        """
+        UPDATE transactions SET
+            transaction_date = COALESCE(transaction_date, SUBSTR(ts, 1, 10), ''),
+            updated_at = COALESCE(updated_at, created_at, ts, '')
+        WHERE transaction_date IS NULL OR updated_at IS NULL
+        """
+    )
+    for name, target, superseded in KEYSET_INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+        conn.execute(f"DROP INDEX IF EXISTS {superseded}")
+
+
+def _m011_rollup_bulk_pause(conn: sqlite3.Connection) -> None:
+    # Bulk importers insert a row here inside their write transaction, apply
+    # pre-aggregated rollup deltas per batch themselves, and delete the row
+    # before committing, so the per-row insert trigger is skipped without
+    # ever being visible as paused to another connection.
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS finance_rollup_pause (id INTEGER PRIMARY KEY CHECK (id = 1))"
+    )
+    conn.execute("DROP TRIGGER IF EXISTS trg_transactions_rollup_insert")
+    conn.execute(
+        f"""
+        CREATE TRIGGER trg_transactions_rollup_insert
+        AFTER INSERT ON transactions
+        WHEN NEW.transaction_date IS NOT NULL AND NOT EXISTS (SELECT 1 FROM finance_rollup_pause)
+        BEGIN {_ROLLUP_ADD_NEW} END
+        """
+    )
+
+
+def _m012_memory_content_hash(conn: sqlite3.Connection) -> None:
+    # Hash of the normalised content (core.memory.store.content_hash) so
+    # repeated writes upsert onto one row. Existing rows keep a NULL hash,
+    # which never conflicts in a UNIQUE index, until the one-shot compaction
+    # (python -m core.memory.compaction) merges duplicates and hashes them.
+    ensure_columns(conn, "memories", {"content_hash": "TEXT"})
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_memories_content_hash ON memories (content_hash, type, source)"
+    )
+
+
+# Smoothing factor of the per-merchant/per-category spending EWMA. It is baked
+# into the baseline triggers, so changing it needs a new migration.
+SPENDING_BASELINE_ALPHA = 0.2
+
+_BASELINE_SCOPES = {
+    # scope: (key expression over {row}, extra condition)
+    "merchant": ("LOWER(TRIM({row}.merchant))", "TRIM(COALESCE({row}.merchant, '')) != ''"),
+    "category": ("COALESCE(NULLIF({row}.category_id, ''), 'uncategorized')", "1"),
+}
+_BASELINE_EXPENSE = "({row}.direction = 'expense' OR ({row}.direction != 'income' AND {row}.amount_cents < 0))"
+
+
+def _baseline_add(row: str) -> str:
+    # Welford update: delta = x - mean, mean += delta / n', m2 += delta^2 * n / n'.
+    statements = []
+    for scope, (key, condition) in _BASELINE_SCOPES.items():
+        statements.append(
+            f"""
+            INSERT INTO finance_spending_baselines (scope, key, n, mean, m2, ewma, last_date)
+            SELECT '{scope}', {key.format(row=row)}, 1, ABS({row}.amount_cents) * 1.0, 0.0,
+                   ABS({row}.amount_cents) * 1.0, {row}.transaction_date
+            WHERE {_BASELINE_EXPENSE.format(row=row)} AND {condition.format(row=row)}
+            ON CONFLICT (scope, key) DO UPDATE SET
+                n = n + 1,
+                mean = mean + (excluded.mean - mean) / (n + 1),
+                m2 = m2 + (excluded.mean - mean) * (excluded.mean - mean) * n / (n + 1),
+                ewma = ewma + {SPENDING_BASELINE_ALPHA} * (excluded.mean - ewma),
+                last_date = MAX(COALESCE(last_date, ''), COALESCE(excluded.last_date, ''));
+            """
+        )
+    return "".join(statements)
+
+
+def _baseline_remove(row: str) -> str:
+    # Welford in reverse. The EWMA cannot forget a single sample and is left as is.
+    statements = []
+    for scope, (key, condition) in _BASELINE_SCOPES.items():
+        match = f"scope = '{scope}' AND key = {key.format(row=row)}"
+        x = f"(ABS({row}.amount_cents) * 1.0)"
+        statements.append(
+            f"""
+            UPDATE finance_spending_baselines SET
+                n = n - 1,
+                mean = CASE WHEN n > 1 THEN (mean * n - {x}) / (n - 1) ELSE 0.0 END,
+                m2 = CASE WHEN n > 1 THEN MAX(0.0, m2 - ({x} - mean) * ({x} - mean) * n / (n - 1)) ELSE 0.0 END
+            WHERE {match} AND {_BASELINE_EXPENSE.format(row=row)} AND {condition.format(row=row)};
+            DELETE FROM finance_spending_baselines WHERE {match} AND n <= 0;
+            """
+        )
+    return "".join(statements)
+
+
+def _m013_spending_baselines(conn: sqlite3.Connection) -> None:
+    # Running mean/variance (Welford) and EWMA of expense amounts per merchant
+    # and per category, maintained by triggers like finance_daily_rollups so
+    # anomaly scoring is one primary-key lookup per transaction. Bulk imports
+    # pause the insert trigger together with the rollup trigger and merge
+    # per-batch statistics themselves (FinanceRepository).
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS finance_spending_baselines (
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            n INTEGER NOT NULL DEFAULT 0,
+            mean REAL NOT NULL DEFAULT 0,
+            m2 REAL NOT NULL DEFAULT 0,
+            ewma REAL NOT NULL DEFAULT 0,
+            last_date TEXT,
+            PRIMARY KEY (scope, key)
+        ) WITHOUT ROWID
+        """
+    )
+    columns = "amount_cents, merchant, category_id, direction"
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_baseline_insert
+        AFTER INSERT ON transactions WHEN NOT EXISTS (SELECT 1 FROM finance_rollup_pause)
+        BEGIN {_baseline_add('NEW')} END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_baseline_delete
+        AFTER DELETE ON transactions
+        BEGIN {_baseline_remove('OLD')} END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_baseline_update_old
+        AFTER UPDATE OF {columns} ON transactions
+        BEGIN {_baseline_remove('OLD')} END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_baseline_update_new
+        AFTER UPDATE OF {columns} ON transactions
+        BEGIN {_baseline_add('NEW')} END
+        """
+    )
+    # Exact two-pass mean/M2 per key in one scan; the EWMA of existing history
+    # starts at its mean and follows new transactions from here on.
+    samples = " UNION ALL ".join(
+        f"""
+        SELECT '{scope}' AS scope, {key.format(row='t')} AS key,
+               ABS(t.amount_cents) * 1.0 AS x, t.transaction_date AS day
+        FROM transactions AS t
+        WHERE {_BASELINE_EXPENSE.format(row='t')} AND {condition.format(row='t')}
+        """
+        for scope, (key, condition) in _BASELINE_SCOPES.items()
+    )
+    conn.execute("DELETE FROM finance_spending_baselines")
+    conn.execute(
+        f"""
+        INSERT INTO finance_spending_baselines (scope, key, n, mean, m2, ewma, last_date)
+        SELECT scope, key, COUNT(*), MAX(mean), SUM((x - mean) * (x - mean)), MAX(mean), MAX(day)
+        FROM (SELECT scope, key, x, day, AVG(x) OVER (PARTITION BY scope, key) AS mean FROM ({samples}))
+        GROUP BY scope, key
+        """
+    )
+
+
+_RECURRING_MERCHANT_KEY = "LOWER(TRIM({row}.merchant))"
+
+
+def _recurring_mark(row: str) -> str:
+    return f"""
+        INSERT OR IGNORE INTO finance_recurring_dirty (merchant_key)
+        SELECT {_RECURRING_MERCHANT_KEY.format(row=row)}
+        WHERE {_BASELINE_EXPENSE.format(row=row)} AND TRIM(COALESCE({row}.merchant, '')) != '';
+    """
+
+
+def _m014_recurring_cadence(conn: sqlite3.Connection) -> None:
+    # Cadence-aware recurring expenses, one row per normalised merchant.
+    # Ledger triggers queue the merchants whose history changed; the next
+    # FinanceService.detect_recurring_expenses re-classifies only those.
+    ensure_columns(conn, "finance_recurring_expenses", {
+        "cadence": "TEXT",
+        "occurrences": "INTEGER NOT NULL DEFAULT 0",
+        "next_expected_date": "TEXT",
+        "confidence": "REAL NOT NULL DEFAULT 0",
+        "updated_at": "TEXT",
+    })
+    conn.execute(
+        """
+        DELETE FROM finance_recurring_expenses WHERE rowid NOT IN (
+            SELECT MAX(rowid) FROM finance_recurring_expenses GROUP BY merchant
+        )
+        """
+    )
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_finance_recurring_merchant ON finance_recurring_expenses (merchant)"
+    )
+    # One merchant's charges in date order straight from the index.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transactions_merchant_key_date "
+        "ON transactions (LOWER(TRIM(merchant)), transaction_date)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS finance_recurring_dirty (merchant_key TEXT PRIMARY KEY) WITHOUT ROWID"
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_recurring_insert
+        AFTER INSERT ON transactions WHEN NOT EXISTS (SELECT 1 FROM finance_rollup_pause)
+        BEGIN {_recurring_mark('NEW')} END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_recurring_delete
+        AFTER DELETE ON transactions
+        BEGIN {_recurring_mark('OLD')} END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_transactions_recurring_update
+        AFTER UPDATE OF amount_cents, merchant, transaction_date, direction ON transactions
+        BEGIN {_recurring_mark('OLD')} {_recurring_mark('NEW')} END
+        """
+    )
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO finance_recurring_dirty (merchant_key)
+        SELECT DISTINCT {_RECURRING_MERCHANT_KEY.format(row='t')} FROM transactions AS t
+        WHERE {_BASELINE_EXPENSE.format(row='t')} AND TRIM(COALESCE(t.merchant, '')) != ''
+        """
+    )
+
+
+# Alerts raised by rule evaluation are deduplicated per
+# (source_rule, related entity, period); the repository computes the same key.
+ALERT_FINGERPRINT_SEPARATOR = "\x1f"
+
+
+def _m015_alert_fingerprints(conn: sqlite3.Connection) -> None:
+    ensure_columns(conn, "finance_alerts", {
+        "fingerprint": "TEXT",
+        "period": "TEXT",
+        "occurrences": "INTEGER NOT NULL DEFAULT 1",
+        "last_seen_at": "TEXT",
+    })
+    conn.execute(
+        """
+        UPDATE finance_alerts SET
+            period = SUBSTR(created_at, 1, 7),
+            fingerprint = source_rule || CHAR(31) || COALESCE(related_entity_type, '') || CHAR(31)
+                || COALESCE(related_entity_id, '') || CHAR(31) || SUBSTR(created_at, 1, 7),
+            last_seen_at = created_at
+        WHERE fingerprint IS NULL
+        """
+    )
+    # Collapse earlier duplicates into the newest row, first raised -> last seen.
+    conn.execute(
+        """
+        UPDATE finance_alerts SET
+            occurrences = dup.n, created_at = dup.first_seen, last_seen_at = dup.last_seen
+        FROM (
+            SELECT MAX(rowid) AS keep, COUNT(*) AS n,
+                   MIN(created_at) AS first_seen, MAX(created_at) AS last_seen
+            FROM finance_alerts GROUP BY fingerprint HAVING COUNT(*) > 1
+        ) AS dup
+        WHERE finance_alerts.rowid = dup.keep
+        """
+    )
+    conn.execute(
+        """
+        DELETE FROM finance_alerts WHERE rowid NOT IN (
+            SELECT MAX(rowid) FROM finance_alerts GROUP BY fingerprint
+        )
+        """
+    )
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_finance_alerts_fingerprint ON finance_alerts (fingerprint)"
+    )
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "memory_tables", _m001_memory_tables),
+    Migration(2, "finance_tables", _m002_finance_tables),
+    Migration(3, "bootstrap_tables", _m003_bootstrap_tables),
+    Migration(4, "query_indexes", _m004_query_indexes),
+    Migration(5, "daily_rollups", _m005_daily_rollups),
+    Migration(6, "memory_fts", _m006_memory_fts),
+    Migration(7, "memory_tags", _m007_memory_tags),
+    Migration(8, "memory_sensitivity_rank", _m008_memory_sensitivity_rank),
+    Migration(9, "memory_vectors", _m009_memory_vectors),
+    Migration(10, "keyset_indexes", _m010_keyset_indexes),
+    Migration(11, "rollup_bulk_pause", _m011_rollup_bulk_pause),
+    Migration(12, "memory_content_hash", _m012_memory_content_hash),
+    Migration(13, "spending_baselines", _m013_spending_baselines),
+    Migration(14, "recurring_cadence", _m014_recurring_cadence),
+    Migration(15, "alert_fingerprints", _m015_alert_fingerprints),
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrate(conn: sqlite3.Connection) -> list[int]:
+    """Apply pending migrations and return the versions that were applied.
+
+    The fast path is a single ``PRAGMA user_version`` read. Pending steps run
+    inside one ``BEGIN IMMEDIATE`` transaction so concurrent processes
+    serialise on the write lock and re-check the version once they hold it.
+    """
+    if get_schema_version(conn) >= LATEST_VERSION:
+        return []
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = get_schema_version(conn)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TEXT NOT NULL
+            )
+            """
+        )
+        applied: list[int] = []
+        for migration in MIGRATIONS:
+            if migration.version <= current:
+                continue
+            migration.apply(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.name, datetime.now(timezone.utc).isoformat()),
+            )
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            applied.append(migration.version)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return applied
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence, TypeVar
+
+from core.errors import VictusError
+
+T = TypeVar("T")
+
+
+@dataclass
+class InvalidCursorError(VictusError):
+    safe_message: str = "The pagination cursor is invalid."
+    code: str = "invalid_cursor"
+
+
+def encode_cursor(kind: str, key: Sequence[Any]) -> str:
+    """Opaque token for the sort key of the last row on a page.
+
+    ``kind`` names the listing the cursor belongs to, so a cursor from one
+    endpoint is rejected by another instead of silently mis-paging.
+    """
+    raw = json.dumps([kind, *key], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(kind: str, token: str | None, arity: int) -> tuple[Any, ...] | None:
+    """Sort key encoded by :func:`encode_cursor`, or ``None`` for the first page."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError) as exc:
+        raise InvalidCursorError(message=f"Malformed cursor: {token!r}") from exc
+    if not isinstance(payload, list) or len(payload) != arity + 1 or payload[0] != kind:
+        raise InvalidCursorError(message=f"Cursor does not belong to '{kind}'")
+    if not all(isinstance(value, (str, int, float)) for value in payload[1:]):
+        raise InvalidCursorError(message="Cursor key has unsupported values")
+    return tuple(payload[1:])
+
+
+def split_page(
+    rows: Sequence[T],
+    limit: int,
+    kind: str,
+    key: Callable[[T], Sequence[Any]],
+) -> tuple[list[T], str | None]:
+    """Trim a ``limit + 1`` fetch to one page and build the next cursor.
+
+    Fetching one extra row tells whether another page exists without a
+    separate ``COUNT(*)``.
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(kind, key(page[-1]))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.config import StorageConfig, get_storage_config
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    connections_opened: int
+    connections_open: int
+    checkouts: int
+    reuses: int
+    databases: tuple[str, ...]
+
+
+class PooledConnection(sqlite3.Connection):
+    """A long-lived, per-thread connection owned by :class:`SQLiteConnectionPool`.
+
+    ``close()`` does not close the underlying handle; it only discards any
+    uncommitted work so callers written against short-lived connections
+    (``conn = get_connection(); ...; conn.close()``) keep their semantics.
+    """
+
+    def close(self) -> None:
+        if self.in_transaction:
+            self.rollback()
+
+    def shutdown(self) -> None:
+        super().close()
+
+
+class SQLiteConnectionPool:
+    """Hands out one configured connection per (thread, database path).
+
+    Connections are opened once, tuned with PRAGMAs, and reused by every
+    subsequent ``checkout`` on the same thread. Threads never share a
+    connection, so no cross-thread locking is needed around queries.
+    """
+
+    def __init__(self, config: StorageConfig | None = None) -> None:
+        self._config = config
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: weakref.WeakSet[PooledConnection] = weakref.WeakSet()
+        self._databases: set[str] = set()
+        self._opened = 0
+        self._checkouts = 0
+        self._reuses = 0
+
+    def checkout(self, db_path: Path) -> PooledConnection:
+        key = str(db_path)
+        connections: dict[str, PooledConnection] | None = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = {}
+            self._local.connections = connections
+        conn = connections.get(key)
+        with self._lock:
+            self._checkouts += 1
+            if conn is not None:
+                self._reuses += 1
+        if conn is not None:
+            return conn
+        conn = self._open(key)
+        connections[key] = conn
+        return conn
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                connections_opened=self._opened,
+                connections_open=len(self._connections),
+                checkouts=self._checkouts,
+                reuses=self._reuses,
+                databases=tuple(sorted(self._databases)),
+            )
+
+    def close_all(self) -> None:
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+            self._databases.clear()
+        for conn in connections:
+            try:
+                conn.shutdown()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def _open(self, key: str) -> PooledConnection:
+        config = self._config or get_storage_config()
+        conn = sqlite3.connect(
+            key,
+            timeout=config.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            factory=PooledConnection,
+        )
+        conn.row_factory = sqlite3.Row
+        _configure(conn, config)
+        with self._lock:
+            self._opened += 1
+            self._connections.add(conn)
+            self._databases.add(key)
+        return conn
+
+
+def _configure(conn: sqlite3.Connection, config: StorageConfig) -> None:
+    # Only takes effect on a brand-new (empty) database; older files are
+    # converted once by the maintenance job (core.maintenance).
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    if config.wal_enabled:
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(config.busy_timeout_ms)}")
+    # Negative cache_size is interpreted by SQLite as KiB rather than pages.
+    conn.execute(f"PRAGMA cache_size=-{int(config.cache_size_kib)}")
+    conn.execute(f"PRAGMA mmap_size={int(config.mmap_size_bytes)}")
+    conn.execute("PRAGMA temp_store=MEMORY")
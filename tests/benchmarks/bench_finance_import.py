@@ -0,0 +1,78 @@
+"""Throughput of the bulk transaction import.
+
+Writes a generated CSV export of ``--rows`` rows (1M by default) to a temp
+file, streams it through ``FinanceService.import_transactions`` into a fresh
+database, optionally on top of ``--existing`` rows already in the ledger,
+and reports the wall time and rows per second. Exits non-zero when the
+import takes longer than ``--target`` seconds.
+
+    python tests/benchmarks/bench_finance_import.py [--rows 1000000] [--existing 0] [--target 60]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+_MERCHANTS = [f"Merchant {index}" for index in range(2_000)]
+_CATEGORIES = ["Groceries", "Dining Out", "Transport", "Utilities", "Rent", "Salary", "Shopping", "Health"]
+
+
+def export_lines(rows: int, seed: int) -> Iterator[str]:
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    yield "Date,Description,Amount,Category,Memo\n"
+    for index in range(rows):
+        day = start + timedelta(days=rng.randrange(2_000))
+        cents = rng.randrange(1, 500_000)
+        sign = "" if index % 17 == 0 else "-"
+        yield (
+            f"{day.isoformat()},{rng.choice(_MERCHANTS)},{sign}{cents // 100}.{cents % 100:02d},"
+            f"{rng.choice(_CATEGORIES)},row {index}\n"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--existing", type=int, default=0)
+    parser.add_argument("--target", type=float, default=60.0)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="victus-import-bench-"))
+    os.environ["VICTUS_DATA_DIR"] = str(workdir)
+    logging.disable(logging.INFO)  # one audit line per batch
+    from core.finance.service import FinanceService  # noqa: E402
+
+    export = workdir / "export.csv"
+    export.write_text("".join(export_lines(args.rows, seed=2)), encoding="utf-8")
+    service = FinanceService()
+    if args.existing:
+        service.import_transactions(export_lines(args.existing, seed=1), fmt="csv")
+
+    started = time.perf_counter()
+    with export.open(encoding="utf-8", newline="") as handle:
+        summary = service.import_transactions(handle, fmt="csv")
+    elapsed = time.perf_counter() - started
+    print(
+        f"imported {summary.imported:,} rows ({summary.skipped} skipped, {summary.batches} batches) "
+        f"on top of {args.existing:,} in {elapsed:.1f}s: {summary.imported / elapsed:,.0f} rows/s"
+    )
+    if elapsed > args.target:
+        print(f"SLOWER than the {args.target:.0f}s target")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,356 @@
+"""Parity and throughput of the compiled routing table.
+
+Replays the recorded utterance corpus through the deterministic stage of
+``route_intent`` as it was before the routing table (every per-domain parser,
+one confidence update per domain, then the router's finance-candidate and
+tool-hint scans on a miss) and as it is now
+(``core.orchestrator.deterministic._select_domain_intent`` plus
+``core.orchestrator.matcher``). Checks that both resolve every utterance the
+same way and reports utterances per second for the parsers alone and for the
+whole stage.
+
+    python tests/benchmarks/bench_intent_matcher.py [--rounds 200] [--repeat 5]
+
+Both sides run alternately ``--repeat`` times; the best run of each is
+reported, which keeps scheduler noise out of the ratio.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("VICTUS_DATA_DIR", tempfile.mkdtemp(prefix="victus-matcher-bench-"))
+
+from core.orchestrator import deterministic  # noqa: E402
+from core.orchestrator.matcher import finance_candidate, match_domain_intent, tool_domains  # noqa: E402
+from core.orchestrator.schemas import Intent  # noqa: E402
+
+CORPUS_PATH = ROOT / "tests" / "unit" / "fixtures" / "intent_corpus.json"
+
+
+# ---------------------------------------------------------------------------
+# Reference: the per-domain parsers and router scans the table replaced
+# ---------------------------------------------------------------------------
+
+def _normalize(text: str) -> str:
+    return " ".join(text.strip().split())
+
+
+def parse_memory_intent(utterance: str) -> Optional[Intent]:
+    lowered = utterance.lower().strip()
+    if lowered.startswith("remember "):
+        content = _normalize(utterance[len("remember ") :])
+        if content:
+            return Intent(action="memory.add", parameters={"content": content}, confidence=1.0)
+    if lowered.startswith("save "):
+        content = _normalize(utterance[len("save ") :])
+        if content:
+            return Intent(action="memory.add", parameters={"content": content}, confidence=1.0)
+    if lowered.startswith("what do you remember about "):
+        query = _normalize(utterance[len("what do you remember about ") :])
+        if query:
+            return Intent(action="memory.search", parameters={"query": query}, confidence=1.0)
+    if lowered.startswith("recall "):
+        query = _normalize(utterance[len("recall ") :])
+        if query:
+            return Intent(action="memory.search", parameters={"query": query}, confidence=1.0)
+    if lowered in {"list memories", "show memories"}:
+        return Intent(action="memory.list", parameters={}, confidence=1.0)
+    if lowered.startswith("forget "):
+        memory_id = _normalize(utterance[len("forget ") :])
+        if memory_id:
+            return Intent(action="memory.delete", parameters={"id": memory_id}, confidence=1.0)
+    return None
+
+
+def _extract_amount(text: str) -> Optional[float]:
+    match = re.search(r"\$?(\d+(?:\.\d{1,2})?)", text)
+    if not match:
+        return None
+    return float(match.group(1))
+
+
+def _finance_transaction_params(amount: float, *, merchant: str | None = None, category: str | None = None) -> dict[str, object]:
+    resolved_merchant = _normalize(merchant) if merchant else None
+    resolved_category = _normalize(category) if category else (resolved_merchant or "uncategorized")
+    return {
+        "amount": amount,
+        "category": resolved_category,
+        "merchant": resolved_merchant,
+        "currency": "USD",
+        "occurred_at": datetime.now(tz=timezone.utc).isoformat(),
+    }
+
+
+def _parse_category_and_merchant(text: str) -> tuple[str | None, str | None]:
+    lowered = text.strip()
+    if " at " in lowered:
+        category_part, merchant_part = lowered.split(" at ", 1)
+        return category_part.strip(), merchant_part.strip()
+    return lowered.strip(), None
+
+
+def parse_finance_intent(utterance: str) -> Optional[Intent]:
+    lowered = utterance.lower()
+
+    add_transaction_match = re.search(r"\badd\s+transaction\s+\$?(\d+(?:\.\d{1,2})?)\s+(?:for\s+)?(.+)", utterance, re.IGNORECASE)
+    if add_transaction_match:
+        amount = float(add_transaction_match.group(1))
+        merchant = add_transaction_match.group(2)
+        return Intent(action="finance.add_transaction", parameters=_finance_transaction_params(amount, merchant=merchant), confidence=1.0)
+
+    log_match = re.search(r"\blog\s+\$?(\d+(?:\.\d{1,2})?)\s+(.+)", utterance, re.IGNORECASE)
+    if log_match:
+        amount = float(log_match.group(1))
+        merchant = log_match.group(2)
+        return Intent(action="finance.add_transaction", parameters=_finance_transaction_params(amount, merchant=merchant), confidence=1.0)
+
+    spent_at_match = re.search(r"\b(?:spent|paid)\s+\$?(\d+(?:\.\d{1,2})?)\s+(?:at|for)\s+(.+)", utterance, re.IGNORECASE)
+    if spent_at_match:
+        amount = float(spent_at_match.group(1))
+        merchant = spent_at_match.group(2)
+        return Intent(action="finance.add_transaction", parameters=_finance_transaction_params(amount, merchant=merchant), confidence=1.0)
+
+    spent_paid = re.search(r"\b(spent|paid)\b", lowered)
+    if spent_paid:
+        amount = _extract_amount(lowered)
+        if amount is None:
+            return None
+        match = re.search(r"\b(spent|paid)\b.*?\$?\d+(?:\.\d{1,2})?\s*(?:dollars|bucks)?\s*(?:on|for)\s+(.+)", lowered)
+        if not match:
+            return None
+        category_raw = match.group(2)
+        category, merchant = _parse_category_and_merchant(category_raw)
+        if not category:
+            return None
+        return Intent(
+            action="finance.add_transaction",
+            parameters=_finance_transaction_params(amount, merchant=merchant, category=category),
+            confidence=1.0,
+        )
+    if "bought " in lowered and " for " in lowered:
+        match = re.search(r"\bbought\s+(.+?)\s+for\s+\$?(\d+(?:\.\d{1,2})?)", lowered)
+        if not match:
+            return None
+        category_raw = match.group(1)
+        amount = float(match.group(2))
+        category, merchant = _parse_category_and_merchant(category_raw)
+        if not category:
+            return None
+        return Intent(
+            action="finance.add_transaction",
+            parameters=_finance_transaction_params(amount, merchant=merchant, category=category),
+            confidence=1.0,
+        )
+    if lowered in {"list transactions", "show transactions"}:
+        return Intent(action="finance.list_transactions", parameters={}, confidence=1.0)
+    if ("summary" in lowered and "transaction" in lowered) or "spending summary" in lowered:
+        period = "week"
+        if "month" in lowered:
+            period = "month"
+        if "week" in lowered:
+            period = "week"
+        return Intent(action="finance.summary", parameters={"period": period}, confidence=1.0)
+    if lowered in {"finance summary", "summary"}:
+        return Intent(action="finance.summary", parameters={"period": "week"}, confidence=1.0)
+    return None
+
+
+def parse_files_intent(utterance: str) -> Optional[Intent]:
+    lowered = utterance.lower().strip()
+    if lowered == "list files":
+        return Intent(action="files.list", parameters={}, confidence=1.0)
+    if lowered.startswith("read file "):
+        path = _normalize(utterance[len("read file ") :])
+        if path:
+            return Intent(action="files.read", parameters={"path": path}, confidence=1.0)
+    if lowered.startswith("append to "):
+        payload = utterance[len("append to ") :]
+        if ":" in payload:
+            path, content = payload.split(":", 1)
+            path = _normalize(path)
+            if path:
+                return Intent(
+                    action="files.write",
+                    parameters={"path": path, "content": content.lstrip(), "mode": "append"},
+                    confidence=1.0,
+                )
+    if lowered.startswith("write to "):
+        payload = utterance[len("write to ") :]
+        if ":" in payload:
+            path, content = payload.split(":", 1)
+            path = _normalize(path)
+            if path:
+                return Intent(
+                    action="files.write",
+                    parameters={"path": path, "content": content.lstrip(), "mode": "overwrite"},
+                    confidence=1.0,
+                )
+    return None
+
+
+def parse_camera_intent(utterance: str) -> Optional[Intent]:
+    lowered = utterance.lower().strip()
+    if lowered in {"camera status", "status camera", "camera state"}:
+        return Intent(action="camera.status", parameters={}, confidence=1.0)
+    if lowered in {"capture photo", "take a picture", "take a photo"}:
+        return Intent(action="camera.capture", parameters={}, confidence=1.0)
+    if lowered in {"detect face", "detect faces", "recognize", "recognize faces"}:
+        return Intent(action="camera.recognize", parameters={}, confidence=1.0)
+    return None
+
+
+_DOMAIN_PARSERS = (
+    ("camera", parse_camera_intent),
+    ("memories", parse_memory_intent),
+    ("finance", parse_finance_intent),
+    ("files", parse_files_intent),
+)
+
+_TOOL_DOMAIN_HINTS = {
+    "memory": ("memory", "remember", "recall", "forget"),
+    "finance": ("finance", "spent", "paid", "transaction", "summary", "$"),
+    "files": ("file", "files", "read", "write", "append", "list"),
+    "camera": ("camera", "photo", "picture", "capture", "recognize", "face"),
+}
+
+
+def _tool_domains_in_text(text: str) -> list[str]:
+    lowered = text.lower()
+    matches: list[str] = []
+    for domain, hints in _TOOL_DOMAIN_HINTS.items():
+        if any(hint in lowered for hint in hints):
+            matches.append(domain)
+    return matches
+
+
+def _regex_finance_candidate(text: str) -> Intent | None:
+    patterns = (
+        re.compile(r"\b(?:i\s+)?(?:spent|paid)\s+(?P<currency>[$€£])?(?P<amount>\d+(?:\.\d{1,2})?)(?:\s*(?:dollars?|bucks))?\s+(?:at|for|on)\s+(?P<merchant>.+)$", re.IGNORECASE),
+        re.compile(r"\badd\s+transaction\s+(?P<currency>[$€£])?(?P<amount>\d+(?:\.\d{1,2})?)\s+(?:for\s+)?(?P<merchant>.+)$", re.IGNORECASE),
+    )
+    for pattern in patterns:
+        match = pattern.search(text.strip())
+        if not match:
+            continue
+        amount = float(match.group("amount"))
+        merchant = match.group("merchant").strip(" .,!?")
+        if not merchant:
+            continue
+        symbol = (match.groupdict().get("currency") or "$").strip()
+        currency = {"$": "USD", "€": "EUR", "£": "GBP"}.get(symbol, "USD")
+        return Intent(
+            action="finance.add_transaction",
+            parameters={
+                "amount": amount,
+                "merchant": merchant,
+                "category": merchant,
+                "currency": currency,
+                "occurred_at": datetime.now(tz=timezone.utc).isoformat(),
+            },
+            confidence=0.92,
+        )
+    return None
+
+
+def _legacy_select_domain_intent(utterance: str) -> Optional[Intent]:
+    store, core = deterministic._router_confidence_components()
+    best: Optional[Intent] = None
+    best_score = -1.0
+    for domain, parser in _DOMAIN_PARSERS:
+        intent = parser(utterance)
+        domain_score = 1.0 if intent is not None else 0.0
+        key = deterministic._router_domain_key(domain)
+        core.get_score(key)
+        store.update_score(key, domain_score)
+        if intent is not None and domain_score > best_score:
+            best = intent
+            best_score = domain_score
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def legacy_parsers(utterance: str):
+    results = [(domain, parser(utterance)) for domain, parser in _DOMAIN_PARSERS]
+    return next(((domain, intent) for domain, intent in results if intent is not None), None)
+
+
+def legacy_stage(utterance: str):
+    intent = _legacy_select_domain_intent(utterance)
+    if intent is not None:
+        return intent, None, None
+    text = utterance.strip()
+    candidate = _regex_finance_candidate(text)
+    return None, candidate, None if candidate is not None else _tool_domains_in_text(text)
+
+
+def compiled_stage(utterance: str):
+    intent = deterministic._select_domain_intent(utterance)
+    if intent is not None:
+        return intent, None, None
+    text = utterance.strip()
+    candidate = finance_candidate(text)
+    return None, candidate, None if candidate is not None else tool_domains(text)
+
+
+def _key(result) -> object:
+    if isinstance(result, Intent):
+        parameters = {key: value for key, value in result.parameters.items() if key != "occurred_at"}
+        return result.action, json.dumps(parameters, sort_keys=True), result.confidence
+    if isinstance(result, (tuple, list)):
+        return tuple(_key(item) for item in result)
+    return result
+
+
+def _throughput(resolve, utterances: list[str], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for utterance in utterances:
+            resolve(utterance)
+    return rounds * len(utterances) / (time.perf_counter() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    utterances = [record["utterance"] for record in json.loads(CORPUS_PATH.read_text(encoding="utf-8"))]
+    mismatches = [
+        u
+        for u in utterances
+        if _key(legacy_parsers(u)) != _key(match_domain_intent(u)) or _key(legacy_stage(u)) != _key(compiled_stage(u))
+    ]
+    for utterance in mismatches:
+        print(f"MISMATCH {utterance!r}: {_key(legacy_stage(utterance))} != {_key(compiled_stage(utterance))}")
+
+    print(f"corpus: {len(utterances)} utterances x {args.rounds} rounds, best of {args.repeat}")
+    for label, before, after in (
+        ("domain parsers", legacy_parsers, match_domain_intent),
+        ("routing stage", legacy_stage, compiled_stage),
+    ):
+        legacy = compiled = 0.0
+        for _ in range(args.repeat):
+            legacy = max(legacy, _throughput(before, utterances, args.rounds))
+            compiled = max(compiled, _throughput(after, utterances, args.rounds))
+        print(f"{label:>14}: before {legacy:,.0f}/s, routing table {compiled:,.0f}/s ({compiled / legacy:.2f}x)")
+    deterministic._router_confidence_components()[0].close()
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
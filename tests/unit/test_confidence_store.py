@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from victus.core.confidence import ConfidenceCore, ConfidenceStore, make_key
+
+
+def _store(tmp_path: Path, **kwargs) -> ConfidenceStore:
+    options = {"flush_interval_seconds": 3600.0, **kwargs}
+    return ConfidenceStore(tmp_path / "confidence" / "store.json", **options)
+
+
+def test_updates_stay_in_memory_until_flushed(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    key = make_key("router", "domain", "Finance")
+    assert key == "router:domain:finance"
+
+    store.update_score(key, 1.0)
+    store.update_score(key, 1.0)
+    store.update_score(make_key("router", "domain", "files"), 0.0)
+    assert not store.journal_path.exists() and not store.path.exists()
+    assert store.pending == 2
+
+    assert store.flush() == 2
+    assert store.flush() == 0
+    assert len(store.journal_path.read_text(encoding="utf-8").splitlines()) == 2
+
+    reloaded = _store(tmp_path)
+    assert reloaded.get(key) == store.get(key)
+    assert reloaded.get(key).samples == 2
+    assert ConfidenceCore(reloaded).get_score(key) > 0.5 > reloaded.get_score(make_key("router", "domain", "files"))
+    store.close()
+
+
+def test_batched_updates_match_single_updates(tmp_path: Path) -> None:
+    single = _store(tmp_path / "single")
+    batched = _store(tmp_path / "batched")
+    for observation in (1.0, 0.0, 1.0):
+        single.update_score("router:domain:camera", observation)
+        single.update_score("router:domain:files", 1.0 - observation)
+        scores = batched.update_scores({"router:domain:camera": observation, "router:domain:files": 1.0 - observation})
+
+    assert scores == {key: single.get_score(key) for key in scores}
+    assert batched.get("router:domain:camera") == single.get("router:domain:camera")
+    assert batched.get("router:domain:files").samples == 3
+    assert batched.pending == 2
+    single.close()
+    batched.close()
+
+
+def test_compaction_writes_snapshot_and_resets_journal(tmp_path: Path) -> None:
+    store = _store(tmp_path, compact_after_entries=3)
+    for domain in ("camera", "memories", "finance"):
+        store.update_score(make_key("router", "domain", domain), 1.0)
+    assert store.flush() == 3
+
+    assert not store.journal_path.exists()
+    snapshot = json.loads(store.path.read_text(encoding="utf-8"))
+    assert snapshot["generation"] == 1 and len(snapshot["scores"]) == 3
+    assert not store.path.with_name(store.path.name + ".tmp").exists()
+
+    store.update_score(make_key("router", "domain", "files"), 1.0)
+    store.close()
+    assert len(_store(tmp_path)._scores) == 4
+
+
+def test_load_skips_stale_journal_lines_and_torn_tail(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    key = make_key("router", "domain", "camera")
+    store.update_score(key, 1.0)
+    store.compact()
+    expected = store.get(key)
+    # A crash after the snapshot rename leaves pre-snapshot lines behind,
+    # and a crash mid-append leaves a partial line.
+    store.journal_path.write_text(
+        json.dumps({"g": 0, "k": key, "s": 0.0, "n": 99}) + "\n" + '{"g": 1, "k": "router:do',
+        encoding="utf-8",
+    )
+
+    reloaded = _store(tmp_path)
+    assert reloaded.get(key) == expected
+    assert not reloaded.journal_path.exists()
+    store.close()
+
+
+def test_load_tolerates_foreign_and_malformed_files(tmp_path: Path) -> None:
+    path = tmp_path / "confidence" / "store.json"
+    path.parent.mkdir(parents=True)
+    # Shape written by the previous store at the same path.
+    path.write_text(json.dumps({"router:domain:finance": {"alpha": 3, "beta": 1}}), encoding="utf-8")
+    assert _store(tmp_path)._scores == {}
+
+    path.write_text(json.dumps(["not", "a", "snapshot"]), encoding="utf-8")
+    assert _store(tmp_path)._scores == {}
+
+    path.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "generation": 1,
+                "scores": {"ok": {"score": 0.7, "samples": 3}, "bad": {"score": "high"}, "worse": 4},
+            }
+        ),
+        encoding="utf-8",
+    )
+    path.with_name(path.name + ".journal").write_text(
+        "\n".join(
+            json.dumps(entry)
+            for entry in ([1, 2], {"g": 1, "k": "partial"}, {"g": 1, "k": "fresh", "s": 0.9, "n": 1})
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    store = _store(tmp_path)
+    assert set(store._scores) == {"ok", "fresh"}
+    assert store.get_score("ok") == 0.7
+    store.update_score("ok", 1.0)
+    store.close()
+
+
+def test_background_flush_triggers_on_pending_size(tmp_path: Path) -> None:
+    store = _store(tmp_path, flush_max_pending=2)
+    store.update_score("a", 1.0)
+    store.update_score("b", 1.0)
+    deadline = time.monotonic() + 5.0
+    while store.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    store.close()
+    assert len(store.journal_path.read_text(encoding="utf-8").splitlines()) == 2
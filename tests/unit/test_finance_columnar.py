@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from core.finance.columnar import TransactionColumns
+from core.finance.intelligence import FinanceInsightEngine, expense_rows
+
+
+def _window(seed: int, size: int) -> list[dict]:
+    rng = random.Random(seed)
+    merchants = ["Cafe", " cafe ", "Market", "StreamFlix", "Snack Shop", "", None, "Hardware"]
+    transactions = []
+    for _ in range(size):
+        transactions.append({
+            "amount_cents": -rng.choice([rng.randint(100, 1500), rng.randint(1500, 90_000), 1500]),
+            "direction": rng.choice(["expense", "expense", "expense", "income", ""]),
+            "category_id": rng.choice(["dining", "grocery", "rent", None]),
+            "merchant": rng.choice(merchants),
+            "transaction_date": f"2026-{rng.randint(1, 6):02d}-{rng.randint(1, 28):02d}",
+        })
+    return transactions
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_columnar_insights_match_fold_engine(seed: int) -> None:
+    transactions = _window(seed, 300)
+    engine = FinanceInsightEngine()
+
+    columns = TransactionColumns.from_transactions(transactions)
+
+    assert len(columns) == sum(1 for _ in expense_rows(transactions))
+    assert engine.analyze_columns(columns) == engine.analyze(transactions)
+
+
+def test_columnar_tie_order_and_empty_window() -> None:
+    engine = FinanceInsightEngine()
+    # "big" is seen first overall, but "small" is the first small charge.
+    transactions = [
+        {"amount_cents": -9000, "direction": "expense", "merchant": "big", "transaction_date": "2026-01-01"},
+        *[{"amount_cents": -500, "direction": "expense", "merchant": m, "transaction_date": "2026-01-02"}
+          for m in ["small", "big", "small", "big", "small", "big"]],
+    ]
+    assert engine.analyze_columns(TransactionColumns.from_transactions(transactions)) == engine.analyze(transactions)
+
+    empty = TransactionColumns.from_transactions([])
+    assert engine.analyze_columns(empty) == []
@@ -0,0 +1,208 @@
+"""
+Unit tests for bulk transaction import.
+
+Covers: CSV / OFX / QIF parsing, batched import, rollups, error reporting.
+"""
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture()
+def finance_service(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setenv("VICTUS_DATA_DIR", str(tmp_path))
+    import core.storage.db as db_module
+    import core.finance.repository as repository_module
+    import core.finance.service as service_module
+
+    db_module._DB_INITIALIZED.clear()
+    importlib.reload(db_module)
+    importlib.reload(repository_module)
+    service_module = importlib.reload(service_module)
+    return service_module
+
+
+CSV_EXPORT = """Date,Description,Amount,Category,Memo
+2026-03-01,Corner Grocer,-45.10,Groceries,weekly shop
+03/02/2026,Payroll,"$2,500.00",Salary,
+2026-03-03,Cafe,(4.50),Dining Out,
+not-a-date,Broken,-1.00,,
+2026-03-04,Zero,0,,
+"""
+
+OFX_EXPORT = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260305120000
+<TRNAMT>-12.00
+<FITID>1
+<NAME>Book Shop
+<MEMO>paperback
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT</TRNTYPE><DTPOSTED>20260306</DTPOSTED><TRNAMT>30.00</TRNAMT><NAME>Refund</NAME></STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+QIF_EXPORT = """!Type:Bank
+D3/07'26
+T-8.25
+PFuel Stop
+LTransport:Fuel
+^
+D03/08/2026
+T100.00
+PGift
+^
+"""
+
+
+# ===========================================================================
+# A. Parsers
+# ===========================================================================
+
+def test_csv_parser_normalises_dates_and_amounts() -> None:
+    from core.finance.importers import parse_csv
+
+    rows = list(parse_csv(CSV_EXPORT.splitlines(keepends=True)))
+    assert [(r.transaction_date, r.amount) for r in rows[:3]] == [
+        ("2026-03-01", "-45.10"),
+        ("2026-03-02", "2500.00"),
+        ("2026-03-03", "-4.50"),
+    ]
+    assert rows[0].notes == "weekly shop"
+    assert rows[3].transaction_date is None
+
+
+def test_csv_parser_supports_debit_credit_columns() -> None:
+    from core.finance.importers import parse_csv
+
+    rows = list(parse_csv(["Posted Date,Payee,Debit,Credit\n", "2026-01-02,Rent,900.00,\n", "2026-01-03,Pay,,50\n"]))
+    assert [r.amount for r in rows] == ["-900.00", "50"]
+
+
+def test_ofx_and_qif_parsers() -> None:
+    from core.finance.importers import parse_ofx, parse_qif
+
+    ofx = list(parse_ofx(OFX_EXPORT.splitlines()))
+    assert [(r.transaction_date, r.amount, r.merchant) for r in ofx] == [
+        ("2026-03-05", "-12.00", "Book Shop"),
+        ("2026-03-06", "30.00", "Refund"),
+    ]
+    qif = list(parse_qif(QIF_EXPORT.splitlines()))
+    assert [(r.transaction_date, r.amount, r.category) for r in qif] == [
+        ("2026-03-07", "-8.25", "Transport"),
+        ("2026-03-08", "100.00", None),
+    ]
+
+
+# ===========================================================================
+# B. Service import
+# ===========================================================================
+
+def test_csv_import_inserts_in_batches_and_reports_errors(finance_service) -> None:
+    service = finance_service.FinanceService()
+    summary = service.import_transactions(CSV_EXPORT.splitlines(keepends=True), fmt="csv", batch_size=2)
+
+    assert summary.imported == 3
+    assert summary.skipped == 2
+    assert summary.batches == 2
+    assert summary.categories_created == 3
+    assert [error.line for error in summary.errors] == [5, 6]
+
+    listed = finance_service.list_transactions(limit=10)
+    by_merchant = {item["merchant"]: item for item in listed}
+    assert by_merchant["Payroll"]["direction"] == "income"
+    assert by_merchant["Cafe"]["amount_cents"] == 450
+    assert by_merchant["Cafe"]["direction"] == "expense"
+
+
+def test_import_keeps_rollups_in_sync(finance_service) -> None:
+    service = finance_service.FinanceService()
+    service.import_transactions(OFX_EXPORT.splitlines(), fmt="ofx")
+    service.import_transactions(QIF_EXPORT.splitlines(), fmt="qif", batch_size=1)
+
+    rollups = service.repository.summarize_daily_rollups(date_from="2026-03-01", date_to="2026-03-31", account_id=None)
+    spending = service.repository.summarize_spending(date_from="2026-03-01", date_to="2026-03-31", account_id=None)
+    assert rollups["transaction_count"] == spending["transaction_count"] == 4
+    assert rollups["by_category"] == spending["by_category"]
+
+    from core.storage.db import get_connection
+
+    assert get_connection().execute("SELECT COUNT(*) FROM finance_rollup_pause").fetchone()[0] == 0
+    finance_service.add_transaction(amount_cents=-500, category="misc", source="test", ts="2026-03-09")
+    after = service.repository.summarize_daily_rollups(date_from="2026-03-01", date_to="2026-03-31", account_id=None)
+    assert after["transaction_count"] == 5
+
+
+def test_import_merges_spending_baselines_like_triggers(finance_service) -> None:
+    from statistics import mean, variance
+
+    from core.storage.db import get_connection
+    from core.storage.migrations import SPENDING_BASELINE_ALPHA
+
+    amounts = [410, 385, 1200, 402, 398, 450, 377]
+    rows = "".join(f"2026-03-{day:02d},Corner Grocer,-{cents / 100:.2f},Groceries,\n" for day, cents in enumerate(amounts, 1))
+    service = finance_service.FinanceService()
+    service.import_transactions(["Date,Description,Amount,Category,Memo\n", rows[: rows.index("\n") + 1]], fmt="csv")
+    service.import_transactions(["Date,Description,Amount,Category,Memo\n", *rows.splitlines(keepends=True)[1:]], fmt="csv", batch_size=2)
+
+    ewma = float(amounts[0])
+    for cents in amounts[1:]:
+        ewma += SPENDING_BASELINE_ALPHA * (cents - ewma)
+    n, running_mean, m2, stored_ewma = get_connection().execute(
+        "SELECT n, mean, m2, ewma FROM finance_spending_baselines WHERE scope = 'merchant' AND key = 'corner grocer'"
+    ).fetchone()
+    assert n == len(amounts)
+    assert running_mean == pytest.approx(mean(amounts))
+    assert m2 == pytest.approx(variance(amounts) * (len(amounts) - 1))
+    assert stored_ewma == pytest.approx(ewma)
+    queued = get_connection().execute("SELECT merchant_key FROM finance_recurring_dirty").fetchall()
+    assert [row[0] for row in queued] == ["corner grocer"]
+
+
+def test_large_import_rebuilds_ledger_indexes_and_triggers(finance_service) -> None:
+    from core.storage.db import get_connection
+
+    schema_sql = (
+        "SELECT type, name, sql FROM sqlite_master WHERE tbl_name = 'transactions' "
+        "AND type IN ('index', 'trigger') ORDER BY type, name"
+    )
+    before = get_connection().execute(schema_sql).fetchall()
+    service = finance_service.FinanceService()
+    summary = service.import_transactions(
+        CSV_EXPORT.splitlines(keepends=True), fmt="csv", batch_size=1, rebuild_indexes_after=1
+    )
+
+    assert summary.imported == 3
+    assert get_connection().execute(schema_sql).fetchall() == before
+    assert get_connection().execute("SELECT COUNT(*) FROM finance_rollup_pause").fetchone()[0] == 0
+    rollups = service.repository.summarize_daily_rollups(date_from="2026-03-01", date_to="2026-03-31", account_id=None)
+    spending = service.repository.summarize_spending(date_from="2026-03-01", date_to="2026-03-31", account_id=None)
+    assert rollups["transaction_count"] == spending["transaction_count"] == 3
+    assert rollups["by_category"] == spending["by_category"]
+    finance_service.add_transaction(amount_cents=-500, category="misc", source="test", ts="2026-03-09")
+    after = service.repository.summarize_daily_rollups(date_from="2026-03-01", date_to="2026-03-31", account_id=None)
+    assert after["transaction_count"] == 4
+
+
+def test_malformed_export_rolls_back_everything(finance_service) -> None:
+    from core.finance.policy import FinanceValidationError
+
+    service = finance_service.FinanceService()
+    with pytest.raises(FinanceValidationError):
+        service.import_transactions(["Description,Total\n", "x,1\n"], fmt="csv")
+    with pytest.raises(FinanceValidationError):
+        service.import_transactions(CSV_EXPORT.splitlines(), fmt="xlsx")
+    assert finance_service.list_transactions(limit=10) == []
+
+
+def test_import_rejects_unknown_account(finance_service) -> None:
+    from core.finance.policy import FinanceValidationError
+
+    service = finance_service.FinanceService()
+    with pytest.raises(FinanceValidationError):
+        service.import_transactions(CSV_EXPORT.splitlines(), fmt="csv", account_id="missing")
@@ -7,6 +7,7 @@ from core.finance.intelligence import (
     FinanceCognition,
     FinanceGuidanceEngine,
     FinanceInsightEngine,
+    detect_cadence,
 )
 
 
@@ -78,6 +79,25 @@ def test_alert_engine_savings_alerts() -> None:
     assert "savings_behind_pace" in types
 
 
+def test_alert_engine_unusual_spending_comes_from_scored_anomalies() -> None:
+    engine = FinanceAlertEngine()
+    # Ten similar charges and one large one: without baseline scores nothing alerts.
+    transactions = [{"amount_cents": -900, "direction": "expense", "merchant": "Cafe"}] * 10
+    transactions.insert(0, {"amount_cents": -90_000, "direction": "expense", "merchant": "Cafe"})
+    assert not [a for a in engine.evaluate({"transactions": transactions}) if a["type"] == "unusual_spending"]
+
+    snapshot = {
+        "transactions": transactions,
+        "anomalies": [
+            {"transaction_id": "tx-big", "merchant": "Cafe", "amount_cents": -90_000, "z_score": 41.5, "is_anomaly": True},
+            {"transaction_id": "tx-ok", "merchant": "Cafe", "amount_cents": -900, "z_score": 0.2, "is_anomaly": False},
+        ],
+    }
+    [alert] = [a for a in engine.evaluate(snapshot) if a["type"] == "unusual_spending"]
+    assert (alert["entity_type"], alert["entity_id"]) == ("transaction", "tx-big")
+    assert "900.00 at 'Cafe' is 41.5 standard deviations" in alert["message"]
+
+
 # ===========================================================================
 # F. Insight Engine Tests
 # ===========================================================================
@@ -127,6 +147,23 @@ def test_insight_engine_spending_leaks() -> None:
     assert "spending_leaks" in patterns
 
 
+def test_insight_engine_reads_stream_once() -> None:
+    transactions = [
+        {"amount_cents": -(300 + d), "direction": "expense", "category_id": f"cat-{d % 4}",
+         "merchant": f" Shop {d % 3} ", "transaction_date": f"2026-0{1 + d % 3}-{1 + d % 28:02d}"}
+        for d in range(40)
+    ] + [{"amount_cents": 9000, "direction": "income", "merchant": "Employer", "transaction_date": "2026-02-01"}]
+    engine = FinanceInsightEngine()
+
+    from_stream = engine.analyze(iter(transactions))
+
+    assert from_stream == engine.analyze(transactions)
+    assert {i["pattern"] for i in from_stream} == {
+        "category_breakdown", "merchant_breakdown", "recurring_expense_detection",
+        "month_over_month_comparison", "top_spending_categories", "spending_leaks",
+    }
+
+
 # ===========================================================================
 # G. Guidance Engine Tests
 # ===========================================================================
@@ -201,6 +238,29 @@ def test_cognition_recurring_detection_and_behavior_pattern() -> None:
     assert "post_payday_spike" in patterns
 
 
+def test_detect_cadence_estimates_period_and_next_charge() -> None:
+    weekly = detect_cadence([("2026-03-02", -900), ("2026-03-09", -900), ("2026-03-16", -950), ("2026-03-23", -900)])
+    assert weekly["cadence"] == "weekly"
+    assert weekly["next_expected_date"] == "2026-03-30"
+
+    # Month lengths vary; the next charge keeps the billing day, clamped to month end.
+    monthly = detect_cadence([("2025-11-30", -1599), ("2025-12-30", -1599), ("2026-01-30", -1599)])
+    assert (monthly["cadence"], monthly["cadence_days"]) == ("monthly", 30)
+    assert monthly["next_expected_date"] == "2026-02-28"
+    assert monthly["confidence"] == 1.0
+
+    annual = detect_cadence([("2024-05-01", -9900), ("2025-05-03", -9900), ("2026-04-30", -10900)])
+    assert annual["cadence"] == "annual"
+    assert annual["expected_amount_cents"] == 9900
+    assert annual["next_expected_date"] == "2027-04-30"
+
+
+def test_detect_cadence_rejects_irregular_gaps_and_unstable_amounts() -> None:
+    assert detect_cadence([("2026-01-01", -500), ("2026-01-04", -500), ("2026-02-20", -500), ("2026-02-22", -500)]) is None
+    assert detect_cadence([("2026-01-05", -1000), ("2026-02-05", -4000), ("2026-03-05", -250), ("2026-04-05", -9000)]) is None
+    assert detect_cadence([("2026-01-05", -1000), ("2026-02-05", -1000)]) is None
+
+
 # ===========================================================================
 # Traceable / Explainable (Section 8 of spec)
 # ===========================================================================
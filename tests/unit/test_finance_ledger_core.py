@@ -101,6 +101,142 @@ def test_summary_generation_and_account_filtering(finance_service) -> None:
 
     spending = finance_service.spending_summary("2026-03-01", "2026-03-31")
     assert spending["totals"]["transaction_count"] == 3
+    assert spending["totals"]["income_cents"] == 100000
+    assert spending["totals"]["expense_cents"] == 6500
+    assert spending["by_merchant"] == {"Employer": 100000, "Cafe": 6500}
+    assert spending["by_account"] == {checking["id"]: 102500, savings["id"]: 4000}
+    assert spending["by_direction"] == {"expense": 6500, "income": 100000}
+
+    filtered = finance_service.spending_summary("2026-03-01", "2026-03-31", account_id=savings["id"])
+    assert filtered["totals"]["transaction_count"] == 1
+    assert filtered["totals"]["expense_cents"] == 4000
+
+
+def test_summarize_spending_loads_rows_only_on_request(finance_service) -> None:
+    finance_service.add_transaction(
+        amount_cents=-700, currency="EUR", category="Coffee", merchant="Cafe", source="test", ts="2026-03-05",
+    )
+    repository = finance_service.FinanceService().repository
+
+    snapshot = repository.summarize_spending(date_from="2026-03-01", date_to="2026-03-31", account_id=None)
+    assert "transactions" not in snapshot
+    assert snapshot["currency"] == "EUR"
+    assert snapshot["transaction_count"] == 1
+
+    detailed = repository.summarize_spending(
+        date_from="2026-03-01", date_to="2026-03-31", account_id=None, include_transactions=True,
+    )
+    assert [tx.merchant for tx in detailed["transactions"]] == ["Cafe"]
+
+
+def test_daily_rollups_track_create_update_delete(finance_service) -> None:
+    service = finance_service.FinanceService()
+    repository = service.repository
+    checking = finance_service.upsert_account(name="Checking", account_type="checking")
+    coffee_id = finance_service.add_transaction(
+        amount_cents=-2500, currency="USD", category="Coffee", merchant="Cafe",
+        source="test", account_id=checking["id"], ts="2026-03-05",
+    )
+    rent_id = finance_service.add_transaction(
+        amount_cents=-90000, currency="USD", category="Rent", merchant="Landlord", source="test", ts="2026-03-01",
+    )
+    finance_service.update_transaction(coffee_id, amount=30.00, transaction_date="2026-03-06")
+    finance_service.delete_transaction(rent_id)
+
+    def assert_matches_ledger() -> None:
+        rollup = repository.summarize_daily_rollups(date_from="2026-03-01", date_to="2026-03-31", account_id=None)
+        ledger = repository.summarize_spending(date_from="2026-03-01", date_to="2026-03-31", account_id=None)
+        for key in ("transaction_count", "income_cents", "expense_cents", "by_category", "by_account", "by_direction"):
+            assert rollup[key] == ledger[key], key
+
+    assert_matches_ledger()
+    rollup = repository.summarize_daily_rollups(date_from="2026-03-01", date_to="2026-03-31", account_id=None)
+    assert rollup["transaction_count"] == 1
+    assert rollup["expense_cents"] == 3000
+
+    from core.finance.schemas import SpendingSummaryRequest
+
+    categories = service.get_category_summary(
+        SpendingSummaryRequest(date_from="2026-03-01", date_to="2026-03-31")
+    ).categories
+    assert [c["expense_cents"] for c in categories] == [3000]
+
+    report = finance_service.summary(period="custom", start_ts="2026-03-01", end_ts="2026-03-31")
+    assert report["totals"] == {"coffee": 3000}
+
+
+def test_transaction_pages_follow_cursor(finance_service) -> None:
+    created = {
+        finance_service.add_transaction(amount_cents=-100 * (i + 1), category="misc", source="test", ts=f"2026-03-0{i % 3 + 1}")
+        for i in range(7)
+    }
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = finance_service.list_transactions_page(limit=3, cursor=cursor)
+        seen.extend(item["id"] for item in page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(created) and set(seen) == created
+    assert seen == [item["id"] for item in finance_service.list_transactions(limit=50)]
+
+
+def test_invalid_transaction_cursor_rejected(finance_service) -> None:
+    from core.storage.pagination import InvalidCursorError, encode_cursor
+
+    with pytest.raises(InvalidCursorError):
+        finance_service.list_transactions_page(cursor="not-a-cursor!")
+    with pytest.raises(InvalidCursorError):
+        finance_service.list_transactions_page(cursor=encode_cursor("memories", ["2026-01-01", "x"]))
+
+
+def _trace_statements():
+    from core.storage.db import get_connection
+
+    statements: list[str] = []
+    get_connection().set_trace_callback(statements.append)
+    return statements
+
+
+def test_catalog_cache_serves_lookups_without_queries(finance_service) -> None:
+    service = finance_service.FinanceService()
+    for index, name in enumerate(("coffee", "rent", "travel")):
+        finance_service.add_transaction(amount_cents=-100 * (index + 1), category=name, source="test", ts="2026-03-05")
+
+    statements = _trace_statements()
+    finance_service.add_transaction(amount_cents=-700, category="coffee", source="test", ts="2026-03-06")
+    report = finance_service.summary(period="custom", start_ts="2026-03-01", end_ts="2026-03-31")
+    from core.storage.db import get_connection
+
+    get_connection().set_trace_callback(None)
+
+    assert report["totals"] == {"coffee": 800, "rent": 200, "travel": 300}
+    assert not [sql for sql in statements if "finance_categories" in sql]
+    categories = service.repository.get_categories(["missing", *(c.id for c in service.repository.list_categories())])
+    assert sorted(category.name for category in categories.values()) == ["coffee", "rent", "travel"]
+
+
+def test_catalog_cache_follows_renames_and_imports(finance_service) -> None:
+    repository = finance_service.FinanceService().repository
+    category = repository.ensure_category("groceries")
+    assert repository.ensure_category("groceries").id == category.id
+
+    repository.update_category(category.id, {"name": "food"})
+    assert repository.get_category_by_name("groceries") is None
+    assert repository.get_category_by_name("food").id == category.id
+    assert repository.ensure_category("groceries").id != category.id
+
+    account = repository.create_account(account_id=None, name="Checking", account_type="checking", currency="USD", institution=None, is_active=True)
+    repository.update_account(account.id, {"is_active": 0})
+    assert repository.list_accounts() == []
+    assert repository.get_account(account.id).is_active is False
+
+    finance_service.FinanceService().import_transactions(
+        ["Date,Amount,Category\n", "2026-03-01,-5.00,Books\n"], fmt="csv"
+    )
+    assert repository.get_category_by_name("books") is not None
 
 
 def test_category_normalization(finance_service) -> None:
@@ -307,11 +443,51 @@ def test_alert_creation_and_resolution(finance_service) -> None:
     assert alerts.count >= 1
     assert alerts.results[0].status == "active"
 
+    service.repository.create_alert({
+        "id": "test-alert-2",
+        "type": "bill_due",
+        "severity": "caution",
+        "title": "Bill due",
+        "message": "Rent is due.",
+        "source_rule": "bill_due",
+        "related_entity_type": "bill",
+        "related_entity_id": "bill-1",
+        "created_at": "2026-03-18T00:00:00+00:00",
+    })
+    first = service.list_alerts(limit=1)
+    second = service.list_alerts(limit=1, cursor=first.next_cursor)
+    assert [first.results[0].id, second.results[0].id] == ["test-alert-2", "test-alert-1"]
+    assert second.next_cursor is None
+
     resolved = service.resolve_alert("test-alert-1")
     assert resolved.status == "resolved"
     assert resolved.resolved_at is not None
 
 
+def test_repeated_briefs_upsert_alerts_by_fingerprint(finance_service) -> None:
+    service = finance_service.FinanceService()
+    snapshot = {
+        "budgets": [{"id": "budget-1", "name": "Dining", "category_id": "dining", "amount_limit_cents": 1000}],
+        "transactions": [{"amount_cents": -2500, "category_id": "dining", "direction": "expense"}],
+    }
+
+    for _ in range(3):
+        service.generate_brief(snapshot)
+
+    alerts = service.list_alerts(limit=50).results
+    overspend = [alert for alert in alerts if alert.source_rule == "budget_overspend"]
+    assert len(overspend) == 1
+    assert overspend[0].occurrences == 3
+    assert overspend[0].last_seen_at >= overspend[0].created_at
+    assert len({(a.source_rule, a.related_entity_type, a.related_entity_id) for a in alerts}) == len(alerts)
+
+    # A resolved alert stays resolved while the same period keeps raising it.
+    service.resolve_alert(overspend[0].id)
+    service.generate_brief(snapshot)
+    [again] = [alert for alert in service.list_alerts(limit=50).results if alert.source_rule == "budget_overspend"]
+    assert (again.id, again.status, again.occurrences) == (overspend[0].id, "resolved", 4)
+
+
 # ===========================================================================
 # F. INSIGHTS
 # ===========================================================================
@@ -329,6 +505,178 @@ def test_insights_generation(finance_service) -> None:
     assert isinstance(insights.results, list)
 
 
+def test_insights_cover_whole_range_beyond_old_cap(finance_service) -> None:
+    from core.finance.intelligence import FinanceInsightEngine
+
+    service = finance_service.FinanceService()
+    for i in range(620):
+        finance_service.add_transaction(
+            amount_cents=-(100 + i % 7), currency="USD", category="coffee",
+            merchant="Cafe" if i % 2 else "Bakery", source="test", ts=f"2026-0{3 + i % 2}-{1 + i % 28:02d}",
+        )
+    finance_service.add_transaction(
+        amount_cents=90_000, currency="USD", category="salary", merchant="Employer", source="test", ts="2026-03-01",
+    )
+
+    results = [r.model_dump() for r in service.get_insights("2026-03-01", "2026-04-30").results]
+
+    everything = service.repository.list_transactions(date_from="2026-03-01", date_to="2026-04-30", limit=10_000)
+    assert len(everything) == 621
+    expected = FinanceInsightEngine().analyze(tx.__dict__ for tx in everything)
+    assert results == expected
+    total = sum(100 + i % 7 for i in range(620))
+    breakdown = next(r for r in results if r["pattern"] == "category_breakdown")
+    assert f"({total / 100:.2f})" in breakdown["reason"]
+
+
+def test_large_insight_windows_use_columns_with_same_results(finance_service, monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("numpy")
+    from core.finance.intelligence import FinanceInsightEngine
+
+    service = finance_service.FinanceService()
+    for i in range(240):
+        finance_service.add_transaction(
+            amount_cents=-(100 + (i * 37) % 4000), currency="USD", category=("coffee", "rent", "grocery")[i % 3],
+            merchant=("Cafe", " cafe", "Market", "StreamFlix", "")[i % 5], source="test", ts=f"2026-0{3 + i % 3}-{1 + i % 28:02d}",
+        )
+    fold = [r.model_dump() for r in service.get_insights("2026-03-01", "2026-05-31").results]
+
+    calls: list[int] = []
+    analyze_columns = FinanceInsightEngine.analyze_columns
+
+    def spy(engine, columns):
+        calls.append(len(columns))
+        return analyze_columns(engine, columns)
+
+    monkeypatch.setattr(FinanceInsightEngine, "analyze_columns", spy)
+    for threshold, expected_calls in ((240, [240]), (241, [])):
+        calls.clear()
+        monkeypatch.setattr(finance_service, "COLUMNAR_INSIGHTS_MIN_ROWS", threshold)
+        results = [r.model_dump() for r in service.get_insights("2026-03-01", "2026-05-31").results]
+        assert (results, calls) == (fold, expected_calls)
+
+
+def _baseline(scope: str, key: str):
+    from core.storage.db import get_connection
+
+    return get_connection().execute(
+        "SELECT n, mean, m2 FROM finance_spending_baselines WHERE scope = ? AND key = ?", (scope, key)
+    ).fetchone()
+
+
+def test_detect_anomalies_scores_against_trigger_maintained_baselines(finance_service) -> None:
+    from statistics import mean, variance
+
+    service = finance_service.FinanceService()
+    regular = [510, 495, 530, 505, 520, 480, 515, 500]
+    for day, cents in enumerate(regular, start=1):
+        finance_service.add_transaction(
+            amount_cents=-cents, currency="USD", category="coffee", merchant="Cafe", source="test", ts=f"2026-03-{day:02d}",
+        )
+    outlier = finance_service.add_transaction(
+        amount_cents=-5000, currency="USD", category="coffee", merchant=" cafe", source="test", ts="2026-03-20",
+    )
+
+    n, running_mean, m2 = _baseline("merchant", "cafe")
+    amounts = regular + [5000]
+    assert n == 9
+    assert running_mean == pytest.approx(mean(amounts))
+    assert m2 == pytest.approx(variance(amounts) * 8)
+
+    flagged = service.detect_anomalies("2026-03-01", "2026-03-31")
+    assert [record.transaction_id for record in flagged.results] == [outlier]
+    merchant_score = next(score for score in flagged.results[0].scores if score.scope == "merchant")
+    assert merchant_score.samples == 8
+    assert merchant_score.baseline_mean_cents == round(mean(regular), 2)
+    assert merchant_score.z_score > flagged.z_threshold
+
+    everything = service.detect_anomalies("2026-03-01", "2026-03-31", include_normal=True)
+    assert everything.count == 9
+    assert all(abs(record.z_score) < 3 for record in everything.results if not record.is_anomaly)
+
+    finance_service.delete_transaction(outlier)
+    n, running_mean, _ = _baseline("merchant", "cafe")
+    assert n == 8 and running_mean == pytest.approx(mean(regular))
+
+
+def test_detect_anomalies_handler_validates_limit(finance_service) -> None:
+    import core.domains.finance.handlers as handlers_module
+    from core.finance.policy import FinanceValidationError
+
+    handlers = importlib.reload(handlers_module)
+    for cents in (510, 495, 530, 505, 520, 480):
+        finance_service.add_transaction(
+            amount_cents=-cents, currency="USD", category="coffee", merchant="Cafe", source="test", ts="2026-03-02",
+        )
+    window = {"date_from": "2026-03-01", "date_to": "2026-03-31", "include_normal": True}
+
+    assert handlers.detect_anomalies_handler({**window, "limit": " 4 "}, {})["count"] == 4
+    assert handlers.detect_anomalies_handler({**window, "limit": None}, {})["count"] == 6
+    assert handlers.detect_anomalies_handler(window, {})["count"] == 6
+    for bad in ("ten", "2.5", 0, 1001, True, 2.5, []):
+        with pytest.raises(FinanceValidationError):
+            handlers.detect_anomalies_handler({**window, "limit": bad}, {})
+
+
+def test_brief_alerts_on_baseline_anomalies_in_recent_window(finance_service) -> None:
+    from datetime import date, timedelta
+
+    service = finance_service.FinanceService()
+    start = date.today() - timedelta(days=20)
+    for offset, cents in enumerate([510, 495, 530, 505, 520, 480, 515, 500]):
+        finance_service.add_transaction(
+            amount_cents=-cents, currency="USD", category="coffee", merchant="Cafe", source="test",
+            ts=(start + timedelta(days=offset)).isoformat(),
+        )
+    outlier = finance_service.add_transaction(
+        amount_cents=-5000, currency="USD", category="coffee", merchant="Cafe", source="test",
+        ts=(start + timedelta(days=10)).isoformat(),
+    )
+
+    service.generate_brief({"transactions": []})
+
+    unusual = [alert for alert in service.list_alerts(limit=50).results if alert.source_rule == "anomaly_detection_amount"]
+    assert [(alert.related_entity_type, alert.related_entity_id) for alert in unusual] == [("transaction", outlier)]
+
+
+def test_recurring_expenses_refresh_only_changed_merchants(finance_service) -> None:
+    service = finance_service.FinanceService()
+    for month in (1, 2, 3, 4):
+        finance_service.add_transaction(
+            amount_cents=-1599, currency="USD", category="media", merchant="StreamFlix", source="test", ts=f"2026-{month:02d}-12",
+        )
+    latest = finance_service.add_transaction(
+        amount_cents=-1599, currency="USD", category="media", merchant="streamflix ", source="test", ts="2026-05-12",
+    )
+    finance_service.add_transaction(
+        amount_cents=-4200, currency="USD", category="home", merchant="Hardware", source="test", ts="2026-05-01",
+    )
+
+    first = service.detect_recurring_expenses()
+    assert first.refreshed == 2
+    [subscription] = first.results
+    assert (subscription.merchant, subscription.cadence, subscription.occurrences) == ("streamflix", "monthly", 5)
+    assert subscription.next_expected_date == "2026-06-12"
+
+    assert service.detect_recurring_expenses().refreshed == 0
+
+    finance_service.delete_transaction(latest)
+    moved = service.detect_recurring_expenses()
+    assert moved.refreshed == 1
+    assert moved.results[0].next_expected_date == "2026-05-12"
+
+    for transaction_id in _streamflix_ids(finance_service)[:3]:
+        finance_service.delete_transaction(transaction_id)
+    assert service.detect_recurring_expenses().results == []
+
+
+def _streamflix_ids(finance_service) -> list[str]:
+    return [
+        tx["id"] for tx in finance_service.list_transactions(limit=100)
+        if (tx.get("merchant") or "").strip().lower() == "streamflix"
+    ]
+
+
 # ===========================================================================
 # G. GUIDANCE
 # ===========================================================================
@@ -0,0 +1,246 @@
+"""
+Unit tests for background maintenance.
+
+Covers: memory decay, log/alert/timeline retention, vacuum, scheduler window.
+"""
+from __future__ import annotations
+
+import dataclasses
+import importlib
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture()
+def maintenance_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setenv("VICTUS_DATA_DIR", str(tmp_path))
+    import core.storage.db as db_module
+    import core.memory.store as store_module
+    import core.memory.service as memory_module
+    import core.finance.repository as repository_module
+    import core.maintenance.service as maintenance_module
+
+    db_module._DB_INITIALIZED.clear()
+    importlib.reload(db_module)
+    importlib.reload(store_module)
+    importlib.reload(memory_module)
+    importlib.reload(repository_module)
+    maintenance_module = importlib.reload(maintenance_module)
+    return maintenance_module
+
+
+def _config(**overrides):
+    from core.config import get_maintenance_config
+
+    return dataclasses.replace(get_maintenance_config(), **overrides)
+
+
+def _days_ago(days: float) -> str:
+    return (NOW - timedelta(days=days)).isoformat()
+
+
+# ===========================================================================
+# A. Retention
+# ===========================================================================
+
+def test_memory_decay_prunes_only_faded_unprotected_memories(maintenance_env, tmp_path: Path) -> None:
+    from core.memory.service import MemoryService, list_recent
+
+    service = MemoryService()
+    faded = service.write({"content": "old trivia", "importance": 2, "confidence": 0.5, "ts": _days_ago(400)})
+    protected = service.write({"content": "passport number location", "importance": 9, "ts": _days_ago(900)})
+    fresh = service.write({"content": "new trivia", "importance": 2, "confidence": 0.5, "ts": _days_ago(1)})
+
+    report = maintenance_env.run_maintenance(
+        _config(memory_half_life_days=90, memory_min_score=0.5, memory_protected_importance=8),
+        now=NOW,
+        ui_state_db_path=tmp_path / "ui.sqlite3",
+    )
+
+    assert report.rows_deleted["memories"] == 1
+    remaining = {record["id"] for record in list_recent(limit=10)}
+    assert remaining == {protected, fresh}
+    assert faded not in remaining
+
+
+def test_behavior_logs_and_resolved_alerts_capped_by_age_and_count(maintenance_env, tmp_path: Path) -> None:
+    from core.finance.repository import FinanceRepository
+
+    repository = FinanceRepository()
+    for index, age in enumerate((1, 2, 3, 500)):
+        repository.add_behavior_log({"id": f"log-{index}", "behavior_type": "spend", "score": 1.0, "ts": _days_ago(age)})
+    for index, (age, resolved) in enumerate(((1, True), (2, True), (3, True), (200, True), (400, False))):
+        repository.create_alert(
+            {
+                "id": f"alert-{index}",
+                "type": "budget",
+                "severity": "info",
+                "title": "t",
+                "message": "m",
+                "source_rule": "rule",
+                "related_entity_type": "budget",
+                "related_entity_id": f"budget-{index}",
+                "created_at": _days_ago(age),
+            }
+        )
+        if resolved:
+            repository.resolve_alert(f"alert-{index}")
+
+    report = maintenance_env.run_maintenance(
+        _config(
+            behavior_log_max_age_days=365,
+            behavior_log_max_rows=2,
+            resolved_alert_max_age_days=90,
+            resolved_alert_max_rows=2,
+        ),
+        now=NOW,
+        ui_state_db_path=tmp_path / "ui.sqlite3",
+    )
+
+    assert report.rows_deleted["finance_behavior_logs"] == 2
+    assert [log["id"] for log in repository.list_behavior_logs(10)] == ["log-0", "log-1"]
+    # resolve_alert stamps resolved_at with the real clock, so only the count cap applies here.
+    assert report.rows_deleted["finance_alerts"] == 2
+    assert {alert.id for alert in repository.list_alerts(limit=10)} == {"alert-0", "alert-1", "alert-4"}
+
+
+def test_resolved_alerts_of_current_period_survive_pruning(maintenance_env, tmp_path: Path) -> None:
+    from core.finance.repository import FinanceRepository
+
+    repository = FinanceRepository()
+    alert = {
+        "id": "alert-june",
+        "type": "budget",
+        "severity": "info",
+        "title": "t",
+        "message": "m",
+        "source_rule": "rule",
+        "related_entity_type": "budget",
+        "related_entity_id": "budget-1",
+        "created_at": NOW.isoformat(),
+    }
+    repository.create_alert(alert)
+    repository.resolve_alert("alert-june")
+
+    report = maintenance_env.run_maintenance(
+        _config(resolved_alert_max_rows=0), now=NOW, ui_state_db_path=tmp_path / "ui.sqlite3"
+    )
+    assert report.rows_deleted["finance_alerts"] == 0
+
+    # The next brief of the same period re-sees the alert; it stays resolved.
+    repeated = repository.create_alert({**alert, "id": "alert-june-again"})
+    assert (repeated.id, repeated.status, repeated.occurrences) == ("alert-june", "resolved", 2)
+
+
+def test_timeline_events_capped(maintenance_env, tmp_path: Path) -> None:
+    from victus.ui_state.store import fetch_ui_state
+
+    ui_path = tmp_path / "ui.sqlite3"
+    assert len(fetch_ui_state(ui_path).timeline_events) == 3
+
+    report = maintenance_env.run_maintenance(_config(timeline_max_rows=1), ui_state_db_path=ui_path)
+
+    assert report.rows_deleted["timeline_events"] == 2
+    assert len(fetch_ui_state(ui_path).timeline_events) == 1
+
+
+# ===========================================================================
+# B. Vacuum
+# ===========================================================================
+
+def test_incremental_vacuum_reclaims_bytes(maintenance_env, tmp_path: Path) -> None:
+    from core.finance.repository import FinanceRepository
+    from core.storage.db import get_connection
+
+    assert get_connection().execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    repository = FinanceRepository()
+    for index in range(400):
+        repository.add_behavior_log(
+            {"id": f"log-{index}", "behavior_type": "spend", "score": 1.0, "details": {"pad": "x" * 2000}, "ts": _days_ago(index)}
+        )
+
+    report = maintenance_env.run_maintenance(
+        _config(behavior_log_max_rows=10, behavior_log_max_age_days=10_000, vacuum_pages=0),
+        now=NOW,
+        ui_state_db_path=tmp_path / "ui.sqlite3",
+    )
+
+    assert report.vacuum == "incremental"
+    assert report.rows_deleted["finance_behavior_logs"] == 390
+    assert report.bytes_reclaimed > 390 * 2000
+    assert report.as_dict()["total_rows_deleted"] == 390
+
+
+def test_legacy_database_converted_only_on_opt_in_and_keeps_search(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    legacy = sqlite3.connect(str(data_dir / "victus_local.sqlite3"))
+    legacy.execute("CREATE TABLE legacy_marker (id INTEGER)")
+    legacy.commit()
+    legacy.close()
+
+    monkeypatch.setenv("VICTUS_DATA_DIR", str(tmp_path))
+    import core.storage.db as db_module
+    import core.memory.store as store_module
+    import core.memory.service as memory_module
+    import core.maintenance.service as maintenance_module
+
+    db_module._DB_INITIALIZED.clear()
+    importlib.reload(db_module)
+    importlib.reload(store_module)
+    memory_module = importlib.reload(memory_module)
+    maintenance_module = importlib.reload(maintenance_module)
+
+    memory_module.add_memory(content="first note", type="note", source="test")
+    doomed = memory_module.add_memory(content="second note", type="note", source="test")
+    kept = memory_module.add_memory(content="lighthouse keeper", type="note", source="test")
+    memory_module.delete_memory(doomed)
+
+    report = maintenance_module.run_maintenance(_config(), ui_state_db_path=tmp_path / "ui.sqlite3")
+    assert report.vacuum == "conversion_required"
+    assert db_module.get_connection().execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+
+    report = maintenance_module.run_maintenance(
+        _config(convert_auto_vacuum=True), ui_state_db_path=tmp_path / "ui.sqlite3"
+    )
+    assert report.vacuum == "full"
+    assert db_module.get_connection().execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert [r["id"] for r in memory_module.search_memories(query="lighthouse", tags=None)] == [kept]
+    assert maintenance_module.run_maintenance(_config(), ui_state_db_path=tmp_path / "ui.sqlite3").vacuum == "incremental"
+
+
+# ===========================================================================
+# C. Scheduler
+# ===========================================================================
+
+def test_in_window_wraps_midnight() -> None:
+    from core.maintenance import in_window
+
+    assert in_window(3, 2, 5)
+    assert not in_window(5, 2, 5)
+    assert in_window(23, 22, 4) and in_window(1, 22, 4)
+    assert not in_window(12, 22, 4)
+
+
+def test_scheduler_disabled_by_default_and_runs_only_in_window() -> None:
+    from core.maintenance import MaintenanceScheduler
+
+    runs: list[object] = []
+    hour = {"value": 12}
+    scheduler = MaintenanceScheduler(
+        _config(enabled=False, window_start_hour=2, window_end_hour=5, interval_seconds=3600),
+        runner=lambda config: runs.append(config) or "report",
+        clock=lambda: datetime(2026, 1, 1, hour["value"]),
+    )
+    assert scheduler.start() is False
+
+    assert scheduler.tick() is None
+    hour["value"] = 3
+    assert scheduler.tick() == "report"
+    assert scheduler.tick() is None  # interval not yet elapsed
+    assert len(runs) == 1
@@ -250,3 +250,443 @@ def test_delete_memory_handler(monkeypatch: pytest.MonkeyPatch, tmp_path: Path)
     created = handlers.create_note_handler({"content": "to delete"}, {"user_id": "u1"})
     result = handlers.delete_memory_handler({"memory_id": created["memory_id"]}, {})
     assert result["deleted"] is True
+
+
+# ---------------------------------------------------------------------------
+# F. Full-text search
+# ---------------------------------------------------------------------------
+
+
+def test_fts_search_supports_prefix_and_ranking(memory_env) -> None:
+    memory_env.add_memory(content="coffee beans from the market", type="note", source="test")
+    best = memory_env.add_memory(content="coffee coffee coffee tasting notes", type="note", source="test")
+    memory_env.add_memory(content="tea leaves", type="note", source="test")
+
+    results = memory_env.search_memories(query="coff", tags=None, limit=5)
+    assert len(results) == 2
+    assert results[0]["id"] == best
+    assert "[coffee]" in results[0]["snippet"]
+    assert results[0]["score"] >= results[1]["score"]
+
+
+def test_fts_search_ignores_operator_syntax(memory_env) -> None:
+    memory_env.add_memory(content="quarterly report draft", type="note", source="test")
+    results = memory_env.search_memories(query='report" (draft*', tags=None, limit=5)
+    assert [r["content"] for r in results] == ["quarterly report draft"]
+
+
+def test_search_falls_back_to_like_without_fts(memory_env) -> None:
+    from core.storage.db import get_connection
+
+    with get_connection() as conn:
+        for trigger in ("trg_memories_fts_insert", "trg_memories_fts_delete", "trg_memories_fts_update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE IF EXISTS memories_fts")
+
+    memory_id = memory_env.add_memory(content="offline fallback search", type="note", source="test")
+    results = memory_env.search_memories(query="fallback", tags=None, limit=5)
+    assert [r["id"] for r in results] == [memory_id]
+
+
+def test_search_surfaces_other_fts_errors(memory_env, monkeypatch: pytest.MonkeyPatch) -> None:
+    import sqlite3
+
+    import core.memory.store as store_module
+
+    def locked(*_args, **_kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store_module.MemoryRepository, "_search_fts", locked)
+    with pytest.raises(sqlite3.OperationalError):
+        memory_env.search_memories(query="fallback", tags=None, limit=5)
+
+
+# ---------------------------------------------------------------------------
+# G. Tags
+# ---------------------------------------------------------------------------
+
+
+def test_tag_filter_and_or_modes(memory_env) -> None:
+    both = memory_env.add_memory(content="planning sync", type="event", tags=["work", "meeting"], source="test")
+    work_only = memory_env.add_memory(content="expense report", type="task", tags=["Work"], source="test")
+    memory_env.add_memory(content="dentist", type="event", tags=["personal"], source="test")
+
+    all_ids = {r["id"] for r in memory_env.search_memories(query="", tags=["work", "meeting"], limit=10)}
+    assert all_ids == {both}
+
+    any_ids = {
+        r["id"] for r in memory_env.search_memories(query="", tags=["meeting", "work"], limit=10, tag_mode="any")
+    }
+    assert any_ids == {both, work_only}
+
+    combined = memory_env.search_memories(query="report", tags=["WORK"], limit=10)
+    assert [r["id"] for r in combined] == [work_only]
+
+
+def test_tag_facets_count_and_follow_deletes(memory_env) -> None:
+    first = memory_env.add_memory(content="a", type="note", tags=["work", "ideas"], source="test")
+    memory_env.add_memory(content="b", type="note", tags=["work"], source="test")
+
+    assert memory_env.tag_facets()[:2] == [{"tag": "work", "count": 2}, {"tag": "ideas", "count": 1}]
+
+    memory_env.delete_memory(first)
+    assert memory_env.tag_facets() == [{"tag": "work", "count": 1}]
+
+
+def test_memory_tags_backfilled_from_existing_rows(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    import sqlite3
+
+    monkeypatch.setenv("VICTUS_DATA_DIR", str(tmp_path))
+    db_path = tmp_path / "data" / "victus_local.sqlite3"
+    db_path.parent.mkdir(parents=True)
+    legacy = sqlite3.connect(str(db_path))
+    legacy.execute(
+        "CREATE TABLE memories (id TEXT PRIMARY KEY, ts TEXT, type TEXT, tags TEXT, source TEXT, "
+        "content TEXT, importance INTEGER, confidence REAL, sensitivity TEXT DEFAULT 'internal')"
+    )
+    legacy.executemany(
+        "INSERT INTO memories (id, ts, type, tags, source, content, importance, confidence) "
+        "VALUES (?, '2026-01-01', 'note', ?, 'test', ?, 5, 0.8)",
+        [("m1", '["work", "ideas"]', "json tags"), ("m2", "work,legacy", "comma tags")],
+    )
+    legacy.commit()
+    legacy.close()
+
+    import core.storage.db as db_module
+    import core.memory.service as svc_module
+    import core.memory.store as store_module
+
+    db_module._DB_INITIALIZED.clear()
+    importlib.reload(db_module)
+    importlib.reload(store_module)
+    svc_module = importlib.reload(svc_module)
+
+    ids = {r["id"] for r in svc_module.search_memories(query="", tags=["work"], limit=10)}
+    assert ids == {"m1", "m2"}
+
+
+# ---------------------------------------------------------------------------
+# H. Sensitivity filtering in SQL
+# ---------------------------------------------------------------------------
+
+
+def test_sensitivity_filter_is_applied_before_limit(memory_env) -> None:
+    visible = [
+        memory_env.add_memory(content=f"visible note {i}", type="note", source="test", sensitivity="internal")
+        for i in range(3)
+    ]
+    for i in range(5):
+        memory_env.add_memory(content=f"hidden note {i}", type="note", source="test", sensitivity="critical")
+
+    recent = memory_env.list_recent(limit=3, allowed_sensitivity=["internal"])
+    assert {r["id"] for r in recent} == set(visible)
+
+    searched = memory_env.search_memories(query="note", tags=None, limit=3, allowed_sensitivity=["internal"])
+    assert {r["id"] for r in searched} == set(visible)
+
+
+def test_sensitivity_rank_stored_and_filters_facets(memory_env) -> None:
+    from core.storage.db import get_connection
+
+    public_id = memory_env.add_memory(content="menu", type="note", tags=["food"], source="test", sensitivity="public")
+    memory_env.add_memory(content="pin", type="note", tags=["bank"], source="test", sensitivity="sensitive")
+
+    rank = get_connection().execute("SELECT sensitivity_rank FROM memories WHERE id = ?", (public_id,)).fetchone()[0]
+    assert rank == 0
+    assert [f["tag"] for f in memory_env.tag_facets()] == ["food"]
+
+
+# ---------------------------------------------------------------------------
+# I. Semantic retrieval
+# ---------------------------------------------------------------------------
+
+
+def test_embedding_is_deterministic_and_normalised() -> None:
+    from core.memory.vectors import EMBEDDING_DIM, embed_text
+
+    first = embed_text("Grocery shopping list")
+    assert list(first) == list(embed_text("grocery shopping list"))
+    assert len(first) == EMBEDDING_DIM
+    assert abs(sum(v * v for v in first) - 1.0) < 1e-5
+    assert not any(embed_text("   "))
+
+
+def test_semantic_search_matches_near_spellings(memory_env) -> None:
+    pytest.importorskip("numpy")
+    target = memory_env.add_memory(content="Renew the passport before travelling", type="task", source="test")
+    memory_env.add_memory(content="Water the plants on the balcony", type="task", source="test")
+
+    results = memory_env.search_memories(query="passports travel", tags=None, limit=1, mode="semantic")
+    assert [r["id"] for r in results] == [target]
+    assert 0.0 < results[0]["score"] <= 1.0
+
+    assert memory_env.search_memories(query="passports travel", tags=None, limit=5, mode="fts") == []
+
+
+def test_semantic_search_respects_filters_and_deletes(memory_env) -> None:
+    pytest.importorskip("numpy")
+    hidden = memory_env.add_memory(
+        content="bank account pin code", type="note", source="test", sensitivity="critical"
+    )
+    removed = memory_env.add_memory(content="bank holiday plans", type="note", source="test")
+    kept = memory_env.add_memory(content="bank statement review", type="note", tags=["finance"], source="test")
+    memory_env.delete_memory(removed)
+
+    ids = [r["id"] for r in memory_env.search_memories(query="bank", tags=None, limit=5, mode="semantic")]
+    assert ids == [kept]
+    assert hidden not in ids
+
+    tagged = memory_env.search_memories(query="bank", tags=["missing"], limit=5, mode="semantic")
+    assert tagged == []
+
+
+def test_hybrid_search_blends_scores(memory_env) -> None:
+    pytest.importorskip("numpy")
+    exact = memory_env.add_memory(content="quarterly tax filing", type="task", source="test")
+    fuzzy = memory_env.add_memory(content="taxes for the quarter", type="task", source="test")
+
+    results = memory_env.search_memories(query="quarterly tax", tags=None, limit=5, mode="hybrid")
+    assert [r["id"] for r in results][:2] == [exact, fuzzy]
+    assert "snippet" in results[0]
+
+
+def test_vectors_backfilled_for_existing_memories(memory_env) -> None:
+    pytest.importorskip("numpy")
+    from core.storage.db import get_connection, get_db_path
+    from core.memory.vectors import VECTOR_FILENAME
+
+    first = memory_env.add_memory(content="coffee beans order", type="note", source="test")
+    get_connection().execute("DELETE FROM memory_vectors")
+    get_connection().commit()
+    (get_db_path().with_name(VECTOR_FILENAME)).unlink()
+
+    import core.memory.vectors as vectors_module
+
+    vectors_module._INDEXES.clear()
+    results = memory_env.search_memories(query="coffee", tags=None, limit=5, mode="semantic")
+    assert [r["id"] for r in results] == [first]
+
+
+def test_writes_leave_vector_backfill_to_startup(memory_env) -> None:
+    from core.storage.db import get_connection, get_db_path
+    from core.memory.vectors import VECTOR_FILENAME
+
+    first = memory_env.add_memory(content="coffee beans order", type="note", source="test")
+    get_connection().execute("DELETE FROM memory_vectors")
+    get_connection().commit()
+    (get_db_path().with_name(VECTOR_FILENAME)).unlink()
+
+    import core.memory.vectors as vectors_module
+
+    vectors_module._INDEXES.clear()
+    second = memory_env.add_memory(content="tea leaves order", type="note", source="test")
+    vectored = {row[0] for row in get_connection().execute("SELECT memory_id FROM memory_vectors")}
+    assert vectored == {second}
+
+    assert memory_env.sync_memory_vectors() == 1
+    slots = dict(get_connection().execute("SELECT memory_id, slot FROM memory_vectors").fetchall())
+    assert set(slots) == {first, second}
+    assert vectors_module.get_vector_index(get_db_path()).row_count() == max(slots.values()) + 1
+
+
+def test_search_rejects_unknown_mode(memory_env) -> None:
+    with pytest.raises(ValueError):
+        memory_env.search_memories(query="x", tags=None, limit=5, mode="vector")
+
+
+# ---------------------------------------------------------------------------
+# J. Keyset pagination
+# ---------------------------------------------------------------------------
+
+
+def test_list_recent_pages_follow_cursor(memory_env) -> None:
+    ids = [
+        memory_env.add_memory(content=f"note {i}", type="note", source="test", sensitivity="internal")
+        for i in range(7)
+    ]
+    memory_env.add_memory(content="hidden", type="note", source="test", sensitivity="critical")
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        page = memory_env.list_recent_page(limit=3, cursor=cursor, allowed_sensitivity=["internal"])
+        seen.extend(r["id"] for r in page["results"])
+        cursor = page["next_cursor"]
+        pages += 1
+        if cursor is None:
+            break
+    assert pages == 3
+    assert seen == list(reversed(ids))
+
+
+# ---------------------------------------------------------------------------
+# K. Bulk writes
+# ---------------------------------------------------------------------------
+
+
+def test_write_many_inserts_batch_and_reports_item_errors(memory_env) -> None:
+    result = memory_env.add_memories(
+        [
+            {"content": "coffee beans order", "tags": ["shopping"], "source": "test"},
+            {"content": "   ", "source": "test"},
+            {"content": "dentist appointment", "sensitivity": "sensitive", "source": "test"},
+            {"content": "bad level", "sensitivity": "secret", "source": "test"},
+        ]
+    )
+    assert result["written"] == 2
+    assert [error["index"] for error in result["errors"]] == [1, 3]
+
+    listed = memory_env.list_recent(limit=10, allowed_sensitivity=["sensitive"])
+    assert {record["id"] for record in listed} == set(result["ids"])
+    assert [r["id"] for r in memory_env.search_memories(query="coffee", tags=["shopping"], limit=5)] == [result["ids"][0]]
+
+
+def test_write_many_skips_existing_and_repeated_ids(memory_env) -> None:
+    existing = memory_env.add_memory(content="already here", type="note", source="test")
+    result = memory_env.add_memories(
+        [
+            {"id": existing, "content": "clash", "source": "test"},
+            {"id": "fresh", "content": "first copy", "source": "test"},
+            {"id": "fresh", "content": "second copy", "source": "test"},
+        ]
+    )
+    assert result["ids"] == ["fresh"]
+    assert [error["index"] for error in result["errors"]] == [0, 2]
+    assert memory_env.get_memory_by_id("fresh")["content"] == "first copy"
+    assert memory_env.get_memory_by_id(existing)["content"] == "already here"
+
+
+def test_write_many_vectors_line_up_with_slots(memory_env) -> None:
+    pytest.importorskip("numpy")
+    memory_env.add_memory(content="single write first", type="note", source="test")
+    result = memory_env.add_memories(
+        [{"content": text, "source": "test"} for text in ("gardening tomatoes", "violin lessons", "mortgage renewal")]
+    )
+    hits = memory_env.search_memories(query="violin", tags=None, limit=1, mode="semantic")
+    assert [hit["id"] for hit in hits] == [result["ids"][1]]
+
+
+def test_write_many_rejects_oversized_batch(memory_env) -> None:
+    with pytest.raises(ValueError):
+        memory_env.add_memories([{"content": "x"}] * (memory_env.MAX_BULK_ITEMS + 1))
+
+
+# ---------------------------------------------------------------------------
+# L. Content-hash deduplication
+# ---------------------------------------------------------------------------
+
+
+def test_repeated_write_upserts_existing_memory(memory_env) -> None:
+    first = memory_env.add_memory(content="Buy  oat milk", type="note", source="test", importance=3)
+    again = memory_env.add_memory(content="buy oat milk", type="note", source="test", importance=2, sensitivity="sensitive")
+    other_source = memory_env.add_memory(content="buy oat milk", type="note", source="import")
+
+    assert again == first
+    assert other_source != first
+    stored = memory_env.get_memory_by_id(first, allowed_sensitivity=["sensitive"])
+    assert stored["content"] == "buy oat milk"
+    assert stored["importance"] == 4
+    assert stored["sensitivity"] == "sensitive"
+    hits = memory_env.search_memories(query="oat", tags=None, limit=10, allowed_sensitivity=["sensitive"])
+    assert sorted(r["id"] for r in hits) == sorted([first, other_source])
+
+
+def test_repeated_write_merges_tags(memory_env) -> None:
+    first = memory_env.add_memory(content="call the plumber", type="note", source="test", tags=["Home"])
+    memory_env.add_memory(content="Call the plumber", type="note", source="test", tags=["home", "urgent"])
+    memory_env.add_memories([{"content": "call the  plumber", "type": "note", "source": "test", "tags": ["repairs"]}])
+
+    stored = memory_env.get_memory_by_id(first)
+    assert stored["tags"] == ["Home", "urgent", "repairs"]
+    tagged = memory_env.search_memories(query="", tags=["urgent", "repairs"], limit=5)
+    assert [r["id"] for r in tagged] == [first]
+
+
+def test_bulk_write_merges_duplicates(memory_env) -> None:
+    existing = memory_env.add_memory(content="water the plants", type="note", source="test")
+    result = memory_env.add_memories(
+        [
+            {"content": "Water the plants", "source": "test"},
+            {"content": "call mum", "source": "test"},
+            {"content": "CALL MUM", "source": "test"},
+        ]
+    )
+    assert result["written"] == 2
+    assert result["merged"] == 2
+    assert result["ids"][0] == existing
+    assert len(memory_env.list_recent(limit=10)) == 2
+
+
+def _insert_legacy(rows: list[tuple[str, str, str]]) -> None:
+    from core.storage.db import get_connection
+
+    conn = get_connection()
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO memories (id, ts, type, tags, source, content, importance, confidence, sensitivity)
+            VALUES (?, ?, 'note', ?, 'test', ?, 5, 0.8, 'internal')
+            """,
+            [(memory_id, ts, f'["{memory_id}"]', content) for memory_id, ts, content in rows],
+        )
+
+
+def test_compaction_merges_legacy_duplicates(memory_env) -> None:
+    _insert_legacy(
+        [
+            ("a", "2026-01-01T00:00:00", "pay the rent"),
+            ("b", "2026-01-02T00:00:00", "Pay the  rent"),
+            ("c", "2026-01-03T00:00:00", "pay the rent"),
+            ("d", "2026-01-04T00:00:00", "unique note"),
+        ]
+    )
+    result = memory_env.compact_memories()
+    assert result == {"scanned": 4, "merged": 1, "removed": 2}
+
+    remaining = {r["id"]: r for r in memory_env.list_recent(limit=10)}
+    assert set(remaining) == {"c", "d"}
+    assert remaining["c"]["importance"] == 7
+    assert sorted(remaining["c"]["tags"]) == ["a", "b", "c"]
+    assert [r["id"] for r in memory_env.search_memories(query="rent", tags=["a"], limit=5)] == ["c"]
+
+    # Hashes are now set, so a new repeat upserts onto the survivor.
+    assert memory_env.add_memory(content="unique NOTE", type="note", source="test") == "d"
+    assert memory_env.compact_memories() == {"scanned": 2, "merged": 0, "removed": 0}
+
+
+def test_compaction_tolerates_only_missing_fts(memory_env) -> None:
+    import sqlite3
+
+    from core.storage.db import get_connection
+
+    rows = [("a", "2026-01-01T00:00:00", "pay the rent"), ("b", "2026-01-02T00:00:00", "pay the rent")]
+    with get_connection() as conn:
+        for trigger in ("trg_memories_fts_insert", "trg_memories_fts_delete", "trg_memories_fts_update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE IF EXISTS memories_fts")
+    _insert_legacy(rows)
+    assert memory_env.compact_memories() == {"scanned": 2, "merged": 1, "removed": 1}
+
+    # A memories_fts that exists but rejects 'optimize' is a real fault.
+    with get_connection() as conn:
+        conn.execute("CREATE TABLE memories_fts (content TEXT)")
+    _insert_legacy([("c", "2026-01-03T00:00:00", "water the plants"), ("d", "2026-01-04T00:00:00", "water the plants")])
+    with pytest.raises(sqlite3.OperationalError):
+        memory_env.compact_memories()
+    assert {r["id"] for r in memory_env.list_recent(limit=10)} == {"b", "c", "d"}
+
+
+def test_compaction_rebuilds_vector_index(memory_env) -> None:
+    pytest.importorskip("numpy")
+    from core.memory.vectors import get_vector_index
+    from core.storage.db import get_db_path
+
+    _insert_legacy([("x", "2026-01-01T00:00:00", "garden tomatoes"), ("y", "2026-01-02T00:00:00", "garden tomatoes")])
+    memory_env.add_memory(content="violin lessons", type="note", source="test")
+    memory_env.sync_memory_vectors()  # startup backfill of the legacy rows
+    assert get_vector_index(get_db_path()).row_count() == 3
+
+    memory_env.compact_memories()
+    assert get_vector_index(get_db_path()).row_count() == 2
+    assert [r["id"] for r in memory_env.search_memories(query="tomatoes", tags=None, limit=1, mode="semantic")] == ["y"]
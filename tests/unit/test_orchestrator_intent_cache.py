@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import dataclasses
+
+from adapters.llm.provider import ProposalResult
+from core.config import get_orchestrator_config
+from core.orchestrator.intent_cache import IntentCache, deterministic_key, proposal_key
+from core.orchestrator.schemas import Intent
+
+
+def _cache(now: list[float], **overrides) -> IntentCache:
+    options = {"intent_cache_size": 2, "intent_cache_ttl_seconds": 60.0, **overrides}
+    return IntentCache(dataclasses.replace(get_orchestrator_config(), **options), clock=lambda: now[0])
+
+
+def test_lru_ttl_and_negative_entries() -> None:
+    now = [0.0]
+    cache = _cache(now)
+    summary = Intent(action="finance.summary", parameters={"period": "week"}, confidence=1.0)
+    cache.put_intent(deterministic_key("parse", "finance summary"), summary)
+    cache.put_intent(deterministic_key("parse", "how are you"), None)
+
+    assert cache.get_intent(deterministic_key("parse", "how are you")) == (True, None)
+    hit, intent = cache.get_intent(deterministic_key("parse", "finance summary"))
+    assert hit and intent == summary
+    intent.parameters["period"] = "month"
+    assert cache.get_intent(deterministic_key("parse", "finance summary"))[1].parameters == {"period": "week"}
+
+    cache.put_intent(deterministic_key("parse", "camera status"), Intent(action="camera.status", parameters={}, confidence=1.0))
+    assert cache.get_intent(deterministic_key("parse", "how are you")) == (False, None)
+
+    now[0] = 61.0
+    assert cache.get_intent(deterministic_key("parse", "camera status")) == (False, None)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evicted, stats.expired) == (3, 2, 1, 1)
+    assert stats.hit_rate == 0.6
+
+
+def test_time_stamped_parameters_are_restamped_on_hit() -> None:
+    now = [0.0]
+    cache = _cache(now)
+    key = deterministic_key("parse", "spent 12 at Cafe")
+    cache.put_intent(
+        key,
+        Intent(
+            action="finance.add_transaction",
+            parameters={"amount": 12.0, "merchant": "Cafe", "occurred_at": "2000-01-01T00:00:00+00:00"},
+            confidence=1.0,
+        ),
+    )
+    assert "occurred_at" not in cache._entries[key][1].intent.parameters
+
+    _hit, intent = cache.get_intent(key)
+    assert intent.parameters["merchant"] == "Cafe"
+    assert intent.parameters["occurred_at"] > "2000-01-01T00:00:00+00:00"
+
+
+def test_proposals_keyed_on_routing_context() -> None:
+    now = [0.0]
+    config = get_orchestrator_config()
+    cache = _cache(now)
+    proposal = ProposalResult(ok=True, confidence=0.8, action="memory.list", llm_used=True)
+
+    key = proposal_key("what did I save", None, {"debug": True, "source": "ui"}, config)
+    assert key == proposal_key("what did I save", None, {"source": "ui"}, config)
+    assert key != proposal_key("what did I save", None, {"source": "voice"}, config)
+    assert proposal_key("x", None, {"bad": {1, 2}}, config) is not None
+    assert proposal_key("x", None, {("tuple", "key"): 1}, config) is None
+
+    cache.put_proposal(key, proposal)
+    cached = cache.get_proposal(key)
+    assert cached == proposal and cached is not proposal
+    assert cache.get_proposal(None) is None
+
+
+def test_disabled_cache_stores_nothing() -> None:
+    cache = _cache([0.0], intent_cache_size=0)
+    cache.put_intent(deterministic_key("parse", "list files"), None)
+    assert cache.get_intent(deterministic_key("parse", "list files")) == (False, None)
+    assert cache.stats().entries == 0
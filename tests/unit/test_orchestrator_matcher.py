@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+import core.orchestrator.matcher as matcher
+from core.orchestrator.matcher import finance_candidate, match_domain_intent, tool_domains
+
+# Utterances recorded with what the per-domain parsers and the router's scans
+# resolved them to before the routing table replaced them.
+CORPUS = json.loads((Path(__file__).parent / "fixtures" / "intent_corpus.json").read_text(encoding="utf-8"))
+
+
+def _recorded(intent) -> dict[str, object] | None:
+    if intent is None:
+        return None
+    parameters = {name: value for name, value in intent.parameters.items() if name != "occurred_at"}
+    return {"action": intent.action, "parameters": parameters, "confidence": intent.confidence}
+
+
+@pytest.mark.parametrize("record", CORPUS, ids=lambda record: repr(record["utterance"]))
+def test_routing_table_matches_recorded_corpus(record: dict[str, object]) -> None:
+    matched = match_domain_intent(record["utterance"])
+    assert (matched and matched[0], _recorded(matched and matched[1])) == (record["domain"], record["intent"])
+    text = record["utterance"].strip()
+    assert _recorded(finance_candidate(text)) == record["finance_candidate"]
+    assert tool_domains(text) == record["tool_domains"]
+
+
+def test_resolution_stops_at_first_match(monkeypatch: pytest.MonkeyPatch) -> None:
+    def unreachable(*_args: object) -> None:
+        raise AssertionError("finance rules ran after a higher-precedence match")
+
+    monkeypatch.setattr(matcher, "_finance_intent", unreachable)
+    assert match_domain_intent("camera status")[0] == "camera"
+    assert match_domain_intent("remember I spent 5 at the deli")[0] == "memories"
+
+
+def test_ranked_rules_win_over_earlier_lower_ranked_hits() -> None:
+    domain, intent = match_domain_intent("I paid 5 at the cafe and log 3 tea")
+    assert (domain, intent.parameters["amount"], intent.parameters["merchant"]) == ("finance", 3.0, "tea")
+    assert tool_domains("recallist") == ["memory", "files"]
+
+
+def test_corpus_covers_every_domain_and_fallthrough() -> None:
+    domains = {record["domain"] for record in CORPUS}
+    assert {"camera", "memories", "finance", "files", None} <= domains
+    assert any(record["finance_candidate"] for record in CORPUS if record["intent"] is None)
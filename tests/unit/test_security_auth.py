@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import dataclasses
+import importlib
+import time
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture()
+def auth(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setenv("VICTUS_DATA_DIR", str(tmp_path))
+    import core.storage.db as db_module
+
+    db_module._DB_INITIALIZED.clear()
+    importlib.reload(db_module)
+    import core.security.bootstrap_store as bootstrap_store
+    import core.security.auth as auth_module
+
+    bootstrap_store = importlib.reload(bootstrap_store)
+    auth_module = importlib.reload(auth_module)
+    bootstrap_store.set_bootstrap("unused-hash", "first-secret")
+    yield auth_module
+    db_module.close_all_connections()
+
+
+def _legacy_token(auth, payload) -> str:
+    token = auth._encode_payload(payload, "first-secret")
+    payload_b64 = token.split(".")[1]
+    return f"{payload_b64}.{auth._legacy_signature(payload_b64, 'first-secret')}"
+
+
+def test_hmac_tokens_verify_from_memory(auth, monkeypatch: pytest.MonkeyPatch) -> None:
+    import core.security.bootstrap_store as bootstrap_store
+
+    token = auth.create_token("admin")
+    assert token.startswith("v2.") and token.count(".") == 2
+    assert auth.verify_token(token).sub == "admin"
+
+    def no_database():
+        raise AssertionError("verify_token touched the database")
+
+    monkeypatch.setattr(bootstrap_store, "get_connection", no_database)
+    auth._VERIFIED_TOKENS.clear()
+    assert auth.verify_token(token).sub == "admin"
+    assert len(auth._VERIFIED_TOKENS) == 1
+
+    payload_b64 = token.split(".")[1]
+    assert auth.verify_token(f"v2.{payload_b64}.{'A' * 43}") is None
+    expired = auth._encode_payload(auth.TokenPayload(sub="admin", iat=0, exp=int(time.time()) - 1), "first-secret")
+    assert auth.verify_token(expired) is None
+
+
+def test_legacy_tokens_accepted_during_migration_window(auth, monkeypatch: pytest.MonkeyPatch) -> None:
+    now = int(time.time())
+    legacy = _legacy_token(auth, auth.TokenPayload(sub="admin", iat=now, exp=now + 60))
+    assert auth.verify_token(legacy).sub == "admin"
+
+    monkeypatch.setenv("VICTUS_AUTH_ACCEPT_LEGACY_TOKENS", "0")
+    fresh = _legacy_token(auth, auth.TokenPayload(sub="admin", iat=now, exp=now + 120))
+    assert auth.verify_token(fresh) is None
+
+
+def test_rebootstrap_invalidates_secret_and_verified_tokens(auth) -> None:
+    import core.security.bootstrap_store as bootstrap_store
+
+    token = auth.create_token("admin")
+    assert auth.verify_token(token) is not None
+
+    bootstrap_store.set_bootstrap("unused-hash", "second-secret")
+    assert bootstrap_store.get_jwt_secret() == "second-secret"
+    assert auth.verify_token(token) is None
+    assert auth.verify_token(auth.create_token("admin")) is not None
+
+
+def test_verified_token_cache_is_bounded_lru(auth) -> None:
+    cache = auth._VerifiedTokenCache(2)
+    payload = auth.TokenPayload(sub="admin", iat=0, exp=100)
+    for key in (b"a", b"b"):
+        cache.put(key, "s", payload)
+    assert cache.get(b"a", "s", now=50) == payload
+    cache.put(b"c", "s", payload)
+
+    assert cache.get(b"b", "s", now=50) is None
+    assert cache.get(b"a", "s", now=50) == payload
+    assert cache.get(b"c", "other-secret", now=50) is None
+    assert cache.get(b"a", "s", now=101) is None
+    assert len(cache) == 0
+
+
+def test_login_admission_limits_each_username_client_pair_and_client() -> None:
+    from core.config import get_auth_config
+    from core.security.admission import LoginAdmission
+
+    now = [0.0]
+    config = dataclasses.replace(get_auth_config(), login_burst=2, login_attempts_per_minute=6.0)
+    admission = LoginAdmission(config, clock=lambda: now[0])
+
+    assert admission.admit("admin", "10.0.0.1") is None
+    assert admission.admit("Admin", "10.0.0.1") is None
+    assert admission.admit("admin", "10.0.0.1") == pytest.approx(10.0)
+    # One noisy address neither locks the account out for others nor sprays other names.
+    assert admission.admit("admin", "10.0.0.2") is None
+    assert admission.admit("bob", "10.0.0.1") is not None
+
+    # A successful login forgives that client's failures.
+    assert admission.admit("admin", "10.0.0.2") is None
+    admission.succeeded("admin", "10.0.0.2")
+    assert admission.admit("admin", "10.0.0.2") is None
+
+    now[0] = 10.0
+    assert admission.admit("admin", "10.0.0.1") is None
+    assert admission.stats().rejected == 2
+
+
+def test_password_hasher_bounds_concurrency() -> None:
+    import asyncio
+    import threading
+
+    import bcrypt
+
+    from core.config import get_auth_config
+    from core.security.hashing import PasswordHasher, PasswordHasherBusy
+
+    hasher = PasswordHasher(dataclasses.replace(get_auth_config(), hash_workers=1, hash_max_queue=0))
+    release = threading.Event()
+
+    async def scenario() -> None:
+        blocked = asyncio.ensure_future(hasher._run(release.wait))
+        await asyncio.sleep(0.01)
+        assert hasher.stats().running == 1
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.hash("another")
+        release.set()
+        await blocked
+        password_hash = await hasher.hash("correct horse")
+        assert bcrypt.checkpw(b"correct horse", password_hash.encode("utf-8"))
+        assert await hasher.check("correct horse", password_hash)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+    stats = hasher.stats()
+    assert (stats.rejected, stats.completed, stats.queued) == (1, 3, 0)
+
+
+def test_login_user_throttles_and_checks_off_thread(auth, monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+
+    import bcrypt
+    from fastapi import HTTPException
+
+    import core.security.bootstrap_store as bootstrap_store
+    from core.config import get_auth_config
+    from core.security.admission import LoginAdmission
+
+    bootstrap_store.set_bootstrap(bcrypt.hashpw(b"correct horse", bcrypt.gensalt(4)).decode(), "first-secret")
+    config = dataclasses.replace(get_auth_config(), login_burst=2, login_attempts_per_minute=1.0)
+    monkeypatch.setattr(auth, "LOGIN_ADMISSION", LoginAdmission(config))
+
+    token = asyncio.run(auth.login_user("admin", "correct horse", "10.0.0.1"))
+    assert auth.verify_token(token).sub == "admin"
+    # Successful logins do not use up the budget.
+    assert asyncio.run(auth.login_user("admin", "correct horse", "10.0.0.1"))
+    for _ in range(2):
+        with pytest.raises(HTTPException) as wrong:
+            asyncio.run(auth.login_user("admin", "wrong", "10.0.0.1"))
+        assert wrong.value.status_code == 401
+    with pytest.raises(HTTPException) as throttled:
+        asyncio.run(auth.login_user("admin", "correct horse", "10.0.0.1"))
+    assert throttled.value.status_code == 429
+    assert int(throttled.value.headers["Retry-After"]) >= 1
+    # The real admin on another address is not locked out.
+    assert asyncio.run(auth.login_user("admin", "correct horse", "10.0.0.2"))
@@ -0,0 +1,243 @@
+"""
+Unit tests for the SQLite storage layer.
+
+Covers: pooled connections, schema migrations, query plans.
+"""
+from __future__ import annotations
+
+import importlib
+import threading
+from pathlib import Path
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def db_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setenv("VICTUS_DATA_DIR", str(tmp_path))
+    import core.storage.db as db_module
+
+    db_module._DB_INITIALIZED.clear()
+    db_module = importlib.reload(db_module)
+    yield db_module
+    db_module.close_all_connections()
+
+
+# ---------------------------------------------------------------------------
+# A. Connection pool
+# ---------------------------------------------------------------------------
+
+
+def test_connection_is_reused_within_thread(db_env) -> None:
+    first = db_env.get_connection()
+    second = db_env.get_connection()
+    assert first is second
+
+    stats = db_env.pool_stats()
+    assert stats.connections_opened == 1
+    assert stats.reuses >= 1
+
+
+def test_each_thread_gets_its_own_connection(db_env) -> None:
+    main_conn = db_env.get_connection()
+    seen: list[object] = []
+
+    def worker() -> None:
+        seen.append(db_env.get_connection())
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen and seen[0] is not main_conn
+    assert db_env.pool_stats().connections_opened == 2
+
+
+def test_connection_is_configured_with_pragmas(db_env) -> None:
+    conn = db_env.get_connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
+def test_close_discards_uncommitted_work_but_keeps_connection(db_env) -> None:
+    conn = db_env.get_connection()
+    conn.execute(
+        "INSERT INTO finance_rules (id, rule_key, threshold_value, enabled, updated_at) "
+        "VALUES ('r1', 'k', 1.0, 1, '')"
+    )
+    conn.close()
+
+    again = db_env.get_connection()
+    assert again is conn
+    assert again.execute("SELECT COUNT(*) FROM finance_rules").fetchone()[0] == 0
+
+
+def test_pool_follows_data_dir_changes(db_env, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    first = db_env.get_connection()
+    other_dir = tmp_path / "other"
+    monkeypatch.setenv("VICTUS_DATA_DIR", str(other_dir))
+
+    second = db_env.get_connection()
+    assert second is not first
+    assert (other_dir / "data" / db_env.DB_FILENAME).exists()
+
+
+# ---------------------------------------------------------------------------
+# B. Schema migrations
+# ---------------------------------------------------------------------------
+
+
+def test_fresh_database_is_migrated_to_latest(db_env) -> None:
+    from core.storage.migrations import LATEST_VERSION, MIGRATIONS, get_schema_version
+
+    conn = db_env.get_connection()
+    assert get_schema_version(conn) == LATEST_VERSION
+    recorded = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+    assert recorded == [m.version for m in MIGRATIONS]
+
+
+def test_migrate_is_noop_when_current(db_env) -> None:
+    from core.storage.migrations import migrate
+
+    conn = db_env.get_connection()
+    assert migrate(conn) == []
+
+
+def test_unversioned_legacy_database_is_upgraded(db_env) -> None:
+    import sqlite3
+
+    from core.storage.migrations import LATEST_VERSION, get_schema_version
+
+    db_path = db_env.get_db_path()
+    legacy = sqlite3.connect(str(db_path))
+    legacy.execute(
+        "CREATE TABLE memories (id TEXT PRIMARY KEY, ts TEXT, type TEXT, tags TEXT, "
+        "source TEXT, content TEXT, importance INTEGER, confidence REAL)"
+    )
+    legacy.execute("INSERT INTO memories (id, content) VALUES ('m1', 'kept')")
+    legacy.commit()
+    legacy.close()
+
+    conn = db_env.get_connection()
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(memories)")}
+    assert "sensitivity" in columns
+    assert conn.execute("SELECT content FROM memories WHERE id = 'm1'").fetchone()[0] == "kept"
+    assert get_schema_version(conn) == LATEST_VERSION
+
+
+# ---------------------------------------------------------------------------
+# C. Query plans
+# ---------------------------------------------------------------------------
+
+
+def _plan(conn, sql: str, params: list | tuple = ()) -> list[str]:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def _assert_indexed(plan: list[str]) -> None:
+    full_scans = [step for step in plan if step.startswith("SCAN ") and " USING " not in step]
+    assert not full_scans, f"full table scan in plan: {plan}"
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"date_from": "2026-01-01", "date_to": "2026-01-31"},
+        {"account_id": "acct-1"},
+        {"account_id": "acct-1", "date_from": "2026-01-01"},
+        {"category": "Dining"},
+        {"direction": "expense"},
+        {"merchant": "Cafe"},
+    ],
+)
+def test_list_transactions_plans_use_indexes(db_env, filters) -> None:
+    from core.finance.repository import FinanceRepository
+
+    query = {
+        "date_from": None, "date_to": None, "category": None, "account_id": None,
+        "direction": None, "merchant": None, "limit": 50,
+    }
+    query.update(filters)
+    sql, params = FinanceRepository._transaction_query(**query)
+    plan = _plan(db_env.get_connection(), sql, params)
+    _assert_indexed(plan)
+    if not filters.get("category"):
+        assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_transaction_cursor_seek_is_an_index_range(db_env) -> None:
+    from core.finance.repository import FinanceRepository
+
+    sql, params = FinanceRepository._transaction_query(
+        date_from=None, date_to=None, category=None, account_id="acct-1", direction=None, merchant=None,
+        limit=50, after=("2026-01-31", "2026-01-31T00:00:00", "tx-9"),
+    )
+    plan = _plan(db_env.get_connection(), sql, params)
+    assert any(step.startswith("SEARCH transactions") and "(transaction_date,updated_at,id)<" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+@pytest.mark.parametrize(
+    "sql, params",
+    [
+        ("SELECT * FROM memories ORDER BY ts DESC, id DESC LIMIT ?", (10,)),
+        ("SELECT * FROM memories WHERE 1=1 AND sensitivity_rank <= ? ORDER BY ts DESC, id DESC LIMIT ?", (1, 10)),
+        ("SELECT * FROM finance_categories WHERE name = ?", ("Dining",)),
+        ("SELECT * FROM finance_alerts ORDER BY created_at DESC, id DESC LIMIT ?", (10,)),
+        (
+            "SELECT * FROM finance_alerts WHERE status = 'active' ORDER BY created_at DESC, id DESC LIMIT ?",
+            (10,),
+        ),
+        ("SELECT * FROM finance_behavior_logs ORDER BY ts DESC, id DESC LIMIT ?", (10,)),
+    ],
+)
+def test_hot_lookup_plans_use_indexes(db_env, sql: str, params: tuple) -> None:
+    plan = _plan(db_env.get_connection(), sql, params)
+    _assert_indexed(plan)
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_spending_summary_plan_uses_covering_index(db_env) -> None:
+    from core.finance.repository import _SPENDING_SUMMARY_SQL
+
+    sql = _SPENDING_SUMMARY_SQL.format(scope="transaction_date >= ? AND transaction_date <= ?")
+    plan = _plan(db_env.get_connection(), sql, ("2026-01-01", "2026-01-31"))
+    assert not any(step.startswith("SCAN transactions") for step in plan), plan
+    assert any("COVERING INDEX idx_transactions_date_summary" in step for step in plan), plan
+
+
+# ---------------------------------------------------------------------------
+# D. Pagination cursors
+# ---------------------------------------------------------------------------
+
+
+def test_cursor_round_trip_and_kind_check() -> None:
+    from core.storage.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+    token = encode_cursor("alerts", ["2026-03-18T00:00:00+00:00", "a-1"])
+    assert decode_cursor("alerts", token, 2) == ("2026-03-18T00:00:00+00:00", "a-1")
+    assert decode_cursor("alerts", None, 2) is None
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("memories", token, 2)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("alerts", token, 3)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("alerts", "%%%", 2)
+
+
+def test_split_page_only_emits_cursor_when_more_rows() -> None:
+    from core.storage.pagination import decode_cursor, split_page
+
+    rows = [("d3", 3), ("d2", 2), ("d1", 1)]
+    page, cursor = split_page(rows, 2, "k", lambda row: row)
+    assert page == rows[:2]
+    assert decode_cursor("k", cursor, 2) == ("d2", 2)
+    assert split_page(rows, 3, "k", lambda row: row) == (rows, None)
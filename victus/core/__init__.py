@@ -0,0 +1 @@
+"""Shared Victus runtime primitives."""
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import math
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+_LOGGER = logging.getLogger(__name__)
+
+_SNAPSHOT_VERSION = 1
+_DEFAULT_SCORE = 0.5
+_ALPHA = 0.2
+
+
+def make_key(*parts: str) -> str:
+    """Join ``parts`` into a store key, e.g. ``router:domain:finance``."""
+    return ":".join(part.strip().lower() for part in parts)
+
+
+@dataclass(frozen=True)
+class ConfidenceScore:
+    score: float
+    samples: int
+
+
+class ConfidenceStore:
+    """Confidence scores kept in memory and written behind the caller.
+
+    ``update_score`` only touches memory. A background thread flushes the
+    keys changed since the last flush every ``flush_interval_seconds``, or
+    sooner once ``flush_max_pending`` keys are waiting, by appending their
+    latest state to a journal next to ``path`` and fsyncing it. After
+    ``compact_after_entries`` journal lines the full table is written to
+    ``path`` (temp file, fsync, atomic rename) and the journal starts over.
+
+    Loading reads the snapshot and replays the journal on top, so a crash
+    loses at most the updates of one flush interval. Journal lines carry the
+    snapshot generation they follow; lines older than the snapshot (left by
+    a crash between the rename and the journal reset) are skipped, and a
+    torn last line is dropped by compacting on load.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        flush_interval_seconds: float = 5.0,
+        flush_max_pending: int = 256,
+        compact_after_entries: int = 4096,
+    ) -> None:
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.name + ".journal")
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flush_max_pending = flush_max_pending
+        self.compact_after_entries = compact_after_entries
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._scores: dict[str, ConfidenceScore] = {}
+        self._dirty: set[str] = set()
+        self._generation = 0
+        self._journal_entries = 0
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Scores
+    # ------------------------------------------------------------------
+
+    def get_score(self, key: str, default: float = _DEFAULT_SCORE) -> float:
+        record = self._scores.get(key)
+        return record.score if record is not None else default
+
+    def get(self, key: str) -> ConfidenceScore | None:
+        return self._scores.get(key)
+
+    def update_score(self, key: str, observation: float) -> float:
+        """Fold ``observation`` (0..1) into the key's moving average; no I/O."""
+        return self.update_scores({key: observation})[key]
+
+    def update_scores(self, observations: Mapping[str, float]) -> dict[str, float]:
+        """``update_score`` for several keys under one lock; returns the new scores."""
+        updated: dict[str, float] = {}
+        with self._lock:
+            for key, observation in observations.items():
+                observation = min(1.0, max(0.0, float(observation)))
+                current = self._scores.get(key)
+                if current is None:
+                    record = ConfidenceScore(score=_DEFAULT_SCORE + _ALPHA * (observation - _DEFAULT_SCORE), samples=1)
+                else:
+                    record = ConfidenceScore(
+                        score=current.score + _ALPHA * (observation - current.score),
+                        samples=current.samples + 1,
+                    )
+                self._scores[key] = record
+                updated[key] = record.score
+            self._dirty.update(updated)
+            pending = len(self._dirty)
+            if self._thread is None and not self._stop.is_set():
+                self._start_flusher()
+        if pending >= self.flush_max_pending:
+            self._wake.set()
+        return updated
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    # ------------------------------------------------------------------
+    # Write-behind
+    # ------------------------------------------------------------------
+
+    def flush(self) -> int:
+        """Journal every changed key; returns how many were written."""
+        with self._io_lock:
+            with self._lock:
+                batch = {key: self._scores[key] for key in self._dirty}
+                self._dirty.clear()
+            if not batch:
+                return 0
+            try:
+                self._append_journal(batch)
+            except OSError:
+                with self._lock:
+                    self._dirty.update(batch)
+                raise
+            self._journal_entries += len(batch)
+            if self._journal_entries >= self.compact_after_entries:
+                self._compact()
+            return len(batch)
+
+    def compact(self) -> None:
+        """Write the whole table as a fresh snapshot and reset the journal."""
+        with self._io_lock:
+            with self._lock:
+                self._dirty.clear()
+            self._compact()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(self.flush_interval_seconds + 5.0)
+        self._thread = None
+        self.flush()
+
+    def _start_flusher(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="victus-confidence-flush", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError:  # keep the updates queued and retry next interval
+                _LOGGER.exception("Confidence store flush failed")
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def _append_journal(self, batch: dict[str, ConfidenceScore]) -> None:
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(
+            json.dumps({"g": self._generation, "k": key, "s": record.score, "n": record.samples}) + "\n"
+            for key, record in batch.items()
+        )
+        with self.journal_path.open("a", encoding="utf-8") as handle:
+            handle.write(lines)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def _compact(self) -> None:
+        # Caller holds _io_lock. The snapshot may include keys that are still
+        # dirty; re-journaling their state later is harmless.
+        with self._lock:
+            scores = dict(self._scores)
+        generation = self._generation + 1
+        payload = {
+            "version": _SNAPSHOT_VERSION,
+            "generation": generation,
+            "scores": {key: {"score": record.score, "samples": record.samples} for key, record in scores.items()},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with temp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, sort_keys=True)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.path)
+        _fsync_directory(self.path.parent)
+        self._generation = generation
+        self.journal_path.unlink(missing_ok=True)
+        self._journal_entries = 0
+
+    def _load(self) -> None:
+        # Files of another shape (an older store at the same path, hand
+        # edits) must not break routing: bad parts are skipped with a warning.
+        if self.path.exists():
+            try:
+                payload = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                payload = None
+            if not isinstance(payload, dict) or payload.get("version") != _SNAPSHOT_VERSION:
+                _LOGGER.warning("Ignoring unreadable or foreign confidence snapshot %s", self.path)
+                payload = {}
+            generation = payload.get("generation", 0)
+            self._generation = generation if isinstance(generation, int) and not isinstance(generation, bool) else 0
+            scores = payload.get("scores")
+            skipped = 0
+            for key, record in (scores.items() if isinstance(scores, dict) else ()):
+                parsed = _parse_score(record.get("score"), record.get("samples")) if isinstance(record, dict) else None
+                if parsed is None:
+                    skipped += 1
+                    continue
+                self._scores[key] = parsed
+            if skipped:
+                _LOGGER.warning("Skipped %d malformed entries in confidence snapshot %s", skipped, self.path)
+        if not self.journal_path.exists():
+            return
+        torn = False
+        skipped = 0
+        with self.journal_path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:  # torn write from a crash mid-append
+                    torn = True
+                    break
+                self._journal_entries += 1
+                if not isinstance(entry, dict):
+                    skipped += 1
+                    continue
+                generation, key = entry.get("g"), entry.get("k")
+                parsed = _parse_score(entry.get("s"), entry.get("n"))
+                if not isinstance(generation, int) or isinstance(generation, bool) or not isinstance(key, str) or parsed is None:
+                    skipped += 1
+                    continue
+                if generation < self._generation:
+                    continue
+                self._scores[key] = parsed
+        if skipped:
+            _LOGGER.warning("Skipped %d malformed lines in confidence journal %s", skipped, self.journal_path)
+        if torn:
+            # New appends would otherwise land after the partial line.
+            self._compact()
+
+
+def _parse_score(score: Any, samples: Any) -> ConfidenceScore | None:
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or not math.isfinite(score):
+        return None
+    if isinstance(samples, bool) or not isinstance(samples, int) or samples < 0:
+        return None
+    return ConfidenceScore(score=min(1.0, max(0.0, float(score))), samples=samples)
+
+
+def _fsync_directory(directory: Path) -> None:
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ConfidenceCore:
+    """Read side of a :class:`ConfidenceStore`."""
+
+    def __init__(self, store: ConfidenceStore, *, default: float = _DEFAULT_SCORE) -> None:
+        self.store = store
+        self.default = default
+
+    def get_score(self, key: str) -> float:
+        return self.store.get_score(key, self.default)
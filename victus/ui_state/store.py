@@ -146,6 +146,22 @@ def fetch_ui_state(db_path: Path | None = None) -> UIState:
     )
 
 
+def prune_timeline_events(*, older_than_ms: int, keep_latest: int, db_path: Path | None = None) -> int:
+    path = init_ui_state_db(db_path)
+    with _connect(path) as conn:
+        aged = conn.execute("DELETE FROM timeline_events WHERE created_at < ?", (older_than_ms,)).rowcount
+        capped = conn.execute(
+            """
+            DELETE FROM timeline_events WHERE id IN (
+                SELECT id FROM timeline_events ORDER BY created_at DESC, id DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (keep_latest,),
+        ).rowcount
+        conn.commit()
+    return aged + capped
+
+
 def connection_for_writes(db_path: Path | None = None) -> sqlite3.Connection:
     path = init_ui_state_db(db_path)
     return _connect(path)